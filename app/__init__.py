@@ -1,5 +1,19 @@
 """AutoDev Agent package."""
 
-from .orchestrator import AutoDevOrchestrator
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .orchestrator import AutoDevOrchestrator
 
 __all__ = ["AutoDevOrchestrator"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first use, so importing one submodule (e.g. from a CLI subcommand) doesn't load the orchestrator.
+    if name == "AutoDevOrchestrator":
+        from .orchestrator import AutoDevOrchestrator
+
+        return AutoDevOrchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import shutil
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
@@ -25,7 +24,7 @@ class DatabaseBackup:
         backup_name = f"backup_{timestamp}.db"
         backup_path = self.backup_dir / backup_name
 
-        shutil.copy2(self.db_path, backup_path)
+        _copy_database(self.db_path, backup_path)
 
         # Store metadata
         metadata_file = backup_path.with_suffix(".md")
@@ -42,10 +41,10 @@ class DatabaseBackup:
         # Create a safety backup of current db
         if self.db_path.exists():
             safety_backup = self.backup_dir / "pre_restore_backup.db"
-            shutil.copy2(self.db_path, safety_backup)
+            _copy_database(self.db_path, safety_backup)
 
         # Restore
-        shutil.copy2(backup_path, self.db_path)
+        _copy_database(backup_path, self.db_path)
 
     def verify_database(self) -> bool:
         """Verify database integrity."""
@@ -81,3 +80,15 @@ class DatabaseBackup:
             for backup_path, _ in backups[keep_count:]:
                 backup_path.unlink()
                 backup_path.with_suffix(".md").unlink(missing_ok=True)
+
+
+def _copy_database(source: Path, target: Path) -> None:
+    """Copy through SQLite's online backup API so WAL contents and live writers are handled."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    try:
+        with dst:
+            src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
@@ -0,0 +1,157 @@
+"""Content-addressed store that deduplicates generated project files."""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import shutil
+import stat
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .logging_config import get_logger
+
+logger = get_logger("blob_store")
+
+# Linux ioctl that makes ``dst`` share ``src``'s extents (btrfs, XFS, bcachefs, ...).
+FICLONE = 0x40049409
+LOCK_FILE = ".lock"
+
+
+@dataclass(slots=True)
+class BlobStats:
+    """Size of the store and how many project files point into it."""
+
+    blobs: int = 0
+    bytes: int = 0
+    links: int = 0
+
+
+class BlobStore:
+    """Files stored once under ``root/<aa>/<sha256>`` and linked into projects.
+
+    ``materialize`` prefers a hardlink (no extra inode or data), then a reflink
+    (own inode, shared data) and finally a plain copy. Blobs are read-only, so
+    an in-place write through a hardlink fails instead of silently changing
+    every project; writers must replace the file (see ``correction``). Blobs
+    whose only remaining link is the store's own are unreferenced and removed
+    by ``gc``.
+
+    ``write`` holds a shared ``flock`` on the store from ``put`` until the
+    link exists, and ``gc`` takes it exclusively, so gc never removes a blob
+    that a writer in any process has just found but not yet linked. Where
+    ``flock`` is unavailable, ``write`` stores the content again if the blob
+    vanished in between.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def put(self, data: bytes) -> Path:
+        """Store ``data`` if new and return its blob path."""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self.root / digest[:2] / digest
+        if blob.exists():
+            return blob
+        blob.parent.mkdir(exist_ok=True)
+        tmp = blob.with_name(f".{digest}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.chmod(tmp, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(tmp, blob)
+        return blob
+
+    def write(self, target: Path, data: bytes) -> str:
+        """Store ``data`` and materialize it at ``target``; return the method used."""
+        with self._locked(exclusive=False):
+            try:
+                return self.materialize(self.put(data), target)
+            except FileNotFoundError:
+                if not target.parent.is_dir():
+                    raise
+                # Collected between put() and the link (no flock on this platform); store it again.
+                return self.materialize(self.put(data), target)
+
+    def materialize(self, blob: Path, target: Path) -> str:
+        """Atomically place ``blob`` at ``target`` as a hardlink, reflink or copy."""
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp.unlink(missing_ok=True)
+        try:
+            method = _link_or_copy(blob, tmp)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return method
+
+    def stats(self) -> BlobStats:
+        """Count blobs, their bytes and the project hardlinks that reference them."""
+        result = BlobStats()
+        for blob in self._blobs():
+            info = blob.stat()
+            result.blobs += 1
+            result.bytes += info.st_size
+            result.links += info.st_nlink - 1
+        return result
+
+    def gc(self) -> BlobStats:
+        """Delete blobs no project links to; return what was reclaimed."""
+        reclaimed = BlobStats()
+        with self._locked(exclusive=True):
+            for blob in self._blobs():
+                info = blob.stat()
+                if info.st_nlink > 1:
+                    continue
+                blob.unlink()
+                reclaimed.blobs += 1
+                reclaimed.bytes += info.st_size
+            for shard in self.root.iterdir():
+                if shard.is_dir() and not any(shard.iterdir()):
+                    shard.rmdir()
+        logger.info(f"Blob GC removed {reclaimed.blobs} blob(s), {reclaimed.bytes} byte(s)")
+        return reclaimed
+
+    @contextmanager
+    def _locked(self, *, exclusive: bool) -> Iterator[None]:
+        if fcntl is None:  # pragma: no cover - Windows
+            yield
+            return
+        with (self.root / LOCK_FILE).open("a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _blobs(self) -> list[Path]:
+        return [path for path in self.root.glob("??/*") if not path.name.startswith(".")]
+
+
+def _link_or_copy(blob: Path, target: Path) -> str:
+    try:
+        os.link(blob, target)
+        return "hardlink"
+    except OSError as e:
+        # EXDEV: different filesystem; EMLINK: link count limit; others: no hardlink support.
+        logger.debug("Hardlink of %s failed (%s)", blob.name, errno.errorcode.get(e.errno, e.errno))
+    if _reflink(blob, target):
+        return "reflink"
+    shutil.copyfile(blob, target)
+    return "copy"
+
+
+def _reflink(blob: Path, target: Path) -> bool:
+    if fcntl is None:
+        return False
+    with blob.open("rb") as src, target.open("wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+    target.unlink()
+    return False
@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
+from .blob_store import BlobStore
 from .config import AgentConfig
 from .models import PlanArtifact, ProjectIdea
 
@@ -18,7 +19,14 @@ class GeneratedProject:
 
 
 class ProjectScaffolder:
-    """Generate a runnable modular project from plan + idea."""
+    """Generate a runnable modular project from plan + idea.
+
+    With a ``blob_store`` every file is stored once by content and linked
+    into the project, so identical boilerplate costs no extra disk space.
+    """
+
+    def __init__(self, blob_store: BlobStore | None = None) -> None:
+        self.blob_store = blob_store
 
     def generate(
         self,
@@ -49,11 +57,16 @@ class ProjectScaffolder:
             raise ValueError("Generated files exceed configured max_files.")
         return GeneratedProject(root=root, files=written)
 
-    @staticmethod
-    def _write(path: Path, content: str, config: AgentConfig) -> Path:
+    def _write(self, path: Path, content: str, config: AgentConfig) -> Path:
         line_count = max(content.count("\n"), 1)
         if line_count > config.max_lines_per_file:
             raise ValueError(f"Generated file {path} exceeds line limit.")
+        if self.blob_store is not None:
+            self.blob_store.write(path, content.encode("utf-8"))
+            return path
+        if path.is_file() and path.stat().st_nlink > 1:
+            # Never write through a link shared with other projects.
+            path.unlink()
         path.write_text(content, encoding="utf-8")
         return path
 
@@ -23,11 +23,34 @@ class AgentConfig:
     run_type_check: bool = False
     run_coverage: bool = True
     strict_validation: bool = True
+    validation_concurrency: int = 1
+    validation_fail_fast: bool = False
+    validation_cache: bool = True
+    validation_cache_entries: int = 512
+    validation_warm_workers: int = 0
+    history_retention_days: int = 30
+    dedupe_files: bool = False
     schedule_lock_file: Path = Path("state/scheduler.lock")
     lock_stale_seconds: int = 3600
+    backup_interval_seconds: float = 3600.0
     auto_git: bool = False
     auto_pr: bool = False
     github_repo: str = ""
+    pr_drain_seconds: float = 120.0
+    job_workers: int = 1
+    web_threads: int = 8
+    log_format: str = "text"
+    capture_bytes: int = 64 * 1024
+    check_timeout_seconds: float = 600.0
+    check_cpu_seconds: int = 300
+    check_memory_mb: int = 2048
+    tool_cache: bool = True
+    tool_cache_mb: int = 512
+    syntax_in_memory: bool = True
+    lean_checks: bool = False
+    health_interval_seconds: float = 10.0
+    health_ttl_seconds: float = 30.0
+    health_history_size: int = 360
 
     @classmethod
     def from_env(cls) -> "AgentConfig":
@@ -41,12 +64,50 @@ class AgentConfig:
             run_type_check=os.getenv("AUTODEV_RUN_TYPECHECK", "false").lower() == "true",
             run_coverage=os.getenv("AUTODEV_RUN_COVERAGE", "true").lower() == "true",
             strict_validation=os.getenv("AUTODEV_STRICT_VALIDATION", "true").lower() == "true",
+            validation_concurrency=int(os.getenv("AUTODEV_VALIDATION_CONCURRENCY", "1")),
+            validation_fail_fast=os.getenv("AUTODEV_VALIDATION_FAIL_FAST", "false").lower() == "true",
+            validation_cache=os.getenv("AUTODEV_VALIDATION_CACHE", "true").lower() == "true",
+            validation_cache_entries=int(os.getenv("AUTODEV_VALIDATION_CACHE_ENTRIES", "512")),
+            validation_warm_workers=int(os.getenv("AUTODEV_VALIDATION_WARM_WORKERS", "0")),
+            history_retention_days=int(os.getenv("AUTODEV_HISTORY_RETENTION_DAYS", "30")),
+            dedupe_files=os.getenv("AUTODEV_DEDUPE_FILES", "false").lower() == "true",
             lock_stale_seconds=int(os.getenv("AUTODEV_LOCK_STALE_SECONDS", "3600")),
+            backup_interval_seconds=float(os.getenv("AUTODEV_BACKUP_INTERVAL_SECONDS", "3600")),
             auto_git=os.getenv("AUTODEV_AUTO_GIT", "false").lower() == "true",
             auto_pr=os.getenv("AUTODEV_AUTO_PR", "false").lower() == "true",
             github_repo=os.getenv("AUTODEV_GITHUB_REPO", ""),
+            pr_drain_seconds=float(os.getenv("AUTODEV_PR_DRAIN_SECONDS", "120")),
+            job_workers=int(os.getenv("AUTODEV_JOB_WORKERS", "1")),
+            web_threads=int(os.getenv("AUTODEV_WEB_THREADS", "8")),
+            log_format=os.getenv("AUTODEV_LOG_FORMAT", "text").lower(),
+            capture_bytes=int(os.getenv("AUTODEV_CAPTURE_BYTES", str(64 * 1024))),
+            check_timeout_seconds=float(os.getenv("AUTODEV_CHECK_TIMEOUT_SECONDS", "600")),
+            check_cpu_seconds=int(os.getenv("AUTODEV_CHECK_CPU_SECONDS", "300")),
+            check_memory_mb=int(os.getenv("AUTODEV_CHECK_MEMORY_MB", "2048")),
+            tool_cache=os.getenv("AUTODEV_TOOL_CACHE", "true").lower() == "true",
+            tool_cache_mb=int(os.getenv("AUTODEV_TOOL_CACHE_MB", "512")),
+            syntax_in_memory=os.getenv("AUTODEV_SYNTAX_IN_MEMORY", "true").lower() == "true",
+            lean_checks=os.getenv("AUTODEV_LEAN_CHECKS", "false").lower() == "true",
+            health_interval_seconds=float(os.getenv("AUTODEV_HEALTH_INTERVAL_SECONDS", "10")),
+            health_ttl_seconds=float(os.getenv("AUTODEV_HEALTH_TTL_SECONDS", "30")),
+            health_history_size=int(os.getenv("AUTODEV_HEALTH_HISTORY", "360")),
         )
 
+    @property
+    def blob_store_path(self) -> Path:
+        """Directory of the content-addressed store used when ``dedupe_files`` is on."""
+        return self.memory_db_path.parent / "blobs"
+
+    @property
+    def tool_cache_path(self) -> Path:
+        """Shared bytecode, pytest, coverage and mypy caches used by validation checks."""
+        return self.memory_db_path.parent / "tool_cache"
+
+    @property
+    def artifacts_path(self) -> Path:
+        """Directory of full check outputs that exceeded ``capture_bytes``."""
+        return self.memory_db_path.parent / "artifacts"
+
     def ensure_dirs(self) -> None:
         """Create required directories if they do not exist."""
         self.memory_db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -2,21 +2,191 @@
 
 from __future__ import annotations
 
+import io
+import os
+import re
+import tokenize
+from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
+from .logging_config import get_logger
 from .models import ValidationResult
 
+logger = get_logger("correction")
+
+_DIAGNOSTIC = re.compile(r"^(?P<path>[^:\s][^:]*):(?P<line>\d+):(?P<column>\d+): (?P<code>[A-Z]+\d+) (?P<message>.*)$")
+_FOUND_BLANKS = re.compile(r"found (\d+)")
+# Top-level only: deleting an indented import could leave its block empty.
+_SIMPLE_IMPORT = re.compile(r"^(import [\w.]+|from [\w.]+ import \w+)\s*(#.*)?$")
+
+
+@dataclass(slots=True, frozen=True)
+class Diagnostic:
+    """One flake8 finding: ``path:line:column: CODE message``."""
+
+    path: str
+    line: int
+    column: int
+    code: str
+    message: str
+
+
+@dataclass(slots=True)
+class _SourceFile:
+    """Editable view of a file for one read -> fix -> write pass."""
+
+    lines: list[str]
+    trailing_newline: bool
+    # Indexes of lines whose line break falls inside a string; their trailing whitespace is string content.
+    string_lines: frozenset[int] = frozenset()
+
+
+Fixer = Callable[[_SourceFile, int, Diagnostic], None]
+
+
+def parse_flake8_diagnostics(logs: list[str]) -> list[Diagnostic]:
+    """Extract structured diagnostics from the flake8 section of validation logs."""
+    diagnostics: list[Diagnostic] = []
+    in_lint = False
+    for entry in logs:
+        if entry.startswith("$ "):
+            in_lint = "flake8" in entry
+            continue
+        if not in_lint:
+            continue
+        for line in entry.splitlines():
+            match = _DIAGNOSTIC.match(line.strip())
+            if match:
+                diagnostics.append(
+                    Diagnostic(
+                        path=match["path"],
+                        line=int(match["line"]),
+                        column=int(match["column"]),
+                        code=match["code"],
+                        message=match["message"],
+                    )
+                )
+    return diagnostics
+
+
+def _lint_logs(validation: ValidationResult) -> list[str]:
+    """Validation logs, with the full flake8 output when the captured log only kept its head and tail."""
+    artifact = validation.artifacts.get("lint.stdout")
+    if artifact is None or not Path(artifact).is_file():
+        return validation.logs
+    return ["$ flake8", Path(artifact).read_text(encoding="utf-8", errors="replace")]
+
+
+def _append_noqa(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    line = source.lines[index]
+    if "# noqa" not in line and index not in source.string_lines:
+        source.lines[index] = f"{line}  # noqa: {diagnostic.code}"
+
+
+def _strip_trailing_whitespace(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    if index not in source.string_lines:
+        source.lines[index] = source.lines[index].rstrip()
+
+
+def _drop_trailing_blank_lines(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    while source.lines and not source.lines[-1].strip():
+        source.lines.pop()
+
+
+def _add_final_newline(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    source.trailing_newline = True
+
+
+def _remove_unused_import(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    if _SIMPLE_IMPORT.match(source.lines[index]):
+        del source.lines[index]
+    else:
+        _append_noqa(source, index, diagnostic)
+
+
+def _pad_blank_lines(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    found = _FOUND_BLANKS.search(diagnostic.message)
+    missing = 2 - int(found.group(1)) if found else 1
+    source.lines[index:index] = [""] * max(missing, 0)
+
+
+def _trim_blank_lines(source: _SourceFile, index: int, diagnostic: Diagnostic) -> None:
+    allowed = 2 if not source.lines[index].startswith((" ", "\t")) else 1
+    start = index
+    while start > 0 and not source.lines[start - 1].strip():
+        start -= 1
+    excess = (index - start) - allowed
+    if excess > 0:
+        del source.lines[start : start + excess]
+
+
+FIXERS: dict[str, Fixer] = {
+    "E302": _pad_blank_lines,
+    "E303": _trim_blank_lines,
+    "E305": _pad_blank_lines,
+    "E501": _append_noqa,
+    "F401": _remove_unused_import,
+    "W291": _strip_trailing_whitespace,
+    "W292": _add_final_newline,
+    "W293": _strip_trailing_whitespace,
+    "W391": _drop_trailing_blank_lines,
+}
+
 
 class CorrectionEngine:
     """Apply deterministic fixes based on validation failure types."""
 
     def apply(self, project_root: Path, validation: ValidationResult) -> None:
         """Apply lightweight remediations and annotate attempts."""
-        if not validation.checks.get("tests", validation.checks.get("coverage", True)):
+        failed = {name for name, ok in validation.checks.items() if not ok and name not in validation.cancelled}
+        if "tests" in failed or "coverage" in failed:
             self._repair_tests(project_root)
-        if not validation.checks.get("lint", True):
-            self._normalize_newline(project_root)
-            self._fix_long_lines(project_root)
+        if "lint" in failed:
+            diagnostics = parse_flake8_diagnostics(_lint_logs(validation))
+            if diagnostics:
+                self.fix_diagnostics(project_root, diagnostics)
+            else:
+                self._normalize_newline(project_root)
+                self._fix_long_lines(project_root)
+
+    @staticmethod
+    def fix_diagnostics(project_root: Path, diagnostics: list[Diagnostic]) -> list[Path]:
+        """Fix each affected file in one read -> fix -> write pass; return files rewritten."""
+        by_file: dict[str, list[Diagnostic]] = defaultdict(list)
+        for diagnostic in diagnostics:
+            if diagnostic.code in FIXERS:
+                by_file[diagnostic.path].append(diagnostic)
+
+        rewritten: list[Path] = []
+        for relative, file_diagnostics in by_file.items():
+            file_path = project_root / relative
+            if not file_path.is_file():
+                continue
+            content = file_path.read_text(encoding="utf-8")
+            source = _SourceFile(
+                lines=content.splitlines(), trailing_newline=content.endswith("\n"), string_lines=_string_lines(content)
+            )
+            # Bottom-up and right to left, so inserting or deleting lines never shifts a pending diagnostic.
+            # Once a fix adds or removes lines, the rest of that line's diagnostics no longer point at it.
+            restructured: int | None = None
+            for diagnostic in sorted(file_diagnostics, key=lambda item: (item.line, item.column), reverse=True):
+                index = min(diagnostic.line, len(source.lines)) - 1
+                if index < 0 or diagnostic.line == restructured:
+                    continue
+                count = len(source.lines)
+                FIXERS[diagnostic.code](source, index, diagnostic)
+                if len(source.lines) != count:
+                    restructured = diagnostic.line
+            fixed = "\n".join(source.lines) + ("\n" if source.trailing_newline and source.lines else "")
+            if file_path.suffix == ".py" and _compiles(content, relative) and not _compiles(fixed, relative):
+                logger.warning("Skipped lint fixes for %s: they would break its syntax", relative)
+                continue
+            if _write_if_changed(file_path, content, fixed):
+                rewritten.append(file_path)
+        logger.debug("Fixed %d diagnostic(s) across %d file(s)", len(diagnostics), len(rewritten))
+        return rewritten
 
     @staticmethod
     def _repair_tests(project_root: Path) -> None:
@@ -26,9 +196,10 @@ class CorrectionEngine:
         content = test_file.read_text(encoding="utf-8")
         if "test_run_returns_success_code" in content:
             return
-        test_file.write_text(
+        _write_if_changed(
+            test_file,
+            content,
             "from app.main import run\n\n\ndef test_run_returns_success_code() -> None:\n    assert run() == 0\n",
-            encoding="utf-8",
         )
 
     @staticmethod
@@ -41,7 +212,7 @@ class CorrectionEngine:
                 lines.pop()
             # Ensure file ends with exactly one newline
             fixed_content = "\n".join(lines) + "\n" if lines else ""
-            file_path.write_text(fixed_content, encoding="utf-8")
+            _write_if_changed(file_path, content, fixed_content)
 
     @staticmethod
     def _fix_long_lines(project_root: Path) -> None:
@@ -51,13 +222,47 @@ class CorrectionEngine:
             lines = content.split("\n")
             fixed_lines = []
             for line in lines:
-                if len(line) > 79:
-                    # For imports, try to split them
-                    if line.lstrip().startswith("from ") or line.lstrip().startswith("import "):
-                        # Simple fix: For long imports, just leave as-is for now (flake8 noqa might be needed)
-                        fixed_lines.append(line + "  # noqa: E501")
-                    else:
-                        fixed_lines.append(line + "  # noqa: E501")
+                if len(line) > 79 and "# noqa" not in line:
+                    fixed_lines.append(line + "  # noqa: E501")
                 else:
                     fixed_lines.append(line)
-            file_path.write_text("\n".join(fixed_lines), encoding="utf-8")
+            _write_if_changed(file_path, content, "\n".join(fixed_lines))
+
+
+def _string_lines(content: str) -> frozenset[int]:
+    """Indexes of lines that end inside a multi-line string token; empty if ``content`` does not tokenize."""
+    inside: set[int] = set()
+    string_types = {tokenize.STRING, getattr(tokenize, "FSTRING_MIDDLE", tokenize.STRING)}
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(content).readline):
+            if token.type in string_types and token.end[0] > token.start[0]:
+                inside.update(range(token.start[0] - 1, token.end[0] - 1))
+    except (tokenize.TokenError, SyntaxError):
+        return frozenset()
+    return frozenset(inside)
+
+
+def _compiles(content: str, filename: str) -> bool:
+    try:
+        compile(content, filename, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError):
+        return False
+    return True
+
+
+def _write_if_changed(path: Path, original: str, updated: str) -> bool:
+    """Write ``updated`` only when it differs, leaving mtimes of clean files untouched.
+
+    The new content goes to a temporary file that replaces ``path``, so a file
+    hardlinked from the blob store is copied on write rather than modified for
+    every project sharing it.
+    """
+    if updated == original:
+        return False
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(updated, encoding="utf-8")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return True
@@ -0,0 +1,124 @@
+"""Long-lived daemon loop that keeps orchestrator components warm between cycles."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from random import Random
+from typing import Callable
+
+from .health import HealthChecker
+from .logging_config import get_logger
+
+logger = get_logger("daemon")
+
+
+@dataclass(slots=True)
+class CycleTiming:
+    """Latency measurement for one daemon cycle."""
+
+    cycle: int
+    success: bool
+    duration_seconds: float
+
+
+class OrchestratorDaemon:
+    """Run a cycle callable on a jittered interval until asked to drain.
+
+    The callable is typically ``AutoDevOrchestrator.run_once`` bound to an
+    orchestrator built once at startup, so its SQLite store, validator and
+    logging handlers are reused by every cycle instead of rebuilt by cron.
+
+    ``timings`` keeps the newest ``timing_history`` cycles; totals over every
+    cycle are kept as running counts.
+    """
+
+    def __init__(
+        self,
+        run_cycle: Callable[[], bool],
+        *,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+        health_checker: HealthChecker | None = None,
+        health_every: int = 10,
+        timing_history: int = 1000,
+        seed: int | None = None,
+    ) -> None:
+        self.run_cycle = run_cycle
+        self.interval_seconds = max(0.0, interval_seconds)
+        self.jitter_seconds = max(0.0, jitter_seconds)
+        self.health_checker = health_checker
+        self.health_every = max(1, health_every)
+        self.stop_event = threading.Event()
+        self.timings: deque[CycleTiming] = deque(maxlen=max(1, timing_history))
+        self.cycles_run = 0
+        self.cycles_succeeded = 0
+        self.max_latency_seconds = 0.0
+        self._rng = Random(seed)
+
+    def request_stop(self) -> None:
+        """Finish the in-flight cycle, then exit the loop instead of sleeping."""
+        self.stop_event.set()
+
+    def run(self, max_cycles: int | None = None) -> int:
+        """Loop until drained or ``max_cycles`` complete; return a process exit code."""
+        logger.info(
+            f"Daemon started - interval={self.interval_seconds:.0f}s, jitter=±{self.jitter_seconds:.0f}s"
+        )
+        cycle = 0
+        while not self.stop_event.is_set():
+            if cycle % self.health_every == 0 and not self._healthy():
+                return 1
+
+            cycle += 1
+            began = time.perf_counter()
+            try:
+                success = self.run_cycle()
+            except Exception as e:
+                logger.error(f"Daemon cycle {cycle} raised {type(e).__name__}: {e}", exc_info=True)
+                success = False
+            duration = time.perf_counter() - began
+            self.timings.append(CycleTiming(cycle=cycle, success=success, duration_seconds=duration))
+            self.cycles_run += 1
+            self.cycles_succeeded += success
+            self.max_latency_seconds = max(self.max_latency_seconds, duration)
+
+            delay = self._next_delay(duration)
+            logger.info(
+                f"Daemon cycle {cycle} finished - success={success}, latency={duration:.2f}s, "
+                f"next in {delay:.1f}s"
+            )
+            if max_cycles is not None and cycle >= max_cycles:
+                break
+            self.stop_event.wait(delay)
+
+        self._log_summary()
+        return 0
+
+    def _healthy(self) -> bool:
+        if self.health_checker is None:
+            return True
+        health = self.health_checker.check()
+        if health.status == "unhealthy":
+            logger.error(f"System unhealthy, stopping daemon: {health.details}")
+            return False
+        logger.debug(f"Health status: {health.status}")
+        return True
+
+    def _next_delay(self, cycle_duration: float) -> float:
+        """Interval between cycle starts, perturbed by uniform jitter."""
+        jitter = self._rng.uniform(-self.jitter_seconds, self.jitter_seconds) if self.jitter_seconds else 0.0
+        return max(0.0, self.interval_seconds + jitter - cycle_duration)
+
+    def _log_summary(self) -> None:
+        if not self.cycles_run:
+            logger.info("Daemon drained before running any cycle")
+            return
+        durations = sorted(timing.duration_seconds for timing in self.timings)
+        median = durations[len(durations) // 2]
+        logger.info(
+            f"Daemon drained after {self.cycles_run} cycle(s) - {self.cycles_succeeded} succeeded, "
+            f"latency median={median:.2f}s (last {len(durations)}) max={self.max_latency_seconds:.2f}s"
+        )
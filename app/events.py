@@ -0,0 +1,305 @@
+"""In-process event bus for live orchestration logs, stage transitions and run status."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable
+
+from .logging_config import get_logger
+
+if TYPE_CHECKING:
+    from .memory import MemoryStore
+
+logger = get_logger("events")
+
+
+@dataclass(slots=True, frozen=True)
+class Event:
+    """One published event; ``id`` increases by one per event."""
+
+    id: int
+    type: str
+    data: dict[str, Any]
+
+    def to_sse(self) -> str:
+        """Server-Sent Events wire format."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data)}\n\n"
+
+
+class EventBus:
+    """Sequence-numbered ring buffer of events with push notification.
+
+    Publishers may run on any thread. Subscribers register a callback that
+    is invoked after every publish (it must be cheap and non-blocking, e.g.
+    ``loop.call_soon_threadsafe``) and then read what they missed with
+    ``since(last_id)``, so reconnecting clients resume from their last id as
+    long as it is still inside the ring.
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        self._events: deque[Event] = deque(maxlen=max(1, capacity))
+        self._subscribers: list[Callable[[], None]] = []
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    @property
+    def last_id(self) -> int:
+        """Id of the most recent event, or 0 when nothing was published."""
+        with self._lock:
+            return self._next_id - 1
+
+    def publish(self, type: str, **data: Any) -> Event:
+        """Append an event and notify subscribers."""
+        return self.publish_many([(type, data)])[0]
+
+    def publish_many(self, events: list[tuple[str, dict[str, Any]]]) -> list[Event]:
+        """Append ``(type, data)`` events in order and notify subscribers once.
+
+        ``data`` may carry its own ``time``; it defaults to now.
+        """
+        published = []
+        with self._lock:
+            for type, data in events:
+                event = Event(id=self._next_id, type=type, data={"time": time.time(), **data})
+                self._next_id += 1
+                self._events.append(event)
+                published.append(event)
+        self._notify()
+        return published
+
+    def since(self, last_id: int) -> tuple[list[Event], bool]:
+        """Events after ``last_id`` and whether older ones were already evicted from the ring."""
+        with self._lock:
+            if not self._events or last_id >= self._events[-1].id:
+                return [], False
+            oldest = self._events[0].id
+            start = max(0, last_id + 1 - oldest)
+            return [self._events[index] for index in range(start, len(self._events))], last_id + 1 < oldest
+
+    def recent(self, type: str, limit: int) -> list[Event]:
+        """The newest ``limit`` events of one type, oldest first."""
+        with self._lock:
+            matching = [event for event in self._events if event.type == type]
+        return matching[-limit:] if limit > 0 else []
+
+    def _notify(self) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for notify in subscribers:
+            notify()
+
+    def subscribe(self, notify: Callable[[], None]) -> Callable[[], None]:
+        """Register ``notify`` and return a function that unregisters it."""
+        with self._lock:
+            self._subscribers.append(notify)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if notify in self._subscribers:
+                    self._subscribers.remove(notify)
+
+        return unsubscribe
+
+
+class SharedEventBus(EventBus):
+    """``EventBus`` persisted in the memory database, so every server process sees one feed.
+
+    Ids come from SQLite and the newest ``capacity`` events are kept there.
+    Subscribers are only notified of events published in this process;
+    readers poll ``since()`` to pick up events from other processes.
+    """
+
+    def __init__(self, memory: MemoryStore, capacity: int = 2000) -> None:
+        super().__init__(capacity=1)
+        self.memory = memory
+        self.capacity = max(1, capacity)
+
+    @property
+    def last_id(self) -> int:
+        return self.memory.event_bounds()[1]
+
+    def publish_many(self, events: list[tuple[str, dict[str, Any]]]) -> list[Event]:
+        events = [(type, {"time": time.time(), **data}) for type, data in events]
+        ids = self.memory.append_events(events, keep=self.capacity)
+        self._notify()
+        return [Event(id=event_id, type=type, data=data) for event_id, (type, data) in zip(ids, events)]
+
+    def since(self, last_id: int) -> tuple[list[Event], bool]:
+        rows = self.memory.events_after(last_id)
+        oldest = rows[0][0] if rows else 0
+        return [Event(*row) for row in rows], bool(rows) and last_id + 1 < oldest
+
+    def recent(self, type: str, limit: int) -> list[Event]:
+        return [Event(*row) for row in self.memory.recent_events(type, limit)]
+
+
+class EventFanout:
+    """One reader of an ``EventBus`` per process, fanned out to asyncio subscriber queues.
+
+    Polls ``bus.since()`` every ``poll_seconds`` (and right after a publish in
+    this process) while anyone is subscribed. Each queue receives the events in
+    id order; a ``None`` item means the subscriber fell more than ``queue_size``
+    events behind, or the reader itself missed evicted events, and should
+    catch up with ``bus.since()``.
+    """
+
+    def __init__(
+        self, bus: EventBus, poll_seconds: float = 1.0, queue_size: int = 1000, executor: Executor | None = None
+    ) -> None:
+        self.bus = bus
+        self.poll_seconds = poll_seconds
+        self.queue_size = max(1, queue_size)
+        self.executor = executor
+        self._queues: set[asyncio.Queue[Event | None]] = set()
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._ready: asyncio.Future | None = None
+
+    async def subscribe(self) -> asyncio.Queue[Event | None]:
+        """Queue of every event published after this returns."""
+        queue: asyncio.Queue[Event | None] = asyncio.Queue(self.queue_size)
+        self._queues.add(queue)
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._ready = asyncio.get_running_loop().create_future()
+            self._task = asyncio.get_running_loop().create_task(self._run(self._wake, self._ready))
+        try:
+            await asyncio.shield(self._ready)
+        except BaseException:
+            self.unsubscribe(queue)
+            raise
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[Event | None]) -> None:
+        """Stop delivering to ``queue``; the reader stops with its last subscriber."""
+        self._queues.discard(queue)
+        if not self._queues and self._wake is not None:
+            self._wake.set()
+
+    async def _read(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(func, *args))
+
+    async def _run(self, wake: asyncio.Event, ready: asyncio.Future) -> None:
+        loop = asyncio.get_running_loop()
+
+        def notify() -> None:
+            with suppress(RuntimeError):  # Event loop already closed.
+                loop.call_soon_threadsafe(wake.set)
+
+        unsubscribe = self.bus.subscribe(notify)
+        try:
+            last_id = await self._read(lambda: self.bus.last_id)
+        except Exception as e:
+            unsubscribe()
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        try:
+            while self._queues:
+                wake.clear()
+                try:
+                    pending, missed = await self._read(self.bus.since, last_id)
+                except Exception as e:
+                    logger.warning(f"Reading the event feed failed: {type(e).__name__}: {e}")
+                    pending, missed = [], False
+                for queue in list(self._queues):
+                    if missed:
+                        self._put(queue, None)
+                    for event in pending:
+                        self._put(queue, event)
+                if pending:
+                    last_id = pending[-1].id
+                    continue
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(wake.wait(), self.poll_seconds)
+        finally:
+            unsubscribe()
+
+    @staticmethod
+    def _put(queue: asyncio.Queue[Event | None], event: Event | None) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow subscriber resynchronises from the bus instead of holding up the others.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+
+
+class EventLogHandler(logging.Handler):
+    """Forward log records to an ``EventBus`` as ``log`` events.
+
+    With ``flush_seconds`` set, records are buffered and published together
+    from a background thread every ``flush_seconds`` (or once ``capacity``
+    are pending), so a ``SharedEventBus`` writes one transaction per batch
+    instead of one per log line.
+    """
+
+    def __init__(
+        self, bus: EventBus, level: int = logging.INFO, flush_seconds: float = 0.0, capacity: int = 200
+    ) -> None:
+        super().__init__(level)
+        self.bus = bus
+        self.flush_seconds = flush_seconds
+        self.capacity = max(1, capacity)
+        self._pending: list[logging.LogRecord] = []
+        self._pending_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.flush_seconds <= 0:
+            self._publish([record])
+            return
+        with self._pending_lock:
+            self._pending.append(record)
+            full = len(self._pending) >= self.capacity
+            if self._flusher is None and not self._closed.is_set():
+                self._flusher = threading.Thread(target=self._run, name="autodev-log-events", daemon=True)
+                self._flusher.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Publish every buffered record."""
+        with self._pending_lock:
+            records, self._pending = self._pending, []
+        if records:
+            self._publish(records)
+
+    def close(self) -> None:
+        self._closed.set()
+        self.flush()
+        super().close()
+
+    def _run(self) -> None:
+        while not self._closed.wait(self.flush_seconds):
+            self.flush()
+
+    def _publish(self, records: list[logging.LogRecord]) -> None:
+        try:
+            self.bus.publish_many(
+                [
+                    (
+                        "log",
+                        {
+                            "time": record.created,
+                            "level": record.levelname,
+                            "logger": record.name,
+                            "message": record.getMessage(),
+                        },
+                    )
+                    for record in records
+                ]
+            )
+        except Exception:
+            self.handleError(records[-1])
@@ -2,10 +2,27 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
+import tempfile
+from dataclasses import dataclass
 from pathlib import Path
 
 
+@dataclass(slots=True)
+class PublishResult:
+    """Outcome of publishing one project onto its feature branch."""
+
+    project: str
+    branch: str
+    commit: str | None
+
+    @property
+    def committed(self) -> bool:
+        """Whether a new commit was created."""
+        return self.commit is not None
+
+
 class GitWorkflow:
     """Encapsulates branch and commit operations."""
 
@@ -34,3 +51,65 @@ class GitWorkflow:
 
     def push_branch(self, branch: str, remote: str = "origin") -> None:
         subprocess.run(["git", "push", "-u", remote, branch], cwd=self.repo_root, check=True)
+
+    def publish_project(self, project_dir: Path, *, base: str = "HEAD") -> PublishResult:
+        """Commit ``project_dir`` onto ``feature/<name>`` without touching HEAD, the index or the worktree."""
+        return self.publish_projects([project_dir], base=base)[0]
+
+    def publish_projects(self, project_dirs: list[Path], *, base: str = "HEAD") -> list[PublishResult]:
+        """Commit each project onto its own feature branch in one pass.
+
+        Every tree is built in a temporary index from the branch tip (or
+        ``base`` for new branches) with only that project's directory
+        re-staged, so the cost depends on the project size rather than the
+        repository. All branch refs are then moved in a single atomic
+        ``update-ref`` transaction that fails if another run moved them first.
+        """
+        base_commit = self._git("rev-parse", "--verify", f"{base}^{{commit}}").strip()
+        zero = "0" * len(base_commit)
+        results: list[PublishResult] = []
+        updates: list[str] = []
+        with tempfile.TemporaryDirectory(prefix="autodev-index-") as tmp:
+            env = {**os.environ, "GIT_INDEX_FILE": str(Path(tmp) / "index")}
+            for project_dir in project_dirs:
+                name = project_dir.name
+                branch = f"feature/{name}"
+                current = self._resolve(f"refs/heads/{branch}")
+                parent = current or base_commit
+                tree = self._build_tree(parent, self._relative(project_dir), env)
+                if tree == self._git("rev-parse", f"{parent}^{{tree}}").strip():
+                    results.append(PublishResult(project=name, branch=branch, commit=None))
+                    continue
+                message = f"feat: add {name} with tests and documentation"
+                commit = self._git("commit-tree", tree, "-p", parent, "-m", message).strip()
+                updates.append(f"update refs/heads/{branch} {commit} {current or zero}\n")
+                results.append(PublishResult(project=name, branch=branch, commit=commit))
+        if updates:
+            self._git("update-ref", "--stdin", input="".join(updates))
+        return results
+
+    def _build_tree(self, parent: str, prefix: str, env: dict[str, str]) -> str:
+        """Write ``parent``'s tree with ``prefix`` replaced by its current worktree contents."""
+        self._git("read-tree", parent, env=env)
+        tracked = self._git("ls-files", "-z", "--", prefix, env=env)
+        if tracked:
+            self._git("update-index", "--force-remove", "-z", "--stdin", input=tracked, env=env)
+        present = self._git("ls-files", "-z", "--others", "--exclude-standard", "--", prefix, env=env)
+        if present:
+            self._git("update-index", "--add", "-z", "--stdin", input=present, env=env)
+        return self._git("write-tree", env=env).strip()
+
+    def _relative(self, project_dir: Path) -> str:
+        return project_dir.resolve().relative_to(self.repo_root.resolve()).as_posix()
+
+    def _resolve(self, ref: str) -> str | None:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", ref], cwd=self.repo_root, capture_output=True, text=True
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def _git(self, *args: str, input: str | None = None, env: dict[str, str] | None = None) -> str:
+        result = subprocess.run(
+            ["git", *args], cwd=self.repo_root, input=input, env=env, capture_output=True, text=True, check=True
+        )
+        return result.stdout
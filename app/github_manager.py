@@ -2,17 +2,120 @@
 
 from __future__ import annotations
 
+import http.client
 import json
 import os
-import urllib.request
+import queue
+import threading
+import time
+import urllib.parse
+from email.utils import parsedate_to_datetime
+
+DEFAULT_API_URL = "https://api.github.com"
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class GitHubError(RuntimeError):
+    """A failed GitHub API call; ``retry_after`` is set when the server asked us to wait."""
+
+    def __init__(self, status: int, message: str, retry_after: float | None = None) -> None:
+        super().__init__(f"GitHub API error {status}: {message}" if status else message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Whether repeating the same request later may succeed."""
+        return self.status == 0 or self.status in RETRYABLE_STATUSES or self.retry_after is not None
+
+
+class _ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, reused across requests and threads."""
+
+    def __init__(self, base_url: str, size: int, timeout: float) -> None:
+        parts = urllib.parse.urlsplit(base_url)
+        self.secure = parts.scheme == "https"
+        self.host = parts.hostname or ""
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[http.client.HTTPConnection] = queue.LifoQueue(maxsize=max(1, size))
+        self.opened = 0
+
+    def request(
+        self, method: str, path: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        """Send one request and return the response with its fully read body."""
+        try:
+            conn, reused = self._idle.get_nowait(), True
+        except queue.Empty:
+            conn, reused = self._open(), False
+        try:
+            conn.request(method, self.prefix + path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a fresh one.
+            conn = self._open()
+            conn.request(method, self.prefix + path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+        return response, data
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _open(self) -> http.client.HTTPConnection:
+        self.opened += 1
+        factory = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        return factory(self.host, self.port, timeout=self.timeout)
 
 
 class GitHubManager:
-    """Minimal GitHub API integration for pull request creation."""
+    """Minimal GitHub API integration for pull request creation.
+
+    Requests share a pool of keep-alive connections. Rate-limit headers are
+    tracked: once ``X-RateLimit-Remaining`` reaches zero, further calls fail
+    fast with a ``GitHubError`` carrying ``retry_after`` until the window
+    resets, and ``Retry-After`` responses are surfaced the same way.
+    ``create_pull_request`` is idempotent: an existing open PR for the same
+    head and base is returned instead of creating a duplicate.
+    """
 
-    def __init__(self, repo: str) -> None:
+    def __init__(
+        self,
+        repo: str,
+        *,
+        token: str | None = None,
+        base_url: str | None = None,
+        timeout: float = 30,
+        pool_size: int = 2,
+    ) -> None:
         self.repo = repo
-        self.token = os.getenv("GITHUB_TOKEN", "")
+        self.token = os.getenv("GITHUB_TOKEN", "") if token is None else token
+        self.base_url = base_url or os.getenv("AUTODEV_GITHUB_API_URL", DEFAULT_API_URL)
+        self.rate_limit_remaining: int | None = None
+        self.blocked_until = 0.0
+        self._pool = _ConnectionPool(self.base_url, pool_size, timeout)
+        self._lock = threading.Lock()
 
     def create_pull_request(self, *, title: str, body: str, head: str, base: str = "main") -> dict:
         """Create a GitHub pull request and return API response payload."""
@@ -21,17 +124,81 @@ class GitHubManager:
         if not self.repo:
             raise RuntimeError("Target GitHub repository is not configured.")
 
-        payload = json.dumps({"title": title, "body": body, "head": head, "base": base}).encode("utf-8")
-        request = urllib.request.Request(
-            url=f"https://api.github.com/repos/{self.repo}/pulls",
-            data=payload,
-            method="POST",
-            headers={
-                "Authorization": f"Bearer {self.token}",
-                "Accept": "application/vnd.github+json",
-                "Content-Type": "application/json",
-                "User-Agent": "autodev-agent",
-            },
-        )
-        with urllib.request.urlopen(request, timeout=30) as response:
-            return json.loads(response.read().decode("utf-8"))
+        existing = self.find_pull_request(head=head, base=base)
+        if existing is not None:
+            return existing
+        payload = {"title": title, "body": body, "head": head, "base": base}
+        try:
+            return self._request("POST", f"/repos/{self.repo}/pulls", payload)
+        except GitHubError as e:
+            # 422 also covers "A pull request already exists", e.g. when an earlier attempt timed out after creating it.
+            if e.status == 422:
+                existing = self.find_pull_request(head=head, base=base)
+                if existing is not None:
+                    return existing
+            raise
+
+    def find_pull_request(self, *, head: str, base: str = "main") -> dict | None:
+        """Return the open pull request from ``head`` into ``base``, if any."""
+        owner = self.repo.split("/", 1)[0]
+        query = urllib.parse.urlencode({"head": f"{owner}:{head}", "base": base, "state": "open"})
+        pulls = self._request("GET", f"/repos/{self.repo}/pulls?{query}")
+        return pulls[0] if pulls else None
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self._pool.close()
+
+    def _request(self, method: str, path: str, payload: dict | None = None) -> dict | list:
+        wait = self.blocked_until - time.time()
+        if wait > 0:
+            raise GitHubError(429, "rate limit exhausted", retry_after=wait)
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "autodev-agent",
+        }
+        body = None
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        try:
+            response, data = self._pool.request(method, path, body, headers)
+        except (http.client.HTTPException, OSError) as e:
+            raise GitHubError(0, f"{type(e).__name__}: {e}") from e
+
+        retry_after = self._track_rate_limit(response)
+        if response.status >= 400:
+            message = data.decode("utf-8", errors="replace")[:500]
+            if response.status in (403, 429) and (retry_after is not None or self.rate_limit_remaining == 0):
+                raise GitHubError(response.status, message, retry_after=retry_after if retry_after is not None else 60.0)
+            raise GitHubError(response.status, message, retry_after=retry_after if response.status >= 500 else None)
+        return json.loads(data.decode("utf-8")) if data else {}
+
+    def _track_rate_limit(self, response: http.client.HTTPResponse) -> float | None:
+        """Record rate-limit headers and return the server-requested delay, if any."""
+        with self._lock:
+            remaining = response.getheader("X-RateLimit-Remaining")
+            if remaining is not None and remaining.isdigit():
+                self.rate_limit_remaining = int(remaining)
+                reset = response.getheader("X-RateLimit-Reset")
+                if self.rate_limit_remaining == 0 and reset and reset.isdigit():
+                    self.blocked_until = float(reset)
+            retry_after = _parse_retry_after(response.getheader("Retry-After"))
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, time.time() + retry_after)
+            elif self.rate_limit_remaining == 0 and self.blocked_until > time.time():
+                retry_after = self.blocked_until - time.time()
+            return retry_after
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """``Retry-After`` is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -3,10 +3,18 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+import shutil
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
+from .logging_config import get_logger
+
+logger = get_logger("health")
+
 
 @dataclass(slots=True)
 class HealthStatus:
@@ -18,6 +26,28 @@ class HealthStatus:
     details: dict[str, str] = None  # type: ignore
 
 
+@dataclass(slots=True)
+class HealthSample:
+    """One timed health check with the resource metrics gathered alongside it."""
+
+    health: HealthStatus
+    disk_free_bytes: int | None = None
+    db_size_bytes: int | None = None
+    probe_ms: dict[str, float] = field(default_factory=dict)
+    sampled_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> dict:
+        """JSON-friendly view for the web UI."""
+        return {
+            "status": self.health.status,
+            "checks": self.health.checks,
+            "timestamp": self.health.timestamp,
+            "disk_free_bytes": self.disk_free_bytes,
+            "db_size_bytes": self.db_size_bytes,
+            "probe_ms": self.probe_ms,
+        }
+
+
 class HealthChecker:
     """Perform system health checks."""
 
@@ -27,20 +57,36 @@ class HealthChecker:
 
     def check(self) -> HealthStatus:
         """Run all health checks."""
-        checks = {}
+        return self.sample().health
+
+    def sample(self) -> HealthSample:
+        """Run all health checks, timing each probe and recording disk and database size."""
+        checks: dict[str, str] = {}
+        probe_ms: dict[str, float] = {}
+
+        started = time.perf_counter()
         checks["memory_db"] = self._check_memory_db()
+        probe_ms["memory_db"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
         checks["workspace"] = self._check_workspace()
-        checks["disk_space"] = self._check_disk_space()
+        probe_ms["workspace"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        disk_free = self._disk_free_bytes()
+        checks["disk_space"] = self._check_disk_space(disk_free)
+        probe_ms["disk_space"] = (time.perf_counter() - started) * 1000
 
         failed = [name for name, status in checks.items() if status != "ok"]
         status_str = "unhealthy" if len(failed) > 1 else "degraded" if failed else "healthy"
 
-        return HealthStatus(
+        health = HealthStatus(
             status=status_str,
             timestamp=datetime.now(tz=timezone.utc).isoformat(),
             checks=checks,
             details={"failed_checks": failed} if failed else {},
         )
+        return HealthSample(
+            health=health, disk_free_bytes=disk_free, db_size_bytes=self._db_size_bytes(), probe_ms=probe_ms
+        )
 
     def _check_memory_db(self) -> str:
         """Check if memory database is accessible."""
@@ -72,20 +118,110 @@ class HealthChecker:
         except Exception:
             return "not_writable"
 
-    def _check_disk_space(self) -> str:
-        """Check if sufficient disk space is available."""
+    def _disk_free_bytes(self) -> int | None:
         try:
-            import shutil
+            return shutil.disk_usage(self.workspace_root).free
+        except OSError:
+            return None
 
-            stat = shutil.disk_usage(self.workspace_root)
-            # Require at least 100MB free
-            if stat.free < 100 * 1024 * 1024:
-                return "low_space"
-            return "ok"
-        except Exception:
+    @staticmethod
+    def _check_disk_space(free_bytes: int | None) -> str:
+        """Check if sufficient disk space is available."""
+        if free_bytes is None:
             return "error"
+        # Require at least 100MB free
+        if free_bytes < 100 * 1024 * 1024:
+            return "low_space"
+        return "ok"
+
+    def _db_size_bytes(self) -> int | None:
+        """Database size including its WAL file."""
+        total = None
+        for path in (self.memory_db_path, self.memory_db_path.with_name(self.memory_db_path.name + "-wal")):
+            try:
+                total = (total or 0) + path.stat().st_size
+            except OSError:
+                continue
+        return total
 
     def to_json(self, health: HealthStatus) -> str:
         """Serialize health status to JSON."""
         health_dict = asdict(health)
         return json.dumps(health_dict, indent=2)
+
+
+class HealthSampler:
+    """Samples health on a background thread and serves the latest result from memory.
+
+    Readers call ``latest()``, which never probes while the cached sample is
+    younger than ``ttl_seconds``; if the sampler falls behind, one caller
+    refreshes while the rest wait for it. The last ``history_size`` samples
+    are kept for trend charts.
+    """
+
+    def __init__(
+        self,
+        checker: HealthChecker,
+        *,
+        interval_seconds: float = 10.0,
+        ttl_seconds: float = 30.0,
+        history_size: int = 360,
+    ) -> None:
+        self.checker = checker
+        self.interval_seconds = interval_seconds
+        self.ttl_seconds = max(ttl_seconds, interval_seconds)
+        self._history: deque[HealthSample] = deque(maxlen=max(1, history_size))
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start background sampling."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="autodev-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def latest(self) -> HealthSample:
+        """Most recent sample, refreshed synchronously only when older than the TTL."""
+        sample = self._newest()
+        if sample is not None and time.monotonic() - sample.sampled_at <= self.ttl_seconds:
+            return sample
+        with self._refresh_lock:
+            sample = self._newest()
+            if sample is not None and time.monotonic() - sample.sampled_at <= self.ttl_seconds:
+                return sample
+            return self.refresh()
+
+    def refresh(self) -> HealthSample:
+        """Take a sample now and add it to the history."""
+        sample = self.checker.sample()
+        with self._lock:
+            self._history.append(sample)
+        return sample
+
+    def history(self) -> list[HealthSample]:
+        """Samples currently held in the ring buffer, oldest first."""
+        with self._lock:
+            return list(self._history)
+
+    def _newest(self) -> HealthSample | None:
+        with self._lock:
+            return self._history[-1] if self._history else None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Health sampling failed: {type(e).__name__}: {e}")
+            self._stop.wait(self.interval_seconds)
@@ -2,13 +2,60 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from random import Random
+from typing import Callable
 
 from .models import ProjectCategory, ProjectIdea
 
+# Names another process claims between our read of the usage index and our insert; a handful is plenty.
+RESERVE_ATTEMPTS = 20
+
+
+@dataclass(slots=True)
+class TemplateUsage:
+    """How often a base template has been used and the highest ``-vN`` suffix handed out."""
+
+    count: int = 0
+    max_suffix: int = 0
+
+
+def split_name(name: str) -> tuple[str, int]:
+    """Split a project name into its base template and version; the bare base name is version 1."""
+    base, separator, suffix = name.rpartition("-v")
+    if separator and suffix.isdigit():
+        return base, int(suffix)
+    return name, 1
+
+
+def template_of(name: str) -> str:
+    """Base template of a project name, dropping any ``-vN`` recycling suffix."""
+    return split_name(name)[0]
+
+
+def record_usage(usage: dict[str, TemplateUsage], name: str) -> None:
+    """Count ``name`` against its template in ``usage``."""
+    template, suffix = split_name(name)
+    entry = usage.setdefault(template, TemplateUsage())
+    entry.count += 1
+    entry.max_suffix = max(entry.max_suffix, suffix)
+
+
+def usage_from_names(names: set[str]) -> dict[str, TemplateUsage]:
+    """Build a usage index from a full set of project names."""
+    usage: dict[str, TemplateUsage] = {}
+    for name in names:
+        record_usage(usage, name)
+    return usage
+
 
 class IdeaGenerator:
-    """Generate non-duplicate project ideas from category pools."""
+    """Generate non-duplicate project ideas from category pools.
+
+    Selection works from a per-template usage index (use count and highest
+    suffix), so its cost depends on the number of templates rather than on
+    how many projects have been generated.
+    """
 
     _TEMPLATES: dict[ProjectCategory, list[str]] = {
         ProjectCategory.CLI: ["log-summarizer", "csv-inspector", "backup-checker"],
@@ -23,11 +70,19 @@ class IdeaGenerator:
 
     def generate(
         self,
-        existing_names: set[str],
-        min_complexity: int,
-        max_complexity: int,
+        existing_names: set[str] | None = None,
+        min_complexity: int = 1,
+        max_complexity: int = 5,
+        *,
+        usage: dict[str, TemplateUsage] | None = None,
     ) -> ProjectIdea:
-        """Create a unique project idea honoring complexity constraints."""
+        """Create a unique project idea honoring complexity constraints.
+
+        Pass ``usage`` (for example ``MemoryStore.template_usage()``) to avoid
+        scanning ``existing_names``; the caller records the returned name.
+        """
+        if usage is None:
+            usage = usage_from_names(existing_names or set())
         categories = list(ProjectCategory)
         self._rng.shuffle(categories)
 
@@ -35,41 +90,41 @@ class IdeaGenerator:
             names = self._TEMPLATES[category][:]
             self._rng.shuffle(names)
             for candidate in names:
-                if candidate in existing_names:
+                if candidate in usage:
                     continue
                 complexity = self._rng.randint(min_complexity, max_complexity)
                 summary = f"Build {candidate} as a {category.value} project."
                 return ProjectIdea(candidate, category, complexity, summary)
 
-        # Fallback: recycle the least-used base template with a numeric suffix.
-        template_usage: list[tuple[int, ProjectCategory, str]] = []
-        for category, names in self._TEMPLATES.items():
-            for base_name in names:
-                count = self._usage_count(existing_names, base_name)
-                template_usage.append((count, category, base_name))
-
+        # Fallback: recycle the least-used base template with the next free numeric suffix.
+        template_usage = [
+            (usage[base_name].count, category, base_name)
+            for category, names in self._TEMPLATES.items()
+            for base_name in names
+        ]
         min_count = min(item[0] for item in template_usage)
         least_used = [item for item in template_usage if item[0] == min_count]
         _, category, base_name = self._rng.choice(least_used)
-        suffix = 2
-        candidate = f"{base_name}-v{suffix}"
-        while candidate in existing_names:
-            suffix += 1
-            candidate = f"{base_name}-v{suffix}"
+        candidate = f"{base_name}-v{max(usage[base_name].max_suffix, 1) + 1}"
         complexity = self._rng.randint(min_complexity, max_complexity)
         summary = f"Build {candidate} as a {category.value} project."
         return ProjectIdea(candidate, category, complexity, summary)
 
-    @staticmethod
-    def _usage_count(existing_names: set[str], base_name: str) -> int:
-        count = 0
-        version_prefix = f"{base_name}-v"
-        for name in existing_names:
-            if name == base_name:
-                count += 1
-                continue
-            if name.startswith(version_prefix):
-                suffix = name[len(version_prefix) :]
-                if suffix.isdigit():
-                    count += 1
-        return count
+    def reserve(
+        self,
+        reserve: Callable[[ProjectIdea], bool],
+        usage: dict[str, TemplateUsage],
+        min_complexity: int = 1,
+        max_complexity: int = 5,
+    ) -> ProjectIdea:
+        """Generate ideas until ``reserve`` (e.g. ``MemoryStore.reserve_project``) claims one.
+
+        Every candidate is recorded in ``usage``, so a name another process
+        took in the meantime is not offered again.
+        """
+        for _ in range(RESERVE_ATTEMPTS):
+            idea = self.generate(min_complexity=min_complexity, max_complexity=max_complexity, usage=usage)
+            record_usage(usage, idea.name)
+            if reserve(idea):
+                return idea
+        raise RuntimeError(f"Could not reserve a project name after {RESERVE_ATTEMPTS} attempts")
@@ -0,0 +1,383 @@
+"""Supervisor that runs queued orchestration jobs in worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import IO, Any, Callable
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .config import AgentConfig
+from .events import EventBus, EventLogHandler
+from .idea_generator import IdeaGenerator, record_usage
+from .logging_config import add_log_handler, configure_logging, get_logger
+from .memory import MemoryStore
+from .models import Job, ProjectIdea
+
+logger = get_logger("jobs")
+
+JobTarget = Callable[[AgentConfig, ProjectIdea, EventBus], bool]
+
+KILL_GRACE_SECONDS = 5.0
+
+
+def run_job(config: AgentConfig, idea: ProjectIdea, events: EventBus) -> bool:
+    """Default job target: one orchestration cycle for ``idea``."""
+    from .orchestrator import AutoDevOrchestrator
+
+    orchestrator = AutoDevOrchestrator(config, events=events)
+    try:
+        return orchestrator.run_idea(idea).success
+    finally:
+        orchestrator.close(drain_timeout=config.pr_drain_seconds)
+
+
+def _worker_main(target: JobTarget, config: AgentConfig, idea: ProjectIdea, job_id: int, feed: Any) -> None:
+    # Own session: the job leads it, and each check leads a process group inside it, so cancelling finds them all.
+    if hasattr(os, "setsid"):
+        os.setsid()
+    configure_logging(json_format=config.log_format == "json")
+    events = EventBus(capacity=256)
+    if feed is not None:
+        _forward_events(events, job_id, feed)
+        add_log_handler(EventLogHandler(events))
+    try:
+        success = target(config, idea, events)
+    except Exception as e:
+        logger.error(f"Job for {idea.name} crashed: {type(e).__name__}: {e}", exc_info=True)
+        raise SystemExit(2)
+    raise SystemExit(0 if success else 1)
+
+
+def _forward_events(events: EventBus, job_id: int, feed: Any) -> None:
+    """Relay everything published on the worker's bus to the supervisor."""
+    lock = threading.Lock()
+    last_id = 0
+
+    def forward() -> None:
+        nonlocal last_id
+        with lock:
+            pending, _ = events.since(last_id)
+            for event in pending:
+                feed.send((event.type, {**event.data, "job": job_id}))
+                last_id = event.id
+
+    events.subscribe(forward)
+
+
+@dataclass(slots=True)
+class _Worker:
+    process: Any
+    project: str
+    kill_deadline: float | None = None
+
+
+class JobSupervisor:
+    """Execute jobs from ``MemoryStore``'s queue on up to ``workers`` processes.
+
+    Submitting only inserts a row, so it never waits on a run. Each claimed
+    job gets a freshly reserved idea (names stay unique across concurrent
+    jobs) and its own spawned process in a new process group; cancelling a
+    running job sends SIGTERM to that group, then SIGKILL after a grace
+    period. Jobs still running when the supervisor stops are requeued. With
+    ``events``, each worker's logs and stage events are relayed onto it.
+
+    With ``lock_file``, supervisors in several server processes elect one
+    leader through an exclusive ``flock``; the others only submit and cancel
+    (the leader sees both through the database) and take over if it exits.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryStore,
+        config: AgentConfig,
+        *,
+        workers: int = 1,
+        target: JobTarget = run_job,
+        poll_seconds: float = 0.5,
+        events: EventBus | None = None,
+        lock_file: Path | None = None,
+    ) -> None:
+        self.memory = memory
+        self.config = config
+        self.workers = max(1, workers)
+        self.target = target
+        self.poll_seconds = poll_seconds
+        self.events = events
+        self.lock_file = lock_file
+        self.leading = False
+        self._lock_handle: IO[bytes] | None = None
+        self._ideas = IdeaGenerator()
+        self._context = multiprocessing.get_context("spawn")
+        self._feeds: dict[Any, int] = {}
+        self._relay: threading.Thread | None = None
+        self._running: dict[int, _Worker] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start dispatching once this supervisor is (or becomes) the leader."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="autodev-jobs", daemon=True)
+        self._thread.start()
+        if self.events is not None:
+            self._relay = threading.Thread(target=self._relay_events, name="autodev-jobs-relay", daemon=True)
+            self._relay.start()
+
+    def stop(self) -> None:
+        """Stop dispatching, terminate running workers and put their jobs back in the queue."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for worker in self._running.values():
+            _signal_group(worker.process.pid, signal.SIGKILL)
+            worker.process.join()
+        self._running.clear()
+        if self.leading:
+            self.memory.requeue_running_jobs()
+            self.leading = False
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+        if self._relay is not None:
+            self._relay.join()
+            self._relay = None
+        for feed in list(self._feeds):
+            feed.close()
+        self._feeds.clear()
+
+    def submit(self, config: dict[str, Any], priority: int = 0) -> int:
+        """Queue a run with ``AgentConfig`` field overrides and return its job id."""
+        job_id = self.memory.submit_job(config, priority)
+        self._publish(job_id, "queued")
+        self._wake.set()
+        return job_id
+
+    def cancel(self, job_id: int) -> Job | None:
+        """Cancel a queued job or stop a running one; ``None`` if the job does not exist."""
+        job = self.memory.cancel_job(job_id)
+        if job is not None and job.state == "cancelled":
+            self._publish(job_id, "cancelled")
+        self._wake.set()
+        return job
+
+    def running(self) -> dict[int, str]:
+        """Project name per running job id."""
+        return {job_id: worker.project for job_id, worker in list(self._running.items())}
+
+    def _lead(self) -> bool:
+        """Whether this supervisor dispatches jobs; takes over leadership when the lock is free."""
+        if self.leading:
+            return True
+        if self.lock_file is not None and fcntl is not None:
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            handle = self.lock_file.open("ab")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+            self._lock_handle = handle
+        self.leading = True
+        self._adopt_orphans()
+        return True
+
+    def _adopt_orphans(self) -> None:
+        """Kill workers of a previous leader that are still alive and requeue their jobs.
+
+        A stored pid is only signalled while it still names the worker that was started for the
+        job; after a reboot or once the pid is reused, the job is just requeued.
+        """
+        for job in self.memory.list_jobs("running", limit=1000):
+            if job.pid and job.pid_identity is not None and job.pid_identity == _process_identity(job.pid):
+                _signal_group(job.pid, signal.SIGKILL, group_only=True)
+        requeued = self.memory.requeue_running_jobs()
+        if requeued:
+            logger.info(f"Requeued {requeued} job(s) left running by an earlier supervisor")
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if not self._lead():
+                    self._stop.wait(self.poll_seconds)
+                    continue
+                self._reap()
+                self._stop_cancelled()
+                self._dispatch()
+            except Exception as e:
+                logger.error(f"Job supervisor iteration failed: {type(e).__name__}: {e}", exc_info=True)
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def _dispatch(self) -> None:
+        while len(self._running) < self.workers and not self._stop.is_set():
+            job = self.memory.claim_job()
+            if job is None:
+                return
+            reader = writer = None
+            try:
+                config = replace(self.config, **job.config)
+                idea = self._reserve_idea(config)
+                if self.events is not None:
+                    # One pipe per worker: killing a job mid-write can only break its own feed.
+                    reader, writer = self._context.Pipe(duplex=False)
+                process = self._context.Process(
+                    target=_worker_main,
+                    args=(self.target, config, idea, job.id, writer),
+                    name=f"autodev-job-{job.id}",
+                )
+                process.start()
+            except Exception as e:
+                logger.error(f"Job {job.id} could not be started: {type(e).__name__}: {e}")
+                self.memory.finish_job(job.id, "failed", error=f"{type(e).__name__}: {e}")
+                self._publish(job.id, "failed")
+                if reader is not None:
+                    reader.close()
+                continue
+            finally:
+                if writer is not None:
+                    writer.close()
+            if reader is not None:
+                self._feeds[reader] = job.id
+            self._running[job.id] = _Worker(process=process, project=idea.name)
+            self.memory.set_job_worker(job.id, idea.name, process.pid, _process_identity(process.pid))
+            logger.info(f"Job {job.id} started: {idea.name} (pid {process.pid})")
+            self._publish(job.id, "running", project=idea.name)
+
+    def _reserve_idea(self, config: AgentConfig) -> ProjectIdea:
+        """Pick an idea whose name no stored or in-flight project uses, and claim it in memory.db."""
+        usage = self.memory.template_usage()
+        for worker in self._running.values():
+            record_usage(usage, worker.project)
+        return self._ideas.reserve(
+            lambda idea: self.memory.reserve_project(idea.name, idea.category, idea.complexity),
+            usage,
+            min_complexity=config.min_complexity,
+            max_complexity=config.max_complexity,
+        )
+
+    def _reap(self) -> None:
+        for job_id, worker in list(self._running.items()):
+            if worker.process.is_alive():
+                if worker.kill_deadline is not None and time.monotonic() > worker.kill_deadline:
+                    _signal_group(worker.process.pid, signal.SIGKILL)
+                continue
+            worker.process.join()
+            code = worker.process.exitcode
+            if worker.kill_deadline is not None:
+                state, error = "cancelled", None
+            elif code == 0:
+                state, error = "succeeded", None
+            else:
+                state, error = "failed", "validation failed" if code == 1 else f"worker exited with code {code}"
+            del self._running[job_id]
+            self.memory.finish_job(job_id, state, exit_code=code, error=error)
+            logger.info(f"Job {job_id} {state}: {worker.project}")
+            self._publish(job_id, state, project=worker.project)
+
+    def _stop_cancelled(self) -> None:
+        for job_id in self.memory.cancel_requested_jobs():
+            worker = self._running.get(job_id)
+            if worker is None or worker.kill_deadline is not None:
+                continue
+            logger.info(f"Cancelling job {job_id}: {worker.project}")
+            worker.kill_deadline = time.monotonic() + KILL_GRACE_SECONDS
+            _signal_group(worker.process.pid, signal.SIGTERM)
+
+    def _relay_events(self) -> None:
+        while not self._stop.is_set():
+            feeds = list(self._feeds)
+            if not feeds:
+                self._stop.wait(self.poll_seconds)
+                continue
+            for feed in wait(feeds, timeout=self.poll_seconds):
+                try:
+                    type, data = feed.recv()
+                except (EOFError, OSError, ValueError):
+                    # Worker exited (or was killed mid-message); its feed is done.
+                    self._feeds.pop(feed, None)
+                    feed.close()
+                    continue
+                self.events.publish(type, **data)
+
+    def _publish(self, job_id: int, state: str, **data: Any) -> None:
+        if self.events is not None:
+            self.events.publish("job", id=job_id, state=state, **data)
+
+
+def _process_identity(pid: int) -> str | None:
+    """Boot id and start time of ``pid``, read from ``/proc``; ``None`` where it is unavailable."""
+    try:
+        with open("/proc/sys/kernel/random/boot_id") as handle:
+            boot_id = handle.read().strip()
+        with open(f"/proc/{pid}/stat", "rb") as handle:
+            stat = handle.read()
+    except OSError:
+        return None
+    # Fields after the parenthesised command name start at field 3 (state); starttime is field 22.
+    fields = stat[stat.rfind(b")") + 2 :].split()
+    if len(fields) <= 19:
+        return None
+    return f"{boot_id}:{fields[19].decode()}"
+
+
+def _signal_group(pid: int, signum: int, *, group_only: bool = False) -> None:
+    """Signal a worker's session: its own process group and every check group in it.
+
+    Falls back to just the worker if it has not created its session yet.
+    """
+    if not hasattr(os, "killpg"):  # pragma: no cover - Windows
+        if not group_only:
+            with suppress(OSError):
+                os.kill(pid, signum)
+        return
+    try:
+        leader = os.getpgid(pid) == pid
+    except ProcessLookupError:
+        return
+    if not leader:
+        if not group_only:
+            with suppress(ProcessLookupError, PermissionError):
+                os.kill(pid, signum)
+        return
+    for group in {pid, *_session_groups(pid)}:
+        with suppress(ProcessLookupError, PermissionError):
+            os.killpg(group, signum)
+
+
+def _session_groups(session: int) -> set[int]:
+    """Process groups in ``session``, read from ``/proc``; empty where it is unavailable."""
+    groups: set[int] = set()
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return groups
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as handle:
+                stat = handle.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state, ppid, pgrp, session, ...
+        fields = stat[stat.rfind(b")") + 2 :].split()
+        if len(fields) > 3 and int(fields[3]) == session:
+            groups.add(int(fields[2]))
+    return groups
@@ -0,0 +1,98 @@
+"""Wall-clock, CPU and address-space budgets for validation subprocesses."""
+
+from __future__ import annotations
+
+import os
+import signal
+from contextlib import suppress
+from dataclasses import dataclass
+
+from .models import CheckUsage
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+# rlimits (applied between fork and exec) and wait4 rusage only exist on POSIX; elsewhere checks run unlimited.
+POSIX = os.name == "posix" and resource is not None and hasattr(os, "wait4")
+# Windows has no SIGKILL; os.kill with SIGTERM terminates the process there.
+_KILL = getattr(signal, "SIGKILL", signal.SIGTERM)
+
+
+@dataclass(slots=True, frozen=True)
+class ResourceLimits:
+    """Budgets for one check; ``None`` leaves that resource unlimited.
+
+    ``wall_seconds`` is enforced by the parent, which kills the check's whole
+    process group on overrun. ``cpu_seconds`` and ``memory_bytes`` become
+    ``RLIMIT_CPU``/``RLIMIT_AS`` in the child, so the kernel stops a spinning
+    or runaway-allocating test even if the parent is busy. Each check leads
+    its own process group but stays in its caller's session, which is how a
+    cancelled job finds and stops its checks.
+    """
+
+    wall_seconds: float | None = None
+    cpu_seconds: int | None = None
+    memory_bytes: int | None = None
+
+    def enter(self) -> None:
+        """Preexec hook for a check: lead a new process group, then lower the rlimits."""
+        os.setpgid(0, 0)
+        self.apply()
+
+    def apply(self) -> None:
+        """Lower this process's rlimits; runs in the child between fork and exec, so it must stay minimal."""
+        if resource is None:
+            return
+        if self.cpu_seconds:
+            # SIGXCPU at the soft limit, SIGKILL one second later if it is ignored.
+            _lower(resource.RLIMIT_CPU, self.cpu_seconds, self.cpu_seconds + 1)
+        if self.memory_bytes:
+            _lower(resource.RLIMIT_AS, self.memory_bytes, self.memory_bytes)
+
+    def limit_hit(self, returncode: int, usage: CheckUsage, *, timed_out: bool) -> str | None:
+        """Which budget, if any, explains how the check ended."""
+        if timed_out:
+            return "wall"
+        if not self.cpu_seconds:
+            return None
+        # SIGXCPU only comes from the soft limit; SIGKILL from the hard one, a tick past it, or from elsewhere.
+        if returncode == -signal.SIGXCPU or (returncode == -signal.SIGKILL and usage.cpu_seconds >= self.cpu_seconds + 0.9):
+            return "cpu"
+        return None
+
+    def describe(self, limit: str) -> str:
+        """Log line for a check stopped by ``limit``."""
+        if limit == "wall":
+            return f"(killed: exceeded {self.wall_seconds:g}s wall-clock budget)"
+        return f"(killed: exceeded {self.cpu_seconds}s CPU budget)"
+
+
+def wait_with_usage(pid: int) -> tuple[int, CheckUsage]:
+    """Reap ``pid`` and return its exit code with CPU time and peak RSS; blocks until it exits. POSIX only."""
+    _, status, rusage = os.wait4(pid, 0)
+    usage = CheckUsage(cpu_seconds=round(rusage.ru_utime + rusage.ru_stime, 3), max_rss_kb=rusage.ru_maxrss)
+    return os.waitstatus_to_exitcode(status), usage
+
+
+def kill_process(pid: int) -> None:
+    """SIGKILL ``pid`` if it is still running."""
+    with suppress(ProcessLookupError, PermissionError):
+        os.kill(pid, _KILL)
+
+
+def kill_group(pid: int) -> None:
+    """SIGKILL the process group led by ``pid`` (a check, or a command started in its own session)."""
+    if not hasattr(os, "killpg"):  # pragma: no cover - Windows
+        kill_process(pid)
+        return
+    with suppress(ProcessLookupError, PermissionError):
+        os.killpg(pid, signal.SIGKILL)
+
+
+def _lower(kind: int, soft: int, hard: int) -> None:
+    _, current_hard = resource.getrlimit(kind)
+    if current_hard != resource.RLIM_INFINITY:
+        soft, hard = min(soft, current_hard), min(hard, current_hard)
+    resource.setrlimit(kind, (soft, hard))
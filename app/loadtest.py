@@ -0,0 +1,140 @@
+"""HTTP load generator for measuring web UI throughput across server worker counts."""
+
+from __future__ import annotations
+
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+
+from .capture import start_process
+
+
+@dataclass(slots=True)
+class LoadResult:
+    """Throughput and latency of one load run."""
+
+    workers: int
+    requests: int
+    errors: int
+    seconds: float
+    p50_ms: float
+    p95_ms: float
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+
+def hammer(url: str, *, requests: int, concurrency: int, workers: int = 1) -> LoadResult:
+    """Issue ``requests`` GETs to ``url`` from ``concurrency`` keep-alive clients."""
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += f"?{parts.query}"
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    latencies: list[float] = []
+    errors = 0
+
+    def client() -> None:
+        nonlocal errors
+        conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        local: list[float] = []
+        failed = 0
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    failed += 1
+            except (http.client.HTTPException, OSError):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=client) for _ in range(max(1, concurrency))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    latencies.sort()
+    return LoadResult(
+        workers=workers,
+        requests=len(latencies),
+        errors=errors,
+        seconds=seconds,
+        p50_ms=_percentile(latencies, 0.50) * 1000,
+        p95_ms=_percentile(latencies, 0.95) * 1000,
+    )
+
+
+def benchmark_server(
+    workers: int,
+    *,
+    path: str = "/api/status",
+    requests: int = 2000,
+    concurrency: int = 32,
+    startup_timeout: float = 30.0,
+) -> LoadResult:
+    """Start ``uvicorn app.web_ui:app`` with ``workers`` processes on a free port and load it."""
+    port = _free_port()
+    command = [sys.executable, "-m", "uvicorn", "app.web_ui:app", "--port", str(port), "--workers", str(workers)]
+    server = start_process([*command, "--log-level", "warning"], env={**os.environ, "PYTHONUNBUFFERED": "1"})
+    try:
+        _wait_until_ready(port, server, startup_timeout)
+        url = f"http://127.0.0.1:{port}{path}"
+        hammer(url, requests=min(requests, 100), concurrency=concurrency)  # warm every worker
+        return hammer(url, requests=requests, concurrency=concurrency, workers=workers)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+
+def _wait_until_ready(port: int, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/health")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not accept connections within {timeout:.0f}s")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -0,0 +1,344 @@
+"""Seek-based log tailing and an incremental byte-offset index over rotated log files."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+# "[2024-01-31 12:00:00] autodev.orchestrator - INFO - message", as written by configure_logging.
+# JSON lines ({"time": ..., "logger": ..., "level": ..., "message": ...}) are indexed too.
+HEADER = re.compile(rb"\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] (\S+) - ([A-Z]+) - ")
+HEAD_BYTES = 64
+SOURCES = {"main": "autodev.log", "errors": "errors.log"}
+
+
+def tail_lines(path: Path, lines: int, *, block_size: int = 8192) -> list[str]:
+    """Last ``lines`` lines of ``path``, reading backwards from the end in blocks."""
+    if lines <= 0:
+        return []
+    with path.open("rb") as handle:
+        position = handle.seek(0, 2)
+        data = b""
+        while position > 0 and data.count(b"\n") <= lines:
+            step = min(block_size, position)
+            position -= step
+            handle.seek(position)
+            data = handle.read(step) + data
+    return [line.decode("utf-8", errors="replace") for line in data.splitlines()[-lines:]]
+
+
+@dataclass(slots=True)
+class LogEntry:
+    """One log record; ``cursor`` orders records chronologically within a source."""
+
+    cursor: int
+    time: str
+    level: str
+    logger: str
+    message: str
+
+    def to_dict(self) -> dict:
+        return {"cursor": self.cursor, "time": self.time, "level": self.level, "logger": self.logger, "message": self.message}
+
+
+@dataclass(slots=True)
+class LogPage:
+    """A page of query results; pass ``next_cursor`` back to continue."""
+
+    entries: list[LogEntry]
+    next_cursor: int
+    has_more: bool
+
+
+class LogIndex:
+    """Persisted index of record offsets, timestamps, levels and loggers for ``log_dir``'s logs.
+
+    Every query first indexes only the bytes appended since the previous one,
+    so its cost depends on the page size rather than the log size. Files are
+    tracked by inode, so a rotated file (``autodev.log`` -> ``autodev.log.1``)
+    keeps its entries; files rotated out of existence drop theirs, and a
+    truncated file is re-indexed from the start.
+    """
+
+    def __init__(self, log_dir: Path, index_path: Path) -> None:
+        self.log_dir = log_dir
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(index_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._lock = threading.Lock()
+        self._initialize()
+
+    def _initialize(self) -> None:
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS log_files (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                head BLOB NOT NULL,
+                indexed_bytes INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                UNIQUE (dev, ino)
+            );
+            CREATE TABLE IF NOT EXISTS log_entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                file_id INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                time TEXT NOT NULL,
+                level INTEGER NOT NULL,
+                logger TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_log_entries_source ON log_entries(source, id);
+            CREATE INDEX IF NOT EXISTS idx_log_entries_time ON log_entries(source, time, id);
+            CREATE INDEX IF NOT EXISTS idx_log_entries_level ON log_entries(source, level, id);
+            CREATE INDEX IF NOT EXISTS idx_log_entries_file ON log_entries(file_id);
+            """
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def query(
+        self,
+        source: str = "main",
+        *,
+        since: str | None = None,
+        level: str | None = None,
+        logger: str | None = None,
+        limit: int = 100,
+        cursor: int | None = None,
+    ) -> LogPage:
+        """Records at or above ``level`` from ``logger`` (and its children).
+
+        With ``cursor`` the page continues after that record; with ``since``
+        (an ISO timestamp) it starts at that time; with neither it holds the
+        newest ``limit`` records, and ``next_cursor`` follows new ones.
+        """
+        if source not in SOURCES:
+            raise ValueError(f"Unknown log source {source!r}; expected one of {', '.join(SOURCES)}")
+        clauses, params = ["e.source = ?"], [source]
+        if level is not None:
+            threshold = _level_number(level)
+            # Walking the level index pays off for the rare WARNING+ records; lower thresholds match
+            # almost every record, so the unary "+" keeps SQLite scanning in id order instead.
+            clauses.append("e.level >= ?" if threshold >= logging.WARNING else "+e.level >= ?")
+            params.append(threshold)
+        if logger:
+            clauses.append("(e.logger = ? OR substr(e.logger, 1, ?) = ?)")
+            params += [logger, len(logger) + 1, f"{logger}."]
+        since = _normalize_time(since) if since is not None and cursor is None else None
+        limit = max(1, limit)
+        tail = cursor is None and since is None
+        order = "DESC" if tail else "ASC"
+
+        with self._lock:
+            self._refresh(source)
+            latest = self._conn.execute("SELECT MAX(id) FROM log_entries WHERE source = ?", (source,)).fetchone()[0]
+            if since is not None:
+                # Records are appended in time order, so the first one at ``since`` starts the page.
+                first = self._conn.execute(
+                    "SELECT id FROM log_entries WHERE source = ? AND time >= ? ORDER BY time, id LIMIT 1", (source, since)
+                ).fetchone()
+                cursor = first[0] - 1 if first else latest or 0
+            if cursor is not None:
+                clauses.append("e.id > ?")
+                params.append(cursor)
+            rows = self._conn.execute(
+                f"""
+                SELECT e.id, e.offset, e.length, e.time, e.level, e.logger, f.id, f.dev, f.ino, f.path
+                FROM log_entries e JOIN log_files f ON f.id = e.file_id
+                WHERE {' AND '.join(clauses)}
+                ORDER BY e.id {order} LIMIT ?
+                """,
+                (*params, limit + 1),
+            ).fetchall()
+        has_more = len(rows) > limit and not tail
+        rows = rows[:limit]
+        if tail:
+            rows.reverse()
+        if rows:
+            next_cursor = rows[-1][0]
+        else:
+            next_cursor = cursor if cursor is not None else latest or 0
+        return LogPage(entries=self._read(source, rows), next_cursor=next_cursor, has_more=has_more)
+
+    def refresh(self, source: str = "main") -> None:
+        """Index whatever was appended to ``source``'s files since the last call."""
+        with self._lock:
+            self._refresh(source)
+
+    def _refresh(self, source: str) -> None:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            seen: set[int] = set()
+            for path in _source_files(self.log_dir, SOURCES[source]):
+                try:
+                    file_id = self._index_file(source, path)
+                except FileNotFoundError:
+                    continue  # Rotated away between listing and opening.
+                seen.add(file_id)
+            stale = [
+                row[0]
+                for row in self._conn.execute("SELECT id FROM log_files WHERE source = ?", (source,))
+                if row[0] not in seen
+            ]
+            for file_id in stale:
+                self._forget(file_id)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _index_file(self, source: str, path: Path) -> int:
+        with path.open("rb") as handle:
+            stat = os.fstat(handle.fileno())
+            head = handle.read(HEAD_BYTES)
+            row = self._conn.execute(
+                "SELECT id, head, indexed_bytes FROM log_files WHERE dev = ? AND ino = ?", (stat.st_dev, stat.st_ino)
+            ).fetchone()
+            if row is not None and (stat.st_size < row[2] or not head.startswith(bytes(row[1]))):
+                # Truncated, or the inode was reused by a different file.
+                self._forget(row[0])
+                row = None
+            if row is None:
+                file_id = self._conn.execute(
+                    "INSERT INTO log_files(source, dev, ino, head, indexed_bytes, path) VALUES(?, ?, ?, ?, 0, ?)",
+                    (source, stat.st_dev, stat.st_ino, head, str(path)),
+                ).lastrowid
+                indexed = 0
+            else:
+                file_id, indexed = row[0], row[2]
+                self._conn.execute("UPDATE log_files SET path = ?, head = ? WHERE id = ?", (str(path), head, file_id))
+            if stat.st_size > indexed:
+                handle.seek(indexed)
+                indexed += self._index_chunk(source, file_id, indexed, handle.read(stat.st_size - indexed))
+                self._conn.execute("UPDATE log_files SET indexed_bytes = ? WHERE id = ?", (indexed, file_id))
+        return file_id
+
+    def _index_chunk(self, source: str, file_id: int, start: int, data: bytes) -> int:
+        """Index complete lines of ``data`` (read at ``start``); return how many bytes were consumed."""
+        end = data.rfind(b"\n") + 1
+        entries: list[list] = []
+        carried = 0  # Continuation lines (e.g. tracebacks) of the file's last indexed record.
+        position = 0
+        while position < end:
+            newline = data.index(b"\n", position) + 1
+            match = HEADER.match(data, position)
+            record = _json_record(data[position:newline]) if match is None and data[position:position + 1] == b"{" else None
+            if match is not None:
+                time, logger, level = (group.decode("utf-8", errors="replace") for group in match.groups())
+                entries.append([file_id, source, start + position, newline - position, time, _level_number(level), logger])
+            elif record is not None:
+                entries.append(
+                    [file_id, source, start + position, newline - position, record["time"], record["level"], record["logger"]]
+                )
+            elif entries:
+                entries[-1][3] += newline - position
+            else:
+                carried += newline - position
+            position = newline
+        if carried:
+            self._conn.execute(
+                "UPDATE log_entries SET length = length + ? WHERE id = (SELECT MAX(id) FROM log_entries WHERE file_id = ?)",
+                (carried, file_id),
+            )
+        self._conn.executemany(
+            "INSERT INTO log_entries(file_id, source, offset, length, time, level, logger) VALUES(?, ?, ?, ?, ?, ?, ?)",
+            entries,
+        )
+        return end
+
+    def _forget(self, file_id: int) -> None:
+        self._conn.execute("DELETE FROM log_entries WHERE file_id = ?", (file_id,))
+        self._conn.execute("DELETE FROM log_files WHERE id = ?", (file_id,))
+
+    def _read(self, source: str, rows: list[tuple]) -> list[LogEntry]:
+        """Load the text of indexed records, one open per file."""
+        handles: dict[int, BinaryIO | None] = {}
+        entries: list[LogEntry] = []
+        try:
+            for entry_id, offset, length, time, level, logger, file_id, dev, ino, path in rows:
+                if file_id not in handles:
+                    handles[file_id] = _open_file(self.log_dir, SOURCES[source], Path(path), dev, ino)
+                handle = handles[file_id]
+                if handle is None:
+                    continue  # Deleted by rotation since it was indexed.
+                handle.seek(offset)
+                data = handle.read(length)
+                match = HEADER.match(data)
+                message = data[match.end():] if match else data
+                if match is None and (record := _json_record(data)) is not None:
+                    message = record["message"].encode("utf-8")
+                entries.append(
+                    LogEntry(
+                        cursor=entry_id,
+                        time=time,
+                        level=logging.getLevelName(level),
+                        logger=logger,
+                        message=message.decode("utf-8", errors="replace").rstrip("\n"),
+                    )
+                )
+        finally:
+            for handle in handles.values():
+                if handle is not None:
+                    handle.close()
+        return entries
+
+
+def _source_files(log_dir: Path, name: str) -> list[Path]:
+    """``name`` and its rotated backups, oldest first."""
+    backups = [path for path in log_dir.glob(f"{name}.*") if path.suffix[1:].isdigit()]
+    backups.sort(key=lambda path: int(path.suffix[1:]), reverse=True)
+    current = log_dir / name
+    return backups + ([current] if current.exists() else [])
+
+
+def _open_file(log_dir: Path, name: str, path: Path, dev: int, ino: int) -> BinaryIO | None:
+    """Open the file with inode ``(dev, ino)``, following it if it was rotated to another name."""
+    for candidate in [path, *_source_files(log_dir, name)]:
+        try:
+            handle = candidate.open("rb")
+        except FileNotFoundError:
+            continue
+        stat = os.fstat(handle.fileno())
+        if (stat.st_dev, stat.st_ino) == (dev, ino):
+            return handle
+        handle.close()
+    return None
+
+
+def _json_record(line: bytes) -> dict | None:
+    """Header fields and message of a JSON log line (``AUTODEV_LOG_FORMAT=json``), or None."""
+    try:
+        record = json.loads(line)
+        parsed = {"time": str(record["time"]), "logger": str(record["logger"]), "level": _level_number(str(record["level"]))}
+    except (ValueError, KeyError, TypeError):
+        return None
+    message = str(record.get("message", ""))
+    if record.get("exc_info"):
+        message += "\n" + str(record["exc_info"])
+    return {**parsed, "message": message}
+
+
+def _level_number(level: str) -> int:
+    number = logging.getLevelName(level.upper())
+    if not isinstance(number, int):
+        raise ValueError(f"Unknown log level {level!r}")
+    return number
+
+
+def _normalize_time(value: str) -> str:
+    """ISO timestamp -> the ``YYYY-MM-DD HH:MM:SS`` form used in log headers."""
+    return datetime.fromisoformat(value).strftime("%Y-%m-%d %H:%M:%S")
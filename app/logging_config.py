@@ -2,14 +2,117 @@
 
 from __future__ import annotations
 
+import atexit
+import contextvars
+import json
 import logging
 import logging.handlers
+import os
+import queue
 import sys
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, TextIO
 
+try:
+    from pythonjsonlogger.json import JsonFormatter
+except ImportError:  # python-json-logger < 3, or not installed
+    try:
+        from pythonjsonlogger.jsonlogger import JsonFormatter
+    except ImportError:
+        JsonFormatter = None
 
-def configure_logging(log_dir: Path = Path("logs"), level: int = logging.INFO) -> None:
-    """Configure structured logging with file and console handlers."""
+TEXT_FORMAT = "[%(asctime)s] %(name)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+CONTEXT_FIELDS = ("run_id", "project", "stage")
+
+_context: dict[str, contextvars.ContextVar[str | None]] = {
+    name: contextvars.ContextVar(f"autodev_{name}", default=None) for name in CONTEXT_FIELDS
+}
+_listener: logging.handlers.QueueListener | None = None
+# Set in a forked child whose listener thread did not survive the fork; the first log call restarts it.
+_restart_pending = False
+_restart_lock = threading.Lock()
+
+
+@contextmanager
+def log_context(**fields: str | None) -> Iterator[None]:
+    """Attach ``run_id``/``project``/``stage`` to every record logged inside the block (per thread/task)."""
+    tokens = [(_context[name], _context[name].set(value)) for name, value in fields.items()]
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log context onto records; runs on the logging thread, before the queue."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _context.items():
+            setattr(record, name, var.get())
+        return True
+
+
+class _FallbackJsonFormatter(logging.Formatter):
+    """One JSON object per line; used when python-json-logger is not installed."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "logger": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        payload.update({name: getattr(record, name, None) for name in CONTEXT_FIELDS})
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+def json_formatter() -> logging.Formatter:
+    """JSON formatter with the same time format and field names as the text log, plus context fields."""
+    if JsonFormatter is None:
+        return _FallbackJsonFormatter(datefmt=DATE_FORMAT)
+    return JsonFormatter(
+        "%(asctime)s %(name)s %(levelname)s %(message)s " + " ".join(f"%({name})s" for name in CONTEXT_FIELDS),
+        datefmt=DATE_FORMAT,
+        rename_fields={"asctime": "time", "name": "logger", "levelname": "level"},
+    )
+
+
+class _LocalQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records as-is; the stock handler formats them first so they survive pickling."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue never leaves this process, so formatting (timestamps, tracebacks) is left to the listener.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if _restart_pending:
+            _restart_listener()
+        super().enqueue(record)
+
+
+def configure_logging(
+    log_dir: Path = Path("logs"),
+    level: int = logging.INFO,
+    *,
+    json_format: bool = False,
+    queued: bool = True,
+    stream: TextIO | None = None,
+) -> None:
+    """Configure the ``autodev`` logger with rotating file, error file and console output.
+
+    With ``queued`` (the default) the logger only enqueues records; a
+    ``QueueListener`` thread formats them and does all file and console I/O,
+    so a log call on the orchestration path never waits on disk or a slow
+    terminal. ``json_format`` writes both log files as JSON lines carrying
+    the ``run_id``, ``project`` and ``stage`` context fields.
+    """
+    global _listener
     log_dir.mkdir(parents=True, exist_ok=True)
 
     # Setup root logger
@@ -17,11 +120,16 @@ def configure_logging(log_dir: Path = Path("logs"), level: int = logging.INFO) -
     root_logger.setLevel(level)
     root_logger.propagate = False
 
-    # Remove existing handlers
+    # Remove existing handlers, flushing whatever the previous listener still holds
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
+        if not isinstance(handler, logging.handlers.QueueHandler):
+            handler.close()
 
-    # Rotating file handler (logs rotate at 10MB, keep 5 backups)
+    # Rotating file handlers (logs rotate at 10MB, keep 5 backups)
     file_handler = logging.handlers.RotatingFileHandler(
         log_dir / "autodev.log",
         maxBytes=10 * 1024 * 1024,
@@ -29,23 +137,94 @@ def configure_logging(log_dir: Path = Path("logs"), level: int = logging.INFO) -
     )
     file_handler.setLevel(logging.DEBUG)
 
+    # Error file handler (separate errors)
+    error_handler = logging.handlers.RotatingFileHandler(
+        log_dir / "errors.log",
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+    )
+    error_handler.setLevel(logging.ERROR)
+
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setLevel(level)
 
-    # Error file handler (separate errors)
-    error_handler = logging.FileHandler(log_dir / "errors.log")
-    error_handler.setLevel(logging.ERROR)
+    # Formatters
+    text = logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT)
+    file_formatter = json_formatter() if json_format else text
+    file_handler.setFormatter(file_formatter)
+    error_handler.setFormatter(file_formatter)
+    console_handler.setFormatter(text)
+    handlers: list[logging.Handler] = [file_handler, console_handler, error_handler]
+
+    context = ContextFilter()
+    if not queued:
+        for handler in handlers:
+            handler.addFilter(context)
+            root_logger.addHandler(handler)
+        return
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _LocalQueueHandler(records)
+    queue_handler.addFilter(context)
+    root_logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def add_log_handler(handler: logging.Handler) -> None:
+    """Attach an extra ``autodev`` handler; with the queue pipeline it runs on the listener thread."""
+    if _listener is None:
+        handler.addFilter(ContextFilter())
+        logging.getLogger("autodev").addHandler(handler)
+        return
+    # Records arrive with their context already attached by the queue handler's filter.
+    _listener.handlers = (*_listener.handlers, handler)
+
+
+def flush_logging() -> None:
+    """Stop the listener thread after it has written every queued record."""
+    global _listener, _restart_pending
+    if _restart_pending:
+        # Forked child that never logged: there is no thread to stop.
+        _restart_pending = False
+        _listener = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _after_fork_in_child() -> None:
+    """A forked child inherits the queue handler but not the listener thread.
+
+    Starting a thread here is unsafe: this also runs between fork and exec
+    of every subprocess with a ``preexec_fn``. Only mark the listener for a
+    restart on the child's first log call.
+    """
+    global _restart_pending, _restart_lock
+    if _listener is not None:
+        _restart_lock = threading.Lock()
+        _restart_pending = True
+
+
+def _restart_listener() -> None:
+    """Give a forked child its own queue and listener thread."""
+    global _listener, _restart_pending
+    with _restart_lock:
+        if not _restart_pending or _listener is None:
+            return
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        for handler in logging.getLogger("autodev").handlers:
+            if isinstance(handler, logging.handlers.QueueHandler):
+                handler.queue = records
+        _listener = logging.handlers.QueueListener(records, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+        _restart_pending = False
 
-    # Formatter
-    formatter = logging.Formatter(
-        "[%(asctime)s] %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
 
-    for handler in [file_handler, console_handler, error_handler]:
-        handler.setFormatter(formatter)
-        root_logger.addHandler(handler)
+atexit.register(flush_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 def get_logger(name: str) -> logging.Logger:
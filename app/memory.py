@@ -2,68 +2,173 @@
 
 from __future__ import annotations
 
+import json
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Iterator
 
-from .models import ProjectCategory, RunRecord
+from .idea_generator import TemplateUsage, split_name, template_of, usage_from_names
+from .models import CheckFailureRate, Job, OutboxItem, ProjectCategory, RunRecord, RunStats
+
+JOB_COLUMNS = (
+    "id, state, priority, config, submitted_at, started_at, finished_at, project, pid, exit_code, cancel_requested, error,"
+    " pid_identity"
+)
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-8192",
+    "PRAGMA temp_store=MEMORY",
+)
 
 
 class MemoryStore:
-    """Persistence layer for generated ideas and run history."""
+    """Persistence layer for generated ideas and run history.
+
+    One long-lived writer connection is shared by every thread and guarded by
+    a lock; each thread also gets its own reader connection. The database runs
+    in WAL mode, so readers (for example web UI requests) never block the
+    orchestrator's writes and vice versa. ``transaction()`` groups several
+    writes into a single commit.
+    """
 
     def __init__(self, db_path: Path) -> None:
         self.db_path = db_path
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._tx_owner: int | None = None
+        self._tx_depth = 0
+        self._pid = os.getpid()
+        self._writer = self._open()
         self._initialize()
 
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None, cached_statements=128
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     def _connect(self) -> sqlite3.Connection:
-        return sqlite3.connect(self.db_path)
+        """Connection for reads: the writer inside this thread's transaction, else a per-thread reader."""
+        self._check_fork()
+        if self._tx_owner == threading.get_ident():
+            return self._writer
+        conn = getattr(self._local, "reader", None)
+        if conn is None:
+            conn = self._local.reader = self._open()
+        return conn
+
+    def _check_fork(self) -> None:
+        # SQLite handles must not cross fork(); children reopen instead of reusing them.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._local = threading.local()
+            self._write_lock = threading.RLock()
+            self._tx_owner = None
+            self._tx_depth = 0
+            self._writer = self._open()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Unit of work: every write inside commits together or not at all. Nests safely."""
+        self._check_fork()
+        with self._write_lock:
+            if self._tx_depth:
+                self._tx_depth += 1
+                try:
+                    yield self._writer
+                finally:
+                    self._tx_depth -= 1
+                return
+
+            self._writer.execute("BEGIN IMMEDIATE")
+            self._tx_owner = threading.get_ident()
+            self._tx_depth = 1
+            try:
+                yield self._writer
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            else:
+                self._writer.execute("COMMIT")
+            finally:
+                self._tx_owner = None
+                self._tx_depth = 0
+
+    def close(self) -> None:
+        """Close the writer and this thread's reader connection."""
+        reader = getattr(self._local, "reader", None)
+        if reader is not None:
+            reader.close()
+            self._local.reader = None
+        self._writer.close()
 
     def _initialize(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS projects (
-                    name TEXT PRIMARY KEY,
-                    category TEXT NOT NULL,
-                    complexity INTEGER NOT NULL,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS runs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    started_at TEXT NOT NULL,
-                    finished_at TEXT NOT NULL,
-                    project_name TEXT NOT NULL,
-                    retries INTEGER NOT NULL,
-                    success INTEGER NOT NULL
-                )
-                """
-            )
+        """Apply pending schema migrations, tracked in ``PRAGMA user_version``."""
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for number, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {number}")
 
     def list_project_names(self) -> set[str]:
         """Return all generated project names."""
-        with self._connect() as conn:
-            rows = conn.execute("SELECT name FROM projects").fetchall()
+        rows = self._connect().execute("SELECT name FROM projects").fetchall()
         return {row[0] for row in rows}
 
+    def list_projects(self) -> list[tuple[str, str, int]]:
+        """Return ``(name, category, complexity)`` for every generated project."""
+        return self._connect().execute("SELECT name, category, complexity FROM projects").fetchall()
+
+    def template_usage(self) -> dict[str, TemplateUsage]:
+        """Per-template use count and highest suffix, read from the maintained index."""
+        rows = self._connect().execute("SELECT template, count, max_suffix FROM template_usage").fetchall()
+        return {template: TemplateUsage(count=count, max_suffix=max_suffix) for template, count, max_suffix in rows}
+
     def store_project(self, name: str, category: ProjectCategory, complexity: int) -> None:
-        """Persist a project idea so duplicates are avoided."""
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO projects(name, category, complexity) VALUES(?, ?, ?)",
+        """Persist a project idea so duplicates are avoided, keeping the template index current."""
+        with self.transaction() as conn:
+            if not self.reserve_project(name, category, complexity):
+                conn.execute(
+                    "UPDATE projects SET category = ?, complexity = ? WHERE name = ?",
+                    (category.value, complexity, name),
+                )
+
+    def reserve_project(self, name: str, category: ProjectCategory, complexity: int) -> bool:
+        """Claim ``name`` for a new project; ``False`` if any run, in any process, already has it."""
+        with self.transaction() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO projects(name, category, complexity) VALUES(?, ?, ?)",
                 (name, category.value, complexity),
+            ).rowcount
+            if not inserted:
+                return False
+            template, suffix = split_name(name)
+            conn.execute(
+                """
+                INSERT INTO template_usage(template, count, max_suffix) VALUES(?, 1, ?)
+                ON CONFLICT(template) DO UPDATE SET count = count + 1, max_suffix = MAX(max_suffix, excluded.max_suffix)
+                """,
+                (template, suffix),
             )
+            return True
 
     def store_run(self, run: RunRecord) -> None:
-        """Persist run metadata for historical tracking."""
-        with self._connect() as conn:
-            conn.execute(
+        """Persist run metadata and per-check outcomes for historical tracking."""
+        with self.transaction() as conn:
+            cursor = conn.execute(
                 """
-                INSERT INTO runs(started_at, finished_at, project_name, retries, success)
-                VALUES(?, ?, ?, ?, ?)
+                INSERT INTO runs(started_at, finished_at, project_name, retries, success, duration_seconds, template)
+                VALUES(?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     run.started_at.isoformat(),
@@ -71,5 +176,507 @@ class MemoryStore:
                     run.project_name,
                     run.retries,
                     int(run.success),
+                    (run.finished_at - run.started_at).total_seconds(),
+                    template_of(run.project_name),
                 ),
             )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO run_checks(
+                    run_id, attempt, name, passed, status, cpu_seconds, max_rss_kb, wall_seconds, limit_hit
+                )
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        cursor.lastrowid,
+                        check.attempt,
+                        check.name,
+                        int(check.passed),
+                        check.status,
+                        *(
+                            (check.usage.cpu_seconds, check.usage.max_rss_kb, check.usage.wall_seconds, check.usage.limit_hit)
+                            if check.usage is not None
+                            else (None, None, None, None)
+                        ),
+                    )
+                    for check in run.checks
+                ],
+            )
+
+    def run_stats(
+        self, since: datetime | None = None, quantiles: tuple[float, ...] = (0.5, 0.95, 0.99)
+    ) -> RunStats:
+        """Success rate, retry histogram, latency percentiles and failing checks since ``since``.
+
+        Counts include rolled-up daily aggregates (at day granularity); latency
+        percentiles are computed over the raw rows still inside the retention window.
+        """
+        started = since.isoformat() if since else ""
+        day = since.date().isoformat() if since else ""
+        conn = self._connect()
+        histogram = conn.execute(
+            """
+            SELECT retries, SUM(runs), SUM(successes) FROM (
+                SELECT retries, COUNT(*) AS runs, SUM(success) AS successes
+                FROM runs WHERE started_at >= ? GROUP BY retries
+                UNION ALL
+                SELECT retries, SUM(runs), SUM(successes) FROM run_daily WHERE day >= ? GROUP BY retries
+            ) GROUP BY retries ORDER BY retries
+            """,
+            (started, day),
+        ).fetchall()
+
+        # Nearest-rank percentile: the smallest duration whose rank reaches q * n.
+        columns = ", ".join("MIN(CASE WHEN rn >= ? * n THEN d END)" for _ in quantiles)
+        row = conn.execute(
+            f"""
+            WITH ranked AS (
+                SELECT duration_seconds AS d,
+                       ROW_NUMBER() OVER (ORDER BY duration_seconds) AS rn,
+                       COUNT(*) OVER () AS n
+                FROM runs WHERE started_at >= ? AND duration_seconds IS NOT NULL
+            )
+            SELECT {columns} FROM ranked
+            """,
+            (started, *quantiles),
+        ).fetchone()
+
+        failures = conn.execute(
+            """
+            SELECT template, name, SUM(failures), SUM(attempts) FROM (
+                SELECT r.template AS template, c.name AS name, SUM(1 - c.passed) AS failures, COUNT(*) AS attempts
+                FROM run_checks c JOIN runs r ON r.id = c.run_id
+                WHERE r.started_at >= ? AND c.status != 'cancelled'
+                GROUP BY r.template, c.name
+                UNION ALL
+                SELECT template, name, SUM(failures), SUM(attempts) FROM check_daily WHERE day >= ? GROUP BY template, name
+            ) GROUP BY template, name HAVING SUM(failures) > 0
+            ORDER BY SUM(failures) * 1.0 / SUM(attempts) DESC, SUM(failures) DESC
+            """,
+            (started, day),
+        ).fetchall()
+
+        return RunStats(
+            runs=sum(item[1] for item in histogram),
+            successes=sum(item[2] for item in histogram),
+            retry_histogram={item[0]: item[1] for item in histogram},
+            percentiles={f"p{quantile * 100:g}": value for quantile, value in zip(quantiles, row)},
+            check_failures=[CheckFailureRate(*item) for item in failures],
+        )
+
+    def compact_history(self, before: datetime) -> int:
+        """Roll runs started before ``before`` into daily aggregates and delete them; return rows removed."""
+        cutoff = before.isoformat()
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO run_daily(day, template, retries, runs, successes, total_seconds, max_seconds)
+                SELECT substr(started_at, 1, 10), COALESCE(template, project_name), retries, COUNT(*), SUM(success),
+                       COALESCE(SUM(duration_seconds), 0), COALESCE(MAX(duration_seconds), 0)
+                FROM runs WHERE started_at < ?
+                GROUP BY 1, 2, 3
+                ON CONFLICT(day, template, retries) DO UPDATE SET
+                    runs = runs + excluded.runs,
+                    successes = successes + excluded.successes,
+                    total_seconds = total_seconds + excluded.total_seconds,
+                    max_seconds = MAX(max_seconds, excluded.max_seconds)
+                """,
+                (cutoff,),
+            )
+            conn.execute(
+                """
+                INSERT INTO check_daily(day, template, name, attempts, failures)
+                SELECT substr(r.started_at, 1, 10), COALESCE(r.template, r.project_name), c.name, COUNT(*), SUM(1 - c.passed)
+                FROM run_checks c JOIN runs r ON r.id = c.run_id
+                WHERE r.started_at < ? AND c.status != 'cancelled'
+                GROUP BY 1, 2, 3
+                ON CONFLICT(day, template, name) DO UPDATE SET
+                    attempts = attempts + excluded.attempts,
+                    failures = failures + excluded.failures
+                """,
+                (cutoff,),
+            )
+            conn.execute("DELETE FROM run_checks WHERE run_id IN (SELECT id FROM runs WHERE started_at < ?)", (cutoff,))
+            return conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,)).rowcount
+
+    def enqueue_pull_request(self, *, head: str, base: str, title: str, body: str) -> None:
+        """Add a pull request to the outbox, re-arming it if the branch was queued before."""
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO pr_outbox(head, base, title, body, state, attempts, next_attempt_at)
+                VALUES(?, ?, ?, ?, 'pending', 0, ?)
+                ON CONFLICT(head, base) DO UPDATE SET
+                    title = excluded.title, body = excluded.body, state = 'pending', attempts = 0,
+                    next_attempt_at = excluded.next_attempt_at, last_error = NULL
+                """,
+                (head, base, title, body, time.time()),
+            )
+
+    def claim_pull_requests(self, lease_seconds: float, limit: int = 10) -> list[OutboxItem]:
+        """Lease due outbox items; leased items reappear if the claimant dies before finishing them."""
+        now = time.time()
+        with self.transaction() as conn:
+            rows = conn.execute(
+                """
+                UPDATE pr_outbox SET next_attempt_at = ?
+                WHERE id IN (
+                    SELECT id FROM pr_outbox WHERE state = 'pending' AND next_attempt_at <= ?
+                    ORDER BY next_attempt_at LIMIT ?
+                )
+                RETURNING id, head, base, title, body, attempts
+                """,
+                (now + lease_seconds, now, limit),
+            ).fetchall()
+        return [OutboxItem(*row) for row in rows]
+
+    def complete_pull_request(self, item_id: int, url: str) -> None:
+        """Mark an outbox item as published."""
+        with self.transaction() as conn:
+            conn.execute("UPDATE pr_outbox SET state = 'done', pr_url = ?, last_error = NULL WHERE id = ?", (url, item_id))
+
+    def retry_pull_request(self, item_id: int, delay_seconds: float, error: str) -> None:
+        """Schedule another attempt for an outbox item after ``delay_seconds``."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE pr_outbox SET attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (time.time() + delay_seconds, error, item_id),
+            )
+
+    def reschedule_pull_request(self, item_id: int, delay_seconds: float) -> None:
+        """Release a leased outbox item that was never attempted; its ``attempts`` count is unchanged."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE pr_outbox SET next_attempt_at = ? WHERE id = ?", (time.time() + delay_seconds, item_id)
+            )
+
+    def fail_pull_request(self, item_id: int, error: str) -> None:
+        """Give up on an outbox item."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE pr_outbox SET state = 'failed', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, item_id),
+            )
+
+    def outbox_depth(self) -> dict[str, int]:
+        """Number of outbox items per state."""
+        rows = self._connect().execute("SELECT state, COUNT(*) FROM pr_outbox GROUP BY state").fetchall()
+        return {"pending": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    def next_outbox_attempt(self) -> float | None:
+        """Epoch time of the earliest pending outbox attempt."""
+        row = self._connect().execute("SELECT MIN(next_attempt_at) FROM pr_outbox WHERE state = 'pending'").fetchone()
+        return row[0]
+
+    def submit_job(self, config: dict, priority: int = 0) -> int:
+        """Queue an orchestration run; higher ``priority`` runs first, then submission order."""
+        with self.transaction() as conn:
+            return conn.execute(
+                "INSERT INTO jobs(state, priority, config, submitted_at) VALUES('queued', ?, ?, ?)",
+                (priority, json.dumps(config), time.time()),
+            ).lastrowid
+
+    def claim_job(self) -> Job | None:
+        """Move the next queued job to ``running`` and return it."""
+        with self.transaction() as conn:
+            row = conn.execute(
+                f"""
+                UPDATE jobs SET state = 'running', started_at = ?
+                WHERE id = (SELECT id FROM jobs WHERE state = 'queued' ORDER BY priority DESC, id LIMIT 1)
+                RETURNING {JOB_COLUMNS}
+                """,
+                (time.time(),),
+            ).fetchone()
+        return _job_from_row(row) if row else None
+
+    def set_job_worker(self, job_id: int, project: str, pid: int | None, pid_identity: str | None = None) -> None:
+        """Record the project and worker process of a running job.
+
+        ``pid_identity`` tells this process apart from a later one that reuses its pid.
+        """
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET project = ?, pid = ?, pid_identity = ? WHERE id = ?", (project, pid, pid_identity, job_id)
+            )
+
+    def finish_job(self, job_id: int, state: str, *, exit_code: int | None = None, error: str | None = None) -> None:
+        """Record the final ``succeeded``, ``failed`` or ``cancelled`` state of a job."""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, exit_code = ?, error = ? WHERE id = ?",
+                (state, time.time(), exit_code, error, job_id),
+            )
+
+    def cancel_job(self, job_id: int) -> Job | None:
+        """Cancel a queued job outright or flag a running one for its supervisor; ``None`` if unknown."""
+        with self.transaction() as conn:
+            row = conn.execute(
+                f"""
+                UPDATE jobs SET
+                    state = CASE state WHEN 'queued' THEN 'cancelled' ELSE state END,
+                    finished_at = CASE state WHEN 'queued' THEN ? ELSE finished_at END,
+                    cancel_requested = CASE WHEN state IN ('queued', 'running') THEN 1 ELSE cancel_requested END
+                WHERE id = ?
+                RETURNING {JOB_COLUMNS}
+                """,
+                (time.time(), job_id),
+            ).fetchone()
+        return _job_from_row(row) if row else None
+
+    def cancel_requested_jobs(self) -> list[int]:
+        """Ids of running jobs whose cancellation was requested."""
+        rows = self._connect().execute("SELECT id FROM jobs WHERE state = 'running' AND cancel_requested = 1").fetchall()
+        return [row[0] for row in rows]
+
+    def requeue_running_jobs(self) -> int:
+        """Return jobs left ``running`` by a stopped supervisor to the queue (or cancel them if requested)."""
+        with self.transaction() as conn:
+            return conn.execute(
+                """
+                UPDATE jobs SET
+                    state = CASE cancel_requested WHEN 1 THEN 'cancelled' ELSE 'queued' END,
+                    finished_at = CASE cancel_requested WHEN 1 THEN ? ELSE NULL END,
+                    started_at = NULL, project = NULL, pid = NULL, pid_identity = NULL
+                WHERE state = 'running'
+                """,
+                (time.time(),),
+            ).rowcount
+
+    def get_job(self, job_id: int) -> Job | None:
+        """Load one job."""
+        row = self._connect().execute(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_from_row(row) if row else None
+
+    def list_jobs(self, state: str | None = None, limit: int = 50) -> list[Job]:
+        """Most recent jobs first, optionally only those in ``state``."""
+        query = f"SELECT {JOB_COLUMNS} FROM jobs"
+        params: tuple = ()
+        if state is not None:
+            query += " WHERE state = ?"
+            params = (state,)
+        rows = self._connect().execute(query + " ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [_job_from_row(row) for row in rows]
+
+    def job_counts(self) -> dict[str, int]:
+        """Number of jobs per state."""
+        rows = self._connect().execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {"queued": 0, "running": 0, "succeeded": 0, "failed": 0, "cancelled": 0, **dict(rows)}
+
+    def append_event(self, type: str, data: dict, keep: int) -> int:
+        """Store a UI event and return its id; only the newest ``keep`` events are retained."""
+        return self.append_events([(type, data)], keep)[0]
+
+    def append_events(self, events: list[tuple[str, dict]], keep: int) -> list[int]:
+        """Store UI events in one transaction and return their ids; only the newest ``keep`` events are retained."""
+        ids = []
+        with self.transaction() as conn:
+            for type, data in events:
+                ids.append(conn.execute("INSERT INTO events(type, data) VALUES(?, ?)", (type, json.dumps(data))).lastrowid)
+            if ids and ids[-1] // 64 > (ids[0] - 1) // 64:
+                conn.execute("DELETE FROM events WHERE id <= ?", (ids[-1] - keep,))
+        return ids
+
+    def events_after(self, last_id: int, limit: int = 500) -> list[tuple[int, str, dict]]:
+        """Events with an id above ``last_id``, oldest first."""
+        rows = self._connect().execute(
+            "SELECT id, type, data FROM events WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)
+        ).fetchall()
+        return [(event_id, type, json.loads(data)) for event_id, type, data in rows]
+
+    def recent_events(self, type: str, limit: int) -> list[tuple[int, str, dict]]:
+        """The newest ``limit`` events of one type, oldest first."""
+        rows = self._connect().execute(
+            "SELECT id, type, data FROM events WHERE type = ? ORDER BY id DESC LIMIT ?", (type, limit)
+        ).fetchall()
+        return [(event_id, type, json.loads(data)) for event_id, type, data in reversed(rows)]
+
+    def event_bounds(self) -> tuple[int, int]:
+        """Ids of the oldest and newest retained events, ``(0, 0)`` when there are none."""
+        row = self._connect().execute("SELECT MIN(id), MAX(id) FROM events").fetchone()
+        return (row[0] or 0, row[1] or 0)
+
+
+def _job_from_row(row: tuple) -> Job:
+    values = list(row)
+    values[3] = json.loads(values[3])
+    values[10] = bool(values[10])
+    return Job(*values)
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    """Original schema: generated projects and one row per run."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+            name TEXT PRIMARY KEY,
+            category TEXT NOT NULL,
+            complexity INTEGER NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            finished_at TEXT NOT NULL,
+            project_name TEXT NOT NULL,
+            retries INTEGER NOT NULL,
+            success INTEGER NOT NULL
+        )
+        """
+    )
+
+
+def _migrate_v2(conn: sqlite3.Connection) -> None:
+    """Run analytics: duration/template columns, indexes, per-check rows and daily rollups."""
+    conn.execute("ALTER TABLE runs ADD COLUMN duration_seconds REAL")
+    conn.execute("ALTER TABLE runs ADD COLUMN template TEXT")
+    conn.execute("UPDATE runs SET duration_seconds = ROUND((julianday(finished_at) - julianday(started_at)) * 86400.0, 3)")
+    rows = conn.execute("SELECT id, project_name FROM runs").fetchall()
+    conn.executemany("UPDATE runs SET template = ? WHERE id = ?", [(template_of(name), run_id) for run_id, name in rows])
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_project_name ON runs(project_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_checks (
+            run_id INTEGER NOT NULL,
+            attempt INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            passed INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            PRIMARY KEY (run_id, attempt, name)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS run_daily (
+            day TEXT NOT NULL,
+            template TEXT NOT NULL,
+            retries INTEGER NOT NULL,
+            runs INTEGER NOT NULL,
+            successes INTEGER NOT NULL,
+            total_seconds REAL NOT NULL,
+            max_seconds REAL NOT NULL,
+            PRIMARY KEY (day, template, retries)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS check_daily (
+            day TEXT NOT NULL,
+            template TEXT NOT NULL,
+            name TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            failures INTEGER NOT NULL,
+            PRIMARY KEY (day, template, name)
+        )
+        """
+    )
+
+
+def _migrate_v3(conn: sqlite3.Connection) -> None:
+    """Per-template usage index so idea selection never loads every project name."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS template_usage (
+            template TEXT PRIMARY KEY,
+            count INTEGER NOT NULL,
+            max_suffix INTEGER NOT NULL
+        )
+        """
+    )
+    names = {row[0] for row in conn.execute("SELECT name FROM projects")}
+    conn.executemany(
+        "INSERT INTO template_usage(template, count, max_suffix) VALUES(?, ?, ?)",
+        [(template, entry.count, entry.max_suffix) for template, entry in usage_from_names(names).items()],
+    )
+
+
+def _migrate_v4(conn: sqlite3.Connection) -> None:
+    """Outbox of pull requests drained by the background publisher."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pr_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            head TEXT NOT NULL,
+            base TEXT NOT NULL,
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            state TEXT NOT NULL,
+            attempts INTEGER NOT NULL,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            pr_url TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (head, base)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pr_outbox_due ON pr_outbox(state, next_attempt_at)")
+
+
+def _migrate_v5(conn: sqlite3.Connection) -> None:
+    """Persistent queue of orchestration runs executed by the job supervisor."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            state TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            config TEXT NOT NULL,
+            submitted_at REAL NOT NULL,
+            started_at REAL,
+            finished_at REAL,
+            project TEXT,
+            pid INTEGER,
+            exit_code INTEGER,
+            cancel_requested INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(state, priority DESC, id)")
+
+
+def _migrate_v6(conn: sqlite3.Connection) -> None:
+    """Web UI event feed shared by every server worker process."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            data TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_events_type ON events(type, id)")
+
+
+def _migrate_v7(conn: sqlite3.Connection) -> None:
+    """Per-check resource usage and the budget, if any, that stopped the check."""
+    conn.execute("ALTER TABLE run_checks ADD COLUMN cpu_seconds REAL")
+    conn.execute("ALTER TABLE run_checks ADD COLUMN max_rss_kb INTEGER")
+    conn.execute("ALTER TABLE run_checks ADD COLUMN wall_seconds REAL")
+    conn.execute("ALTER TABLE run_checks ADD COLUMN limit_hit TEXT")
+
+
+def _migrate_v8(conn: sqlite3.Connection) -> None:
+    """Boot id and start time of a job's worker, so a reused pid is never mistaken for it."""
+    conn.execute("ALTER TABLE jobs ADD COLUMN pid_identity TEXT")
+
+
+MIGRATIONS: tuple[Callable[[sqlite3.Connection], None], ...] = (
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+    _migrate_v4,
+    _migrate_v5,
+    _migrate_v6,
+    _migrate_v7,
+    _migrate_v8,
+)
@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from typing import Any
 
 
 class ProjectCategory(str, Enum):
@@ -44,6 +45,22 @@ class ValidationResult:
     success: bool
     checks: dict[str, bool] = field(default_factory=dict)
     logs: list[str] = field(default_factory=list)
+    reused: list[str] = field(default_factory=list)
+    executed: list[str] = field(default_factory=list)
+    cancelled: list[str] = field(default_factory=list)
+    # "<check>.stdout"/"<check>.stderr" -> file holding the full output when ``logs`` only has its head and tail.
+    artifacts: dict[str, str] = field(default_factory=dict)
+    resources: dict[str, CheckUsage] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class CheckUsage:
+    """Resources one check consumed; ``limit_hit`` names the budget that stopped it ("wall" or "cpu")."""
+
+    cpu_seconds: float
+    max_rss_kb: int
+    wall_seconds: float = 0.0
+    limit_hit: str | None = None
 
 
 @dataclass(slots=True)
@@ -55,3 +72,77 @@ class RunRecord:
     project_name: str
     retries: int
     success: bool
+    checks: list[CheckRecord] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class CheckRecord:
+    """Outcome of one validation check in one attempt of a run."""
+
+    attempt: int
+    name: str
+    passed: bool
+    status: str = "executed"
+    usage: CheckUsage | None = None
+
+
+@dataclass(slots=True)
+class CheckFailureRate:
+    """How often one check failed for projects built from one template."""
+
+    template: str
+    check: str
+    failures: int
+    attempts: int
+
+    @property
+    def rate(self) -> float:
+        """Fraction of attempts that failed."""
+        return self.failures / self.attempts if self.attempts else 0.0
+
+
+@dataclass(slots=True)
+class RunStats:
+    """Aggregated run history over a time window."""
+
+    runs: int
+    successes: int
+    retry_histogram: dict[int, int] = field(default_factory=dict)
+    percentiles: dict[str, float | None] = field(default_factory=dict)
+    check_failures: list[CheckFailureRate] = field(default_factory=list)
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of runs that succeeded."""
+        return self.successes / self.runs if self.runs else 0.0
+
+
+@dataclass(slots=True)
+class OutboxItem:
+    """A pull request waiting in the outbox to be pushed and opened."""
+
+    id: int
+    head: str
+    base: str
+    title: str
+    body: str
+    attempts: int = 0
+
+
+@dataclass(slots=True)
+class Job:
+    """An orchestration run submitted to the job queue; times are epoch seconds."""
+
+    id: int
+    state: str
+    priority: int
+    config: dict[str, Any]
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    project: str | None = None
+    pid: int | None = None
+    exit_code: int | None = None
+    cancel_requested: bool = False
+    error: str | None = None
+    pid_identity: str | None = None
@@ -3,45 +3,119 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Any, Callable
 
 from .backup import DatabaseBackup
+from .blob_store import BlobStore
+from .capture import prune_artifacts
 from .codegen import ProjectScaffolder
 from .config import AgentConfig
 from .correction import CorrectionEngine
 from .documentation import generate_readme
+from .events import EventBus
 from .git_workflow import GitWorkflow
 from .github_manager import GitHubManager
-from .idea_generator import IdeaGenerator
-from .logging_config import get_logger
+from .idea_generator import IdeaGenerator, TemplateUsage
+from .limits import ResourceLimits
+from .logging_config import get_logger, log_context
 from .memory import MemoryStore
-from .models import RunRecord, ValidationResult
+from .models import CheckRecord, PlanArtifact, ProjectIdea, RunRecord, ValidationResult
+from .pipeline import Stage, StagePipeline
 from .planner import ArchitecturePlanner
+from .pr_outbox import OutboxPublisher
 from .scheduler import SchedulerLock
 from .security import SecurityPolicyError, SecurityScanner
+from .tool_cache import ToolCache
+from .validation_cache import ValidationCache
 from .validator import Validator
+from .warm_worker import WarmWorkerPool
 
 logger = get_logger("orchestrator")
 
 
+@dataclass(slots=True)
+class _CycleJob:
+    """Mutable state carried through the stages of one project cycle."""
+
+    started: datetime
+    idea: ProjectIdea | None = None
+    plan: PlanArtifact | None = None
+    project_root: Path | None = None
+    retries: int = 0
+    success: bool = False
+    halted: bool = False
+    checks: list[CheckRecord] = field(default_factory=list)
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+
 
 class AutoDevOrchestrator:
     """Coordinates generation, validation, correction, and contribution workflow."""
 
-    def __init__(self, config: AgentConfig | None = None) -> None:
+    def __init__(self, config: AgentConfig | None = None, events: EventBus | None = None) -> None:
         self.config = config or AgentConfig()
+        self.events = events
         self.config.ensure_dirs()
         self.memory = MemoryStore(self.config.memory_db_path)
         self.idea_generator = IdeaGenerator()
         self.planner = ArchitecturePlanner()
-        self.validator = Validator()
+        validation_cache = None
+        warm_pool = None
+        if self.config.validation_cache:
+            validation_cache = ValidationCache(
+                self.config.memory_db_path.parent / "validation_cache.db",
+                max_entries=self.config.validation_cache_entries,
+            )
+        if self.config.validation_warm_workers:
+            warm_pool = WarmWorkerPool(self.config.validation_warm_workers)
+        self.validator = Validator(
+            max_concurrency=self.config.validation_concurrency,
+            fail_fast=self.config.validation_fail_fast,
+            cache=validation_cache,
+            warm_pool=warm_pool,
+            artifacts_dir=self.config.artifacts_path,
+            capture_limit=self.config.capture_bytes,
+            limits=ResourceLimits(
+                wall_seconds=self.config.check_timeout_seconds or None,
+                cpu_seconds=self.config.check_cpu_seconds or None,
+                memory_bytes=self.config.check_memory_mb * 1024 * 1024 or None,
+            ),
+            tool_cache=(
+                ToolCache(self.config.tool_cache_path, max_bytes=self.config.tool_cache_mb * 1024 * 1024)
+                if self.config.tool_cache
+                else None
+            ),
+            syntax_in_memory=self.config.syntax_in_memory,
+            lean=self.config.lean_checks,
+        )
         self.scheduler = SchedulerLock(
             self.config.schedule_lock_file, stale_after_seconds=self.config.lock_stale_seconds
         )
-        self.scaffolder = ProjectScaffolder()
+        self.scaffolder = ProjectScaffolder(BlobStore(self.config.blob_store_path) if self.config.dedupe_files else None)
         self.correction_engine = CorrectionEngine()
-        self.security_scanner = SecurityScanner()
+        self.security_scanner = SecurityScanner(self.config.memory_db_path.parent / "security_cache.db")
+        self.pr_publisher: OutboxPublisher | None = None
+        if self.config.auto_pr:
+            # Also picks up pull requests left pending by earlier runs.
+            self.pr_publisher = OutboxPublisher(
+                self.memory, GitHubManager(self.config.github_repo), push=GitWorkflow(Path.cwd()).push_branch
+            )
+            self.pr_publisher.start()
+
+    def close(self, drain_timeout: float = 0.0) -> None:
+        """Stop background work, giving queued pull requests up to ``drain_timeout`` seconds, and close the database."""
+        if self.pr_publisher is not None:
+            self.pr_publisher.stop(drain_timeout=drain_timeout)
+            self.pr_publisher = None
+        if self.validator.warm_pool is not None:
+            self.validator.warm_pool.close()
+        self.memory.close()
 
     def run_once(self) -> bool:
         """Execute one autonomous cycle with retry-aware logging and correction hooks."""
@@ -50,128 +124,350 @@ class AutoDevOrchestrator:
             return False
 
         logger.info("Starting orchestration cycle")
+        try:
+            self._backup_memory()
+            self._compact_history()
+            self._trim_tool_cache()
+            return self._run_cycle().success
+        finally:
+            self.scheduler.release()
+
+    def run_idea(self, idea: ProjectIdea | None = None) -> RunRecord:
+        """Run one cycle without the scheduler lock; job workers are admitted by the job queue instead."""
+        return self._run_cycle(idea)
+
+    def run_batch(self, count: int, *, workers: int = 1) -> list[RunRecord]:
+        """Generate and validate ``count`` projects, fanning out over ``workers`` processes.
+
+        Ideas are drawn up front in this process so names stay unique; each
+        worker then runs plan -> scaffold -> security -> validate -> correct in
+        its own orchestrator instance and project directory. Publishing is
+        deferred to this process so concurrent workers never race on git HEAD.
+        """
+        if count < 1:
+            raise ValueError("Batch size must be at least 1.")
+        if not self.scheduler.acquire():
+            logger.info("Could not acquire scheduler lock - another instance may be running")
+            return []
+
+        logger.info(f"Starting batch orchestration: {count} project(s), {workers} worker(s)")
         started = datetime.now(tz=timezone.utc)
-        retries = 0
-        success = False
-        project_name = "n/a"
+        try:
+            self._backup_memory()
+            self._compact_history()
+            self._trim_tool_cache()
+            ideas = self._reserve_ideas(count)
+            if workers <= 1 or len(ideas) == 1:
+                records = [self._run_cycle(idea) for idea in ideas]
+            else:
+                records = self._run_in_pool(ideas, workers)
+        finally:
+            self.scheduler.release()
 
-        # Create database backup before starting
+        duration = (datetime.now(tz=timezone.utc) - started).total_seconds()
+        succeeded = sum(record.success for record in records)
+        logger.info(
+            f"Batch orchestration finished - {succeeded}/{len(records)} succeeded, duration={duration:.1f}s"
+        )
+        return records
+
+    def run_pipeline(
+        self,
+        count: int,
+        *,
+        validation_workers: int = 1,
+        queue_size: int = 2,
+    ) -> list[RunRecord]:
+        """Stream ``count`` projects through overlapping stages.
+
+        Idea generation, planning, scaffolding and security scanning for the
+        next project proceed while earlier projects are still validating.
+        Bounded queues between stages provide backpressure, and per-stage
+        queue depth and utilisation are logged when the batch completes.
+        """
+        if count < 1:
+            raise ValueError("Batch size must be at least 1.")
+        if not self.scheduler.acquire():
+            logger.info("Could not acquire scheduler lock - another instance may be running")
+            return []
+
+        logger.info(f"Starting pipelined orchestration: {count} project(s), {validation_workers} validation worker(s)")
+        usage = self.memory.template_usage()
+        pipeline = StagePipeline(
+            [
+                Stage("idea", lambda job: self._advance(job, self._stage_idea, usage)),
+                Stage("plan", lambda job: self._advance(job, self._stage_plan)),
+                Stage("scaffold", lambda job: self._advance(job, self._stage_scaffold)),
+                Stage("security", lambda job: self._advance(job, self._stage_security)),
+                Stage("validate", lambda job: self._advance(job, self._stage_validate), workers=validation_workers),
+                Stage("publish", self._finish_pipeline_job),
+            ],
+            queue_size=queue_size,
+        )
+        try:
+            self._backup_memory()
+            self._compact_history()
+            self._trim_tool_cache()
+            jobs = pipeline.run(_CycleJob(started=datetime.now(tz=timezone.utc)) for _ in range(count))
+        finally:
+            self.scheduler.release()
+
+        for stats in pipeline.stats:
+            logger.info(f"Pipeline stage {stats.describe()}")
+        return jobs
+
+    def _reserve_ideas(self, count: int) -> list[ProjectIdea]:
+        """Draw ``count`` unique ideas, treating earlier picks as already taken."""
+        usage = self.memory.template_usage()
+        ideas: list[ProjectIdea] = []
+        for _ in range(count):
+            job = _CycleJob(started=datetime.now(tz=timezone.utc))
+            self._stage_idea(job, usage)
+            ideas.append(job.idea)
+        return ideas
+
+    def _run_in_pool(self, ideas: list[ProjectIdea], workers: int) -> list[RunRecord]:
+        """Run one cycle per idea in a process pool and publish successes afterwards."""
+        worker_config = replace(self.config, auto_git=False, auto_pr=False)
+        records: list[RunRecord] = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(ideas))) as executor:
+            futures = [executor.submit(_run_batch_cycle, worker_config, idea) for idea in ideas]
+            for idea, future in zip(ideas, futures):
+                try:
+                    records.append(future.result())
+                except (BrokenProcessPool, OSError) as e:
+                    logger.error(f"Batch worker for {idea.name} crashed: {type(e).__name__}: {e}")
+                    now = datetime.now(tz=timezone.utc)
+                    record = RunRecord(
+                        started_at=now, finished_at=now, project_name=idea.name, retries=0, success=False
+                    )
+                    self.memory.store_run(record)
+                    records.append(record)
+
+        if self.config.auto_git:
+            published = [record.project_name for record in records if record.success]
+            if published:
+                self._try_publish(*published)
+        return records
+
+    def _backup_memory(self) -> None:
+        """Snapshot the memory database before a cycle mutates it, at most once per ``backup_interval_seconds``."""
         try:
             backup = DatabaseBackup(self.config.memory_db_path)
+            backups = backup.list_backups()
+            if backups and time.time() - backups[0][0].stat().st_mtime < self.config.backup_interval_seconds:
+                return
             backup_path = backup.create_backup("Pre-cycle backup")
-            logger.debug(f"Database backup created: {backup_path}")
+            logger.debug("Database backup created: %s", backup_path)
             backup.cleanup_old_backups(keep_count=10)
         except Exception as e:
             logger.warning(f"Failed to create database backup: {e}")
 
+    def _trim_tool_cache(self) -> None:
+        """Keep the shared validation tool caches under their size cap."""
+        if self.validator.tool_cache is None:
+            return
+        try:
+            self.validator.tool_cache.trim()
+        except OSError as e:
+            logger.warning("Failed to trim tool cache: %s", e)
+
+    def _compact_history(self) -> None:
+        """Roll runs older than the retention window into daily aggregates."""
+        if self.config.history_retention_days <= 0:
+            return
+        cutoff = datetime.now(tz=timezone.utc) - timedelta(days=self.config.history_retention_days)
         try:
+            rolled_up = self.memory.compact_history(cutoff)
+        except Exception as e:
+            logger.warning(f"Failed to compact run history: {e}")
+            return
+        if rolled_up:
+            logger.info(f"Rolled {rolled_up} run(s) older than {cutoff:%Y-%m-%d} into daily aggregates")
+        pruned = prune_artifacts(self.config.artifacts_path, self.config.history_retention_days * 86400)
+        if pruned:
+            logger.info(f"Removed {pruned} check output artifact(s) older than {cutoff:%Y-%m-%d}")
+
+    def _finish_pipeline_job(self, job: _CycleJob) -> RunRecord:
+        self._advance(job, self._stage_publish)
+        return self._record_run(job)
+
+    def _run_cycle(self, idea: ProjectIdea | None = None) -> RunRecord:
+        """Run idea -> plan -> scaffold -> security -> validate/correct and record the run."""
+        job = _CycleJob(started=datetime.now(tz=timezone.utc), idea=idea)
+        for stage in (
+            self._stage_idea,
+            self._stage_plan,
+            self._stage_scaffold,
+            self._stage_security,
+            self._stage_validate,
+            self._stage_publish,
+        ):
+            self._advance(job, stage)
+        return self._record_run(job)
+
+    def _advance(self, job: _CycleJob, stage: Callable[..., None], *args: Any) -> _CycleJob:
+        """Run one stage unless an earlier stage halted the job."""
+        if job.halted:
+            return job
+        name = stage.__name__.removeprefix("_stage_")
+        project = job.idea.name if job.idea else None
+        if self.events is not None:
+            self.events.publish("stage", stage=name, project=project)
+        with log_context(run_id=job.run_id, project=project, stage=name):
+            try:
+                stage(job, *args)
+            except Exception as e:
+                logger.error("Unexpected error during orchestration: %s: %s", type(e).__name__, e, exc_info=True)
+                job.halted = True
+        return job
+
+    def _stage_idea(self, job: _CycleJob, usage: dict[str, TemplateUsage] | None = None) -> None:
+        if job.idea is None:
             logger.debug("Generating project idea...")
-            idea = self.idea_generator.generate(
-                existing_names=self.memory.list_project_names(),
+            usage = self.memory.template_usage() if usage is None else usage
+            # Claimed in memory.db right away: job workers run without the scheduler lock, so a concurrent
+            # run or job must not pick the same name and scaffold into the same directory.
+            job.idea = self.idea_generator.reserve(
+                lambda idea: self.memory.reserve_project(idea.name, idea.category, idea.complexity),
+                usage,
                 min_complexity=self.config.min_complexity,
                 max_complexity=self.config.max_complexity,
             )
-            project_name = idea.name
-            logger.info(f"Generated project idea: {project_name} (category: {idea.category.value}, complexity: {idea.complexity})")
-
-            logger.debug("Creating architecture plan...")
-            plan = self.planner.create_plan(idea, self.config)
-
-            logger.debug("Scaffolding project...")
-            generated = self.scaffolder.generate(
-                workspace_root=self.config.workspace_root,
-                idea=idea,
-                plan=plan,
-                readme_text=generate_readme(idea, plan),
-                config=self.config,
+            idea = job.idea
+            logger.info(
+                "Generated project idea: %s (category: %s, complexity: %s)", idea.name, idea.category.value, idea.complexity
             )
-            project_root = generated.root
-            logger.info(f"Project scaffolded at: {project_root}")
 
-            logger.debug("Storing project in memory...")
-            self.memory.store_project(idea.name, idea.category, idea.complexity)
+    def _stage_plan(self, job: _CycleJob) -> None:
+        logger.debug("Creating architecture plan...")
+        job.plan = self.planner.create_plan(job.idea, self.config)
 
-            logger.debug("Running security scan...")
-            try:
-                self.security_scanner.scan(project_root)
-                logger.info("Security scan passed")
-            except SecurityPolicyError as e:
-                logger.error(f"Security policy violation: {e}")
-                return False
-
-            while retries <= self.config.max_retries:
-                logger.info(f"Running validation (attempt {retries + 1}/{self.config.max_retries + 1})...")
-                validation = self.validator.run(
-                    project_root,
-                    run_lint=self.config.run_lint,
-                    run_type_check=self.config.run_type_check,
-                    run_coverage=self.config.run_coverage,
-                    min_coverage=self.config.min_test_coverage,
-                    strict_validation=self.config.strict_validation,
-                )
-                self._write_validation_log(project_root, retries, validation)
-
-                if validation.success:
-                    logger.info("Validation passed")
-                    success = True
-                    if self.config.auto_git:
-                        logger.debug("Publishing changes...")
-                        try:
-                            self._publish_changes(project_name)
-                            logger.info("Changes published successfully")
-                        except Exception as e:
-                            logger.error(f"Failed to publish changes: {e}")
-                    break
-
-                logger.warning(f"Validation failed: {validation.checks}")
-                retries += 1
-                if retries <= self.config.max_retries:
-                    logger.info(f"Applying corrections and retrying...")
-                    self.correction_engine.apply(project_root, validation)
-                else:
-                    logger.error("Max retries exceeded")
-
-            return success
+    def _stage_scaffold(self, job: _CycleJob) -> None:
+        logger.debug("Scaffolding project...")
+        generated = self.scaffolder.generate(
+            workspace_root=self.config.workspace_root,
+            idea=job.idea,
+            plan=job.plan,
+            readme_text=generate_readme(job.idea, job.plan),
+            config=self.config,
+        )
+        job.project_root = generated.root
+        logger.info("Project scaffolded at: %s", job.project_root)
 
-        except Exception as e:
-            logger.error(f"Unexpected error during orchestration: {type(e).__name__}: {e}", exc_info=True)
-            return False
-        finally:
-            finished = datetime.now(tz=timezone.utc)
-            duration = (finished - started).total_seconds()
-            logger.info(f"Orchestration cycle finished - success={success}, duration={duration:.1f}s, retries={retries}")
-
-            self.memory.store_run(
-                RunRecord(
-                    started_at=started,
-                    finished_at=finished,
-                    project_name=project_name,
-                    retries=retries,
-                    success=success,
+    def _stage_security(self, job: _CycleJob) -> None:
+        logger.debug("Running security scan...")
+        try:
+            self.security_scanner.scan(job.project_root)
+            logger.info("Security scan passed")
+        except SecurityPolicyError as e:
+            logger.error("Security policy violation: %s", e)
+            job.halted = True
+
+    def _stage_validate(self, job: _CycleJob) -> None:
+        project_root = job.project_root
+        while job.retries <= self.config.max_retries:
+            logger.info("Running validation (attempt %d/%d)...", job.retries + 1, self.config.max_retries + 1)
+            validation = self.validator.run(
+                project_root,
+                run_lint=self.config.run_lint,
+                run_type_check=self.config.run_type_check,
+                run_coverage=self.config.run_coverage,
+                min_coverage=self.config.min_test_coverage,
+                strict_validation=self.config.strict_validation,
+            )
+            self._write_validation_log(project_root, job.retries, validation)
+            job.checks.extend(
+                CheckRecord(
+                    attempt=job.retries,
+                    name=name,
+                    passed=passed,
+                    status=_check_status(name, validation),
+                    usage=validation.resources.get(name),
                 )
+                for name, passed in validation.checks.items()
             )
-            self.scheduler.release()
 
-    def _publish_changes(self, project_name: str) -> None:
-        """Create branch/commit and optionally open a pull request."""
-        repo_root = Path.cwd()
-        git = GitWorkflow(repo_root)
-        branch = git.create_or_checkout_feature_branch(project_name)
-        committed = git.commit_project(project_name)
-        if not committed:
-            logger.info("No repository changes detected; skipping push and PR creation")
-            return
-        if not self.config.auto_pr:
-            return
-        git.push_branch(branch)
-        manager = GitHubManager(self.config.github_repo)
-        manager.create_pull_request(
-            title=f"feat: add {project_name} with tests and documentation",
-            body="Automated contribution generated by AutoDev Agent.",
-            head=branch,
-            base="main",
+            if validation.success:
+                logger.info("Validation passed")
+                job.success = True
+                return
+
+            logger.warning("Validation failed: %s", validation.checks)
+            job.retries += 1
+            if job.retries <= self.config.max_retries:
+                logger.info("Applying corrections and retrying...")
+                self.correction_engine.apply(project_root, validation)
+            else:
+                logger.error("Max retries exceeded")
+
+    def _stage_publish(self, job: _CycleJob) -> None:
+        if job.success and self.config.auto_git:
+            self._try_publish(job.idea.name)
+
+    def _record_run(self, job: _CycleJob) -> RunRecord:
+        finished = datetime.now(tz=timezone.utc)
+        duration = (finished - job.started).total_seconds()
+        logger.info(
+            f"Orchestration cycle finished - success={job.success}, duration={duration:.1f}s, retries={job.retries}"
         )
 
+        record = RunRecord(
+            started_at=job.started,
+            finished_at=finished,
+            project_name=job.idea.name if job.idea else "n/a",
+            retries=job.retries,
+            success=job.success,
+            checks=job.checks,
+        )
+        # Project and run rows commit together so history never references a missing project.
+        with self.memory.transaction():
+            if job.project_root is not None:
+                logger.debug("Storing project in memory...")
+                self.memory.store_project(job.idea.name, job.idea.category, job.idea.complexity)
+            self.memory.store_run(record)
+        if self.events is not None:
+            self.events.publish(
+                "complete", project=record.project_name, success=record.success, retries=record.retries, duration=duration
+            )
+        return record
+
+    def _try_publish(self, *project_names: str) -> None:
+        """Publish validated projects, logging rather than raising on failure."""
+        logger.debug("Publishing changes...")
+        try:
+            self._publish_changes(list(project_names))
+            logger.info("Changes published successfully")
+        except Exception as e:
+            logger.error("Failed to publish changes: %s", e)
+
+    def _publish_changes(self, project_names: list[str]) -> None:
+        """Commit each project onto its feature branch and queue pull requests.
+
+        Commits are built with git plumbing in a temporary index, so HEAD and
+        the working tree are never touched and only the project directories
+        are staged. Pushing and PR creation go through the outbox and happen
+        on the background publisher, never on the validation path.
+        """
+        git = GitWorkflow(Path.cwd())
+        results = git.publish_projects([self.config.workspace_root / name for name in project_names])
+        for result in results:
+            if not result.committed:
+                logger.info("No repository changes detected for %s; skipping push and PR creation", result.project)
+                continue
+            logger.info("Committed %s to %s (%s)", result.project, result.branch, result.commit[:12])
+            if self.pr_publisher is None:
+                continue
+            self.memory.enqueue_pull_request(
+                head=result.branch,
+                base="main",
+                title=f"feat: add {result.project} with tests and documentation",
+                body="Automated contribution generated by AutoDev Agent.",
+            )
+            logger.info("Queued pull request for %s", result.branch)
+        if self.pr_publisher is not None:
+            self.pr_publisher.notify()
+
     @staticmethod
     def _write_validation_log(project_root: Path, attempt: int, result: ValidationResult) -> None:
         log_file = project_root / "validation_log.jsonl"
@@ -179,7 +475,30 @@ class AutoDevOrchestrator:
             "attempt": attempt,
             "success": result.success,
             "checks": result.checks,
+            "reused": result.reused,
+            "executed": result.executed,
+            "cancelled": result.cancelled,
             "logs": result.logs,
+            "artifacts": result.artifacts,
+            "resources": {name: asdict(usage) for name, usage in result.resources.items()},
         }
         with log_file.open("a", encoding="utf-8") as handle:
             handle.write(json.dumps(entry) + "\n")
+
+
+def _check_status(name: str, result: ValidationResult) -> str:
+    """Whether a check was executed, reused from an earlier attempt, or cancelled."""
+    if name in result.cancelled:
+        return "cancelled"
+    if name in result.reused:
+        return "reused"
+    return "executed"
+
+
+def _run_batch_cycle(config: AgentConfig, idea: ProjectIdea) -> RunRecord:
+    """Process-pool entry point: run one isolated cycle for a pre-reserved idea."""
+    orchestrator = AutoDevOrchestrator(config)
+    try:
+        return orchestrator.run_idea(idea)
+    finally:
+        orchestrator.close()
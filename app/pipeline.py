@@ -0,0 +1,151 @@
+"""Bounded-queue stage pipeline for overlapping orchestration work."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+from .logging_config import get_logger
+
+logger = get_logger("pipeline")
+
+_DONE = object()
+
+
+@dataclass(slots=True)
+class Stage:
+    """One pipeline step with its own concurrency level."""
+
+    name: str
+    handler: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Throughput and saturation metrics for a single stage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    max_queue_depth: int = 0
+    depth_samples: list[int] = field(default_factory=list)
+
+    @property
+    def utilisation(self) -> float:
+        """Fraction of available worker time spent inside the handler."""
+        capacity = self.wall_seconds * self.workers
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    @property
+    def mean_queue_depth(self) -> float:
+        """Average input-queue depth observed when items were dequeued."""
+        return sum(self.depth_samples) / len(self.depth_samples) if self.depth_samples else 0.0
+
+    def describe(self) -> str:
+        """Single-line summary suitable for logs."""
+        return (
+            f"{self.name}: workers={self.workers} processed={self.processed} failed={self.failed} "
+            f"utilisation={self.utilisation:.0%} queue_depth(mean={self.mean_queue_depth:.1f}, "
+            f"max={self.max_queue_depth})"
+        )
+
+
+class StagePipeline:
+    """Stream items through stages connected by bounded queues.
+
+    Each stage reads from its own ``queue.Queue(maxsize=queue_size)``, so a
+    fast upstream stage blocks on ``put`` once the slower stage behind it has
+    ``queue_size`` items waiting. Handlers run on threads, which suits stages
+    that spend their time waiting on subprocesses or the network. An item
+    whose handler raises is logged, counted in ``StageStats.failed`` and
+    dropped; the rest of the stream keeps flowing.
+    """
+
+    def __init__(self, stages: list[Stage], *, queue_size: int = 2) -> None:
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage.")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stats = [StageStats(name=stage.name, workers=max(1, stage.workers)) for stage in stages]
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable[Any]) -> list[Any]:
+        """Push ``items`` through every stage and return outputs in completion order."""
+        queues: list[queue.Queue[Any]] = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        outputs: queue.Queue[Any] = queue.Queue()
+        remaining = [stats.workers for stats in self.stats]
+        started = time.perf_counter()
+
+        threads: list[threading.Thread] = []
+        for index, stage in enumerate(self.stages):
+            downstream = queues[index + 1] if index + 1 < len(queues) else outputs
+            for worker in range(self.stats[index].workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(index, stage, queues[index], downstream, remaining, started),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        for item in items:
+            queues[0].put(item)
+        for _ in range(self.stats[0].workers):
+            queues[0].put(_DONE)
+        for thread in threads:
+            thread.join()
+
+        results: list[Any] = []
+        while not outputs.empty():
+            results.append(outputs.get_nowait())
+        return results
+
+    def _work(
+        self,
+        index: int,
+        stage: Stage,
+        inbox: queue.Queue[Any],
+        outbox: queue.Queue[Any],
+        remaining: list[int],
+        started: float,
+    ) -> None:
+        stats = self.stats[index]
+        try:
+            while True:
+                depth = inbox.qsize()
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                began = time.perf_counter()
+                failed = False
+                try:
+                    result = stage.handler(item)
+                except Exception as e:
+                    logger.error("Pipeline stage %s failed: %s: %s", stage.name, type(e).__name__, e, exc_info=True)
+                    failed = True
+                elapsed = time.perf_counter() - began
+                with self._lock:
+                    stats.processed += 1
+                    stats.failed += failed
+                    stats.busy_seconds += elapsed
+                    stats.depth_samples.append(depth)
+                    stats.max_queue_depth = max(stats.max_queue_depth, depth)
+                if not failed:
+                    outbox.put(result)
+        finally:
+            # Downstream workers only stop on _DONE; without it run() would block forever.
+            with self._lock:
+                remaining[index] -= 1
+                last_worker = remaining[index] == 0
+                stats.wall_seconds = time.perf_counter() - started
+            if last_worker and index + 1 < len(self.stages):
+                for _ in range(self.stats[index + 1].workers):
+                    outbox.put(_DONE)
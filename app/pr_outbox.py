@@ -0,0 +1,145 @@
+"""Background publisher that drains the pull request outbox."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from random import Random
+from typing import Callable
+
+from .github_manager import GitHubError, GitHubManager
+from .logging_config import get_logger
+from .memory import MemoryStore
+from .models import OutboxItem
+
+logger = get_logger("pr_outbox")
+
+
+class OutboxPublisher:
+    """Push branches and open pull requests queued in ``MemoryStore``'s outbox.
+
+    The orchestrator only appends to the outbox, so validation never waits
+    on the network. This publisher leases due items, pushes the branch (if a
+    ``push`` callable is given) and creates the pull request. Transient
+    failures are retried with jittered exponential backoff, or after the
+    server's ``Retry-After``/rate-limit reset; a rate-limited response pauses
+    the rest of the batch. Both steps are idempotent, so a retried item never
+    produces a duplicate pull request.
+    """
+
+    def __init__(
+        self,
+        memory: MemoryStore,
+        client: GitHubManager,
+        *,
+        push: Callable[[str], None] | None = None,
+        max_attempts: int = 8,
+        backoff_seconds: float = 5.0,
+        max_backoff_seconds: float = 900.0,
+        poll_seconds: float = 30.0,
+        lease_seconds: float = 300.0,
+        seed: int | None = None,
+    ) -> None:
+        self.memory = memory
+        self.client = client
+        self.push = push
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._rng = Random(seed)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the background drain thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="autodev-pr-outbox", daemon=True)
+        self._thread.start()
+
+    def notify(self) -> None:
+        """Wake the publisher after new items were enqueued."""
+        self._wake.set()
+
+    def stop(self, drain_timeout: float = 0.0) -> None:
+        """Stop the thread, then keep draining due items for up to ``drain_timeout`` seconds."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        deadline = time.monotonic() + drain_timeout
+        while time.monotonic() < deadline and self.drain_once():
+            pass
+        self.client.close()
+        depth = self.memory.outbox_depth()
+        if depth["pending"]:
+            logger.info(f"PR outbox stopped with {depth['pending']} pending item(s); they are retried on the next run")
+
+    def depth(self) -> dict[str, int]:
+        """Outbox items per state."""
+        return self.memory.outbox_depth()
+
+    def drain_once(self) -> int:
+        """Publish every due item once; return how many were attempted."""
+        items = self.memory.claim_pull_requests(self.lease_seconds)
+        attempted = 0
+        for item in items:
+            attempted += 1
+            paused = self._publish(item)
+            if paused:
+                # Every later request would hit the same limit; release the rest of the lease without using an attempt.
+                for remaining in items[attempted:]:
+                    self.memory.reschedule_pull_request(remaining.id, paused)
+                break
+        if attempted:
+            logger.info(f"PR outbox drained {attempted} item(s); depth {self.depth()}")
+        return attempted
+
+    def _publish(self, item: OutboxItem) -> float:
+        """Attempt one item; return a pause in seconds when the API is rate limited, else 0."""
+        try:
+            if self.push is not None:
+                self.push(item.head)
+            pull = self.client.create_pull_request(title=item.title, body=item.body, head=item.head, base=item.base)
+        except GitHubError as e:
+            self._retry_or_fail(item, str(e), retryable=e.retryable, delay=e.retry_after)
+            return e.retry_after or 0.0
+        except (subprocess.CalledProcessError, OSError) as e:
+            self._retry_or_fail(item, f"{type(e).__name__}: {e}", retryable=True)
+            return 0.0
+        except RuntimeError as e:
+            # Missing token or repository: retrying cannot help.
+            self._retry_or_fail(item, str(e), retryable=False)
+            return 0.0
+        self.memory.complete_pull_request(item.id, pull.get("html_url", ""))
+        logger.info(f"Pull request for {item.head} published: {pull.get('html_url', '')}")
+        return 0.0
+
+    def _retry_or_fail(self, item: OutboxItem, error: str, *, retryable: bool, delay: float | None = None) -> None:
+        if not retryable or item.attempts + 1 >= self.max_attempts:
+            logger.error(f"Giving up on pull request for {item.head} after {item.attempts + 1} attempt(s): {error}")
+            self.memory.fail_pull_request(item.id, error)
+            return
+        if delay is None:
+            ceiling = min(self.max_backoff_seconds, self.backoff_seconds * 2**item.attempts)
+            delay = self._rng.uniform(ceiling / 2, ceiling)
+        logger.warning(f"Pull request for {item.head} failed ({error}); retrying in {delay:.0f}s")
+        self.memory.retry_pull_request(item.id, delay, error)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            wait = self.poll_seconds
+            try:
+                self.drain_once()
+                next_at = self.memory.next_outbox_attempt()
+                if next_at is not None:
+                    wait = min(self.poll_seconds, max(0.0, next_at - time.time()))
+            except Exception as e:
+                logger.error(f"PR outbox drain failed: {type(e).__name__}: {e}", exc_info=True)
+            self._wake.wait(wait)
+            self._wake.clear()
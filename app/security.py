@@ -2,6 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
 
@@ -9,8 +17,31 @@ class SecurityPolicyError(RuntimeError):
     """Raised when a generated project violates security policy."""
 
 
+@dataclass(slots=True)
+class ScanStats:
+    """Counters for the most recent scan."""
+
+    files: int = 0
+    scanned: int = 0
+    cached: int = 0
+    seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """Scan throughput including cache hits."""
+        return self.files / self.seconds if self.seconds else 0.0
+
+
 class SecurityScanner:
-    """Minimal static checks for dangerous patterns in generated code."""
+    """Minimal static checks for dangerous patterns in generated code.
+
+    All ``FORBIDDEN_PATTERNS`` are compiled into one regular expression and
+    matched in a single pass over each file's bytes. With ``cache_path`` set,
+    per-file results are kept in SQLite keyed by path and validated by size,
+    mtime and content hash, so unchanged files are not rescanned. Trees with
+    more than ``parallel_threshold`` files to scan are spread over ``workers``
+    processes.
+    """
 
     FORBIDDEN_PATTERNS = (
         "subprocess.Popen(",
@@ -19,14 +50,134 @@ class SecurityScanner:
         "exec(",
     )
 
+    def __init__(self, cache_path: Path | None = None, *, workers: int = 1, parallel_threshold: int = 256) -> None:
+        self.cache_path = cache_path
+        self.workers = max(1, workers)
+        self.parallel_threshold = parallel_threshold
+        self.last_stats = ScanStats()
+        self._rules_key = hashlib.sha256("\0".join(self.FORBIDDEN_PATTERNS).encode("utf-8")).hexdigest()
+        if cache_path is not None:
+            self._initialize_cache()
+
     def scan(self, project_root: Path) -> None:
         """Raise on disallowed patterns in python source files."""
-        violations: list[str] = []
-        for file_path in project_root.rglob("*.py"):
-            content = file_path.read_text(encoding="utf-8")
-            for pattern in self.FORBIDDEN_PATTERNS:
-                if pattern in content:
-                    violations.append(f"{file_path}: {pattern}")
+        violations = self.find_violations(project_root)
         if violations:
             joined = "; ".join(violations)
             raise SecurityPolicyError(f"Security policy violation: {joined}")
+
+    def find_violations(self, root: Path) -> list[str]:
+        """Return ``"<file>: <pattern>"`` for every forbidden pattern found under ``root``."""
+        started = time.perf_counter()
+        files = sorted(root.rglob("*.py"))
+        cached = self._load_cache(files)
+        results: dict[Path, list[str]] = {}
+        pending: list[tuple[Path, os.stat_result]] = []
+        for path in files:
+            stat = path.stat()
+            entry = cached.get(os.path.abspath(path))
+            if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+                results[path] = entry[3]
+            else:
+                pending.append((path, stat))
+
+        fresh = self._scan_files([str(path) for path, _ in pending])
+        updates = []
+        for (path, stat), (digest, matches) in zip(pending, fresh):
+            entry = cached.get(os.path.abspath(path))
+            results[path] = entry[3] if entry and entry[2] == digest else matches
+            updates.append((os.path.abspath(path), stat.st_size, stat.st_mtime_ns, digest, results[path]))
+        self._store_cache(updates)
+
+        self.last_stats = ScanStats(
+            files=len(files),
+            scanned=len(pending),
+            cached=len(files) - len(pending),
+            seconds=time.perf_counter() - started,
+        )
+        return [f"{path}: {pattern}" for path in files for pattern in results[path]]
+
+    def _scan_files(self, paths: list[str]) -> list[tuple[str, list[str]]]:
+        if self.workers > 1 and len(paths) > self.parallel_threshold:
+            chunksize = max(1, len(paths) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                return list(
+                    executor.map(_scan_file, paths, [self.FORBIDDEN_PATTERNS] * len(paths), chunksize=chunksize)
+                )
+        return [_scan_file(path, self.FORBIDDEN_PATTERNS) for path in paths]
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.cache_path)
+
+    def _initialize_cache(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scan_cache (
+                    path TEXT PRIMARY KEY,
+                    rules TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    violations TEXT NOT NULL
+                )
+                """
+            )
+
+    def _load_cache(self, files: list[Path]) -> dict[str, tuple[int, int, str, list[str]]]:
+        if self.cache_path is None or not files:
+            return {}
+        wanted = {os.path.abspath(path) for path in files}
+        prefix = os.path.commonpath(wanted)
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT path, size, mtime_ns, sha256, violations FROM scan_cache
+                WHERE rules = ? AND path >= ? AND path < ?
+                """,
+                (self._rules_key, prefix, prefix + "\uffff"),
+            ).fetchall()
+        return {row[0]: (row[1], row[2], row[3], json.loads(row[4])) for row in rows if row[0] in wanted}
+
+    def _store_cache(self, updates: list[tuple[str, int, int, str, list[str]]]) -> None:
+        if self.cache_path is None or not updates:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO scan_cache(path, rules, size, mtime_ns, sha256, violations)
+                VALUES(?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (path, self._rules_key, size, mtime_ns, digest, json.dumps(found))
+                    for path, size, mtime_ns, digest, found in updates
+                ],
+            )
+
+
+def _compile_patterns(patterns: tuple[str, ...]) -> re.Pattern[bytes]:
+    # Zero-width lookahead, so overlapping matches are found too. At each position it reports only the
+    # first alternative that matches; _scan_file checks every pattern there.
+    alternatives = b"|".join(re.escape(pattern.encode("utf-8")) for pattern in patterns)
+    return re.compile(b"(?=" + alternatives + b")")
+
+
+_COMPILED: dict[tuple[str, ...], re.Pattern[bytes]] = {}
+
+
+def _scan_file(path: str, patterns: tuple[str, ...]) -> tuple[str, list[str]]:
+    """Return the content hash of ``path`` and the patterns it contains, in rule order."""
+    matcher = _COMPILED.get(patterns)
+    if matcher is None:
+        matcher = _COMPILED[patterns] = _compile_patterns(patterns)
+    data = Path(path).read_bytes()
+    pending = {pattern: pattern.encode("utf-8") for pattern in patterns}
+    for match in matcher.finditer(data):
+        # Every occurrence of every pattern starts at one of these positions.
+        for pattern, raw in list(pending.items()):
+            if data.startswith(raw, match.start()):
+                del pending[pattern]
+        if not pending:
+            break
+    return hashlib.sha256(data).hexdigest(), [pattern for pattern in patterns if pattern not in pending]
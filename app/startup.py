@@ -0,0 +1,77 @@
+"""Startup cost of validation tool invocations, broken down with ``python -X importtime``."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .capture import OutputCapture, run_captured
+
+# -X importtime writes one line per imported module; keep all of them.
+IMPORTTIME_LIMIT = 16 * 1024 * 1024
+
+
+@dataclass(slots=True)
+class StartupProfile:
+    """Median wall time of a command and cumulative import time per top-level package (microseconds)."""
+
+    command: list[str]
+    seconds: float
+    returncode: int
+    imports: dict[str, int]
+
+    @property
+    def import_seconds(self) -> float:
+        return sum(self.imports.values()) / 1e6
+
+    def top(self, count: int) -> list[tuple[str, int]]:
+        """The ``count`` packages that took longest to import."""
+        return sorted(self.imports.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def startup_command(command: tuple[str, ...] | list[str]) -> list[str]:
+    """The cheapest invocation of a check that still pays its full startup: config, plugins, collection."""
+    if len(command) > 2 and command[1] == "-m" and command[2] == "pytest":
+        return [*command, "--collect-only"]
+    return [*command[:3], "--version"]
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds per top-level package from ``-X importtime`` output."""
+    imports: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        if name.startswith(" "):
+            continue  # Nested import; already counted in its importer's cumulative time.
+        package = name.split(".", 1)[0]
+        imports[package] = imports.get(package, 0) + int(parts[1])
+    return imports
+
+
+def profile_startup(command: list[str], *, cwd: Path, env: dict[str, str], runs: int = 3) -> StartupProfile:
+    """Time ``runs`` executions of ``command``, then run it once more under ``-X importtime``."""
+    timings: list[float] = []
+    returncode = 0
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        returncode = run_captured(command, cwd=cwd, env=env).returncode
+        timings.append(time.perf_counter() - started)
+    traced = run_captured(
+        [command[0], "-X", "importtime", *command[1:]],
+        cwd=cwd,
+        env=env,
+        stderr=OutputCapture(IMPORTTIME_LIMIT),
+    )
+    return StartupProfile(
+        command=command,
+        seconds=statistics.median(timings),
+        returncode=returncode,
+        imports=parse_importtime(traced.stderr.text),
+    )
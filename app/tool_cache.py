@@ -0,0 +1,136 @@
+"""Shared, size-capped cache locations for the validation tools."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .logging_config import get_logger
+
+logger = get_logger("tool_cache")
+
+MYPY_CONFIG = ("mypy.ini", "setup.cfg", "pyproject.toml")
+# Touched after every trim; its mtime throttles trims across cycles and processes.
+TRIM_STAMP = ".last_trim"
+
+
+class ToolCache:
+    """Keeps every validation tool's cache out of project trees, under ``root``.
+
+    - ``pycache/``: ``PYTHONPYCACHEPREFIX``. Bytecode mirrors the source path,
+      so no ``__pycache__`` lands in the project. The tools' own modules
+      (pytest, flake8, coverage, mypy and the stdlib) compile once for every
+      project, but a project's modules are only reused by retries of that
+      project: the prefix is keyed by path, not content, so identical
+      sources in two projects are compiled twice.
+    - ``mypy/<key>/``: ``--cache-dir``, shared by every project. It is keyed
+      by interpreter version and mypy config contents, so the expensive
+      stdlib and third-party part is built once. Project modules are
+      revalidated by mypy's own fingerprints.
+    - ``pytest/<project>/`` and ``coverage/<project>``: the pytest
+      ``cache_dir`` and ``COVERAGE_FILE``, one per project.
+
+    ``trim`` evicts least recently used files once the tree exceeds
+    ``max_bytes``. Walking the tree is not free, so it runs at most once per
+    ``trim_interval_seconds``.
+    """
+
+    def __init__(
+        self, root: Path, max_bytes: int = 512 * 1024 * 1024, *, trim_interval_seconds: float = 600.0
+    ) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.trim_interval_seconds = trim_interval_seconds
+        self._lock = threading.Lock()
+
+    def env(self, project_root: Path) -> dict[str, str]:
+        """Environment variables pointing the tools at the shared caches."""
+        return {
+            "PYTHONPYCACHEPREFIX": str(self.root / "pycache"),
+            # The prefix already keeps bytecode out of project trees; without writes every import would recompile.
+            "PYTHONDONTWRITEBYTECODE": "",
+            "COVERAGE_FILE": str(self.root / "coverage" / _project_key(project_root)),
+        }
+
+    def command(self, command: tuple[str, ...], project_root: Path) -> list[str]:
+        """``command`` with cache-location options added for pytest and mypy."""
+        args = list(command)
+        module = args[2] if len(args) > 2 and args[1] == "-m" else None
+        if module == "pytest" and "no:cacheprovider" not in args:
+            return [*args[:3], "-o", f"cache_dir={self.root / 'pytest' / _project_key(project_root)}", *args[3:]]
+        if module == "mypy":
+            return [*args[:3], "--cache-dir", str(self.root / "mypy" / _mypy_key(project_root)), *args[3:]]
+        return args
+
+    def size(self) -> int:
+        """Bytes currently held."""
+        return sum(size for _, size, _ in _walk(self.root))
+
+    def trim(self, *, force: bool = False) -> int:
+        """Evict least recently used files until the cache fits ``max_bytes``; return bytes freed.
+
+        Unless ``force``, does nothing when the last trim was less than
+        ``trim_interval_seconds`` ago.
+        """
+        stamp = self.root / TRIM_STAMP
+        with self._lock:
+            if not force:
+                try:
+                    if time.time() - stamp.stat().st_mtime < self.trim_interval_seconds:
+                        return 0
+                except FileNotFoundError:
+                    pass
+            files = [entry for entry in _walk(self.root) if entry[2] != str(stamp)]
+            total = sum(size for _, size, _ in files)
+            freed = 0
+            for used, size, path in sorted(files):
+                if total - freed <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    continue
+                freed += size
+            self.root.mkdir(parents=True, exist_ok=True)
+            stamp.touch()
+        if freed:
+            logger.info("Tool cache trimmed %d byte(s); %d byte(s) remain", freed, total - freed)
+        return freed
+
+
+def _project_key(project_root: Path) -> str:
+    resolved = str(project_root.resolve())
+    return f"{project_root.name}-{hashlib.sha256(resolved.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _mypy_key(project_root: Path) -> str:
+    digest = hashlib.sha256(sys.version.encode("utf-8"))
+    for name in MYPY_CONFIG:
+        path = project_root / name
+        if path.is_file():
+            digest.update(name.encode("utf-8") + b"\0" + path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _walk(root: Path):
+    """Yield ``(last_used, size, path)`` for every file under ``root``."""
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        yield max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path
+                except FileNotFoundError:
+                    continue
@@ -0,0 +1,107 @@
+"""Persistent content-addressed cache of validation results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+from .models import ValidationResult
+
+TOOL_DISTRIBUTIONS = ("flake8", "pytest", "pytest-cov", "coverage", "mypy")
+
+
+@lru_cache(maxsize=1)
+def tool_versions() -> dict[str, str]:
+    """Versions of the interpreter and every tool whose output we cache."""
+    versions = {"python": sys.version}
+    for name in TOOL_DISTRIBUTIONS:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = "absent"
+    return versions
+
+
+class ValidationCache:
+    """SQLite-backed LRU map from project tree hash to a passing ValidationResult."""
+
+    def __init__(self, db_path: Path, max_entries: int = 512) -> None:
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path)
+
+    def _initialize(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS validation_results (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def key_for(project_root: Path, patterns: tuple[str, ...], options: dict[str, object]) -> str:
+        """Hash of every matching source file, the validator options and tool versions."""
+        digest = hashlib.sha256(json.dumps({"options": options, "tools": tool_versions()}, sort_keys=True).encode())
+        files: set[Path] = set()
+        for pattern in patterns:
+            files.update(path for path in project_root.glob(pattern) if path.is_file())
+        for path in sorted(files):
+            digest.update(path.relative_to(project_root).as_posix().encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> ValidationResult | None:
+        """Return the stored result for ``key`` and mark it recently used."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM validation_results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE validation_results SET last_used = ? WHERE key = ?", (time.time(), key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        payload = json.loads(row[0])
+        return ValidationResult(success=payload["success"], checks=payload["checks"], logs=payload["logs"])
+
+    def put(self, key: str, result: ValidationResult) -> None:
+        """Store ``result`` and evict the least recently used entries beyond capacity."""
+        payload = json.dumps({"success": result.success, "checks": result.checks, "logs": result.logs})
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO validation_results(key, result, last_used) VALUES(?, ?, ?)",
+                (key, payload, time.time()),
+            )
+            conn.execute(
+                """
+                DELETE FROM validation_results WHERE key IN (
+                    SELECT key FROM validation_results ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def stats(self) -> str:
+        """Hit/miss counters formatted for logs."""
+        with self._lock:
+            total = self.hits + self.misses
+            rate = self.hits / total if total else 0.0
+            return f"hits={self.hits}, misses={self.misses}, hit_rate={rate:.0%}"
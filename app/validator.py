@@ -2,17 +2,89 @@
 
 from __future__ import annotations
 
+import ast
+import hashlib
 import os
-import subprocess
+import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
-from .models import ValidationResult
+from .capture import DEFAULT_LIMIT, CapturedOutput, OutputCapture, run_captured, spill_path
+from .limits import ResourceLimits, kill_group
+from .logging_config import get_logger
+from .models import CheckUsage, ValidationResult
+from .tool_cache import MYPY_CONFIG, ToolCache
+from .validation_cache import ValidationCache
+from .warm_worker import WarmWorkerPool
+
+logger = get_logger("validator")
+_PRAGMA = re.compile(rb"#\s*pragma\b.*")
+_AST_LOCK = threading.Lock()
+
+PYTHON_SOURCES = ("app/**/*.py", "tests/**/*.py", "conftest.py")
+PYTEST_CONFIG = ("pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini", ".coveragerc", "requirements.txt")
+LINT_CONFIG = ("setup.cfg", "tox.ini", ".flake8")
+# Marks the syntax check that compiles sources in this process instead of running compileall.
+IN_MEMORY_COMPILE = "autodev-compile"
+# Lean profile: no entry-point plugin autoloading (pytest-cov is loaded by name) and no unused builtin plugins.
+# flake8 has no equivalent switch; it always imports every installed plugin.
+LEAN_ENV = {"PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"}
+LEAN_PYTEST_ARGS = ("-p", "no:cacheprovider", "-p", "no:pastebin", "-p", "no:junitxml", "-p", "no:doctest")
+
+
+@dataclass(slots=True, frozen=True)
+class CheckSpec:
+    """A validation command plus the project files its outcome depends on.
+
+    ``semantic`` checks fingerprint Python sources by their AST (plus any
+    ``# pragma`` comments) so whitespace and ``noqa`` edits from the
+    correction engine do not invalidate a previous passing result.
+    """
+
+    name: str
+    command: tuple[str, ...]
+    inputs: tuple[str, ...]
+    semantic: bool = False
 
 
 class Validator:
     """Runs syntax, lint, tests, and optional quality checks before commit."""
 
+    max_cached_results = 256
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 1,
+        fail_fast: bool = False,
+        cache: ValidationCache | None = None,
+        warm_pool: WarmWorkerPool | None = None,
+        artifacts_dir: Path | None = None,
+        capture_limit: int = DEFAULT_LIMIT,
+        limits: ResourceLimits | None = None,
+        tool_cache: ToolCache | None = None,
+        syntax_in_memory: bool = False,
+        lean: bool = False,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.fail_fast = fail_fast
+        self.cache = cache
+        self.warm_pool = warm_pool
+        self.artifacts_dir = artifacts_dir
+        self.capture_limit = capture_limit
+        self.limits = limits or ResourceLimits()
+        self.tool_cache = tool_cache
+        self.syntax_in_memory = syntax_in_memory
+        self.lean = lean
+        self._passed: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
     def run(
         self,
         project_root: Path,
@@ -23,38 +95,324 @@ class Validator:
         min_coverage: int = 85,
         strict_validation: bool = True,
     ) -> ValidationResult:
-        """Execute validation commands and collect status."""
+        """Execute validation commands and collect status.
+
+        A whole-tree hit in the persistent ``cache`` returns the stored result
+        without spawning anything. Otherwise, checks that passed on an earlier
+        call for the same project are reused when none of their input files
+        changed since then. The rest run on up to ``max_concurrency`` threads;
+        checks and logs are reported in plan order regardless of completion
+        order. Each check's output is kept to ``capture_limit`` bytes (head and
+        tail); longer output is spilled whole to ``artifacts_dir`` and listed in
+        ``ValidationResult.artifacts``. Every executed check runs in its own
+        process group under ``limits``; its CPU time, peak RSS and wall time
+        are reported in ``ValidationResult.resources``. With a ``tool_cache``
+        the tools keep bytecode and caches under it rather than in the project;
+        ``syntax_in_memory`` compiles sources in this process without writing
+        any bytecode, and ``lean`` runs pytest without plugin autoloading.
+        """
+        specs = self.plan_checks(
+            run_lint=run_lint,
+            run_type_check=run_type_check,
+            run_coverage=run_coverage,
+            min_coverage=min_coverage,
+            syntax_in_memory=self.syntax_in_memory,
+            lean=self.lean,
+        )
+        cache_key = None
+        if self.cache is not None:
+            patterns = tuple(dict.fromkeys(pattern for spec in specs for pattern in spec.inputs))
+            options = {
+                "commands": [list(spec.command) for spec in specs],
+                "strict_validation": strict_validation,
+            }
+            cache_key = self.cache.key_for(project_root, patterns, options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info("Validation cache hit for %s (%s)", project_root.name, self.cache.stats())
+                cached.reused = list(cached.checks)
+                return cached
+            logger.info("Validation cache miss for %s (%s)", project_root.name, self.cache.stats())
+
+        root_key = str(project_root.resolve())
+        outcomes: dict[str, _CheckOutcome] = {}
+        pending: list[tuple[CheckSpec, str]] = []
+        for spec in specs:
+            fingerprint = self.fingerprint(project_root, spec)
+            if self._reusable(root_key, spec.name, fingerprint):
+                logs = [f"$ {' '.join(spec.command)}", "(reused passing result; inputs unchanged)"]
+                outcomes[spec.name] = _CheckOutcome(passed=True, logs=logs, status="reused")
+            else:
+                pending.append((spec, fingerprint))
+
+        required = {spec.name for spec, _ in pending if strict_validation or spec.name != "lint"}
+        run = _CheckRun(
+            project_root,
+            fail_fast=self.fail_fast and strict_validation,
+            required=required,
+            warm_pool=self.warm_pool,
+            artifacts_dir=self.artifacts_dir,
+            capture_limit=self.capture_limit,
+            limits=self.limits,
+            tool_cache=self.tool_cache,
+            env=LEAN_ENV if self.lean else None,
+        )
+        if self.max_concurrency <= 1 or len(pending) <= 1:
+            for spec, _ in pending:
+                outcomes[spec.name] = run.execute(spec)
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(pending))) as executor:
+                futures = {spec.name: executor.submit(run.execute, spec) for spec, _ in pending}
+                for name, future in futures.items():
+                    outcomes[name] = future.result()
+        for spec, fingerprint in pending:
+            self._remember(root_key, spec.name, fingerprint if outcomes[spec.name].passed else None)
+
         checks: dict[str, bool] = {}
         logs: list[str] = []
+        result = ValidationResult(success=False, checks=checks, logs=logs)
+        for spec in specs:
+            outcome = outcomes[spec.name]
+            checks[spec.name] = outcome.passed
+            logs.extend(outcome.logs)
+            result.artifacts.update(outcome.artifacts)
+            if outcome.usage is not None:
+                result.resources[spec.name] = outcome.usage
+            getattr(result, outcome.status).append(spec.name)
+
+        result.success = all(checks.values())
+        if not strict_validation and "lint" in checks and not checks["lint"]:
+            result.success = all(value for key, value in checks.items() if key != "lint")
+        if cache_key is not None and result.success:
+            self.cache.put(cache_key, result)
+        return result
 
-        checks["syntax"] = self._run_command(["python", "-m", "compileall", "app"], project_root, logs)
+    @staticmethod
+    def plan_checks(
+        *,
+        run_lint: bool = True,
+        run_type_check: bool = False,
+        run_coverage: bool = True,
+        min_coverage: int = 85,
+        syntax_in_memory: bool = False,
+        lean: bool = False,
+    ) -> list[CheckSpec]:
+        """Return the ordered checks a run with these options executes."""
+        pytest = (sys.executable, "-m", "pytest", "-q", *(LEAN_PYTEST_ARGS if lean else ()))
+        syntax = (IN_MEMORY_COMPILE, "app") if syntax_in_memory else ("python", "-m", "compileall", "app")
+        specs = [CheckSpec("syntax", syntax, ("app/**/*.py",))]
         if run_lint:
-            checks["lint"] = self._run_command([sys.executable, "-m", "flake8", "app", "tests"], project_root, logs)
+            specs.append(
+                CheckSpec("lint", (sys.executable, "-m", "flake8", "app", "tests"), PYTHON_SOURCES + LINT_CONFIG)
+            )
         if run_coverage:
-            checks["coverage"] = self._run_command(
-                [sys.executable, "-m", "pytest", "-q", "--cov=app", f"--cov-fail-under={min_coverage}"], project_root, logs
+            specs.append(
+                CheckSpec(
+                    "coverage",
+                    (*pytest, *(("-p", "pytest_cov") if lean else ()), "--cov=app", f"--cov-fail-under={min_coverage}"),
+                    PYTHON_SOURCES + PYTEST_CONFIG,
+                    semantic=True,
+                )
             )
         else:
-            checks["tests"] = self._run_command([sys.executable, "-m", "pytest", "-q"], project_root, logs)
+            specs.append(
+                CheckSpec("tests", pytest, PYTHON_SOURCES + PYTEST_CONFIG, semantic=True)
+            )
         if run_type_check:
-            checks["typecheck"] = self._run_command([sys.executable, "-m", "mypy", "app"], project_root, logs)
-
-        success = all(checks.values())
-        if not strict_validation and "lint" in checks and not checks["lint"]:
-            success = all(value for key, value in checks.items() if key != "lint")
-        return ValidationResult(success=success, checks=checks, logs=logs)
+            specs.append(CheckSpec("typecheck", (sys.executable, "-m", "mypy", "app"), ("app/**/*.py",) + MYPY_CONFIG))
+        return specs
 
     @staticmethod
-    def _run_command(command: list[str], cwd: Path, logs: list[str]) -> bool:
-        logs.append(f"$ {' '.join(command)}")
+    def fingerprint(project_root: Path, spec: CheckSpec) -> str:
+        """Hash the command and every input file the check depends on."""
+        digest = hashlib.sha256("\0".join(spec.command).encode("utf-8"))
+        files: set[Path] = set()
+        for pattern in spec.inputs:
+            files.update(path for path in project_root.glob(pattern) if path.is_file())
+        for path in sorted(files):
+            data = path.read_bytes()
+            if spec.semantic and path.suffix == ".py":
+                data = _semantic_bytes(data)
+            digest.update(path.relative_to(project_root).as_posix().encode("utf-8"))
+            digest.update(b"\0")
+            digest.update(hashlib.sha256(data).digest())
+        return digest.hexdigest()
+
+    def _reusable(self, root_key: str, check: str, fingerprint: str) -> bool:
+        with self._lock:
+            if self._passed.get((root_key, check)) != fingerprint:
+                return False
+            self._passed.move_to_end((root_key, check))
+            return True
+
+    def _remember(self, root_key: str, check: str, fingerprint: str | None) -> None:
+        with self._lock:
+            if fingerprint is None:
+                self._passed.pop((root_key, check), None)
+                return
+            self._passed[(root_key, check)] = fingerprint
+            self._passed.move_to_end((root_key, check))
+            while len(self._passed) > self.max_cached_results:
+                self._passed.popitem(last=False)
+
+
+@dataclass(slots=True)
+class _CheckOutcome:
+    """Result of one check within a validation run."""
+
+    passed: bool
+    logs: list[str]
+    status: str = "executed"  # executed | reused | cancelled
+    artifacts: dict[str, str] = field(default_factory=dict)
+    usage: CheckUsage | None = None
+
+
+class _CheckRun:
+    """Processes of one validation run, tracked so fail-fast can kill them."""
+
+    def __init__(
+        self,
+        cwd: Path,
+        *,
+        fail_fast: bool,
+        required: set[str],
+        warm_pool: WarmWorkerPool | None = None,
+        artifacts_dir: Path | None = None,
+        capture_limit: int = DEFAULT_LIMIT,
+        limits: ResourceLimits | None = None,
+        tool_cache: ToolCache | None = None,
+        env: dict[str, str] | None = None,
+    ) -> None:
+        self.cwd = cwd
+        self.fail_fast = fail_fast
+        self.required = required
+        self.warm_pool = warm_pool
+        self.artifacts_dir = artifacts_dir
+        self.capture_limit = capture_limit
+        self.limits = limits or ResourceLimits()
+        self.tool_cache = tool_cache
+        self.env = {**os.environ, "PYTHONPATH": str(cwd), **(tool_cache.env(cwd) if tool_cache else {}), **(env or {})}
+        self.failed_check: str | None = None
+        self._killers: dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+
+    def execute(self, spec: CheckSpec) -> _CheckOutcome:
+        command = self.tool_cache.command(spec.command, self.cwd) if self.tool_cache else list(spec.command)
+        logs = [f"$ {' '.join(command)}"]
+        with self._lock:
+            if self.failed_check is not None:
+                logs.append(f"(cancelled: required check '{self.failed_check}' failed)")
+                return _CheckOutcome(passed=False, logs=logs, status="cancelled")
+        if command[0] == IN_MEMORY_COMPILE:
+            return self._compile_in_memory(spec.name, logs, command[1:])
+
+        stdout, stderr = self._capture(spec.name, "stdout"), self._capture(spec.name, "stderr")
+        if self.warm_pool is not None:
+            warm = self.warm_pool.run(
+                command,
+                self.cwd,
+                self.env,
+                on_start=lambda pid: self._track(spec.name, partial(kill_group, pid)),
+                stdout=stdout,
+                stderr=stderr,
+                limits=self.limits,
+            )
+            if warm is not None:
+                return self._finish(spec.name, logs, warm.returncode, stdout.result(), stderr.result(), warm.usage)
+
         try:
-            env = {**os.environ, "PYTHONPATH": str(cwd)}
-            result = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True, check=False)
+            completed = run_captured(
+                command,
+                cwd=self.cwd,
+                env=self.env,
+                stdout=stdout,
+                stderr=stderr,
+                limits=self.limits,
+                on_start=lambda process: self._track(spec.name, partial(kill_group, process.pid)),
+            )
         except FileNotFoundError:
             logs.append(f"Missing command: {command[0]}")
-            return False
-        if result.stdout:
-            logs.append(result.stdout.strip())
-        if result.stderr:
-            logs.append(result.stderr.strip())
-        return result.returncode == 0
+            self._on_failure(spec.name)
+            return _CheckOutcome(passed=False, logs=logs)
+        return self._finish(
+            spec.name, logs, completed.returncode, completed.stdout, completed.stderr, completed.usage
+        )
+
+    def _compile_in_memory(self, name: str, logs: list[str], targets: list[str]) -> _CheckOutcome:
+        """Syntax-check every module under ``targets`` with ``compile()``; nothing is written to disk."""
+        errors: list[str] = []
+        for target in targets:
+            for path in sorted((self.cwd / target).rglob("*.py")):
+                relative = path.relative_to(self.cwd).as_posix()
+                try:
+                    compile(path.read_bytes(), relative, "exec", dont_inherit=True)
+                except (SyntaxError, ValueError) as e:
+                    errors.append(f"*** Error compiling '{relative}'...\n{type(e).__name__}: {e}")
+        logs.extend(errors)
+        if errors:
+            self._on_failure(name)
+        return _CheckOutcome(passed=not errors, logs=logs)
+
+    def _capture(self, name: str, stream: str) -> OutputCapture:
+        spill = None
+        if self.artifacts_dir is not None:
+            spill = spill_path(self.artifacts_dir, f"{self.cwd.name}-{name}", stream)
+        return OutputCapture(self.capture_limit, spill)
+
+    def _track(self, name: str, kill: Callable[[], None]) -> None:
+        with self._lock:
+            if self.failed_check is not None:
+                kill()
+            else:
+                self._killers[name] = kill
+
+    def _finish(
+        self,
+        name: str,
+        logs: list[str],
+        returncode: int,
+        stdout: CapturedOutput,
+        stderr: CapturedOutput,
+        usage: CheckUsage | None = None,
+    ) -> _CheckOutcome:
+        with self._lock:
+            self._killers.pop(name, None)
+            cancelled = self.failed_check is not None and self.failed_check != name
+        if cancelled and returncode != 0:
+            logs.append(f"(cancelled: required check '{self.failed_check}' failed)")
+            return _CheckOutcome(passed=False, logs=logs, status="cancelled", usage=usage)
+        artifacts: dict[str, str] = {}
+        for stream, output in (("stdout", stdout), ("stderr", stderr)):
+            if output.text:
+                logs.append(output.text.strip())
+            if output.artifact is not None:
+                artifacts[f"{name}.{stream}"] = str(output.artifact)
+        if usage is not None and usage.limit_hit is not None:
+            logs.append(self.limits.describe(usage.limit_hit))
+            logger.warning("Check %s in %s stopped: %s", name, self.cwd.name, self.limits.describe(usage.limit_hit))
+        if returncode != 0:
+            self._on_failure(name)
+        return _CheckOutcome(passed=returncode == 0, logs=logs, artifacts=artifacts, usage=usage)
+
+    def _on_failure(self, name: str) -> None:
+        """Kill still-running checks once a required one fails in fail-fast mode."""
+        if not self.fail_fast or name not in self.required:
+            return
+        with self._lock:
+            if self.failed_check is not None:
+                return
+            self.failed_check = name
+            for kill in self._killers.values():
+                kill()
+
+
+def _semantic_bytes(source: bytes) -> bytes:
+    """Behaviour-relevant view of a module: its AST dump plus coverage pragmas."""
+    # CPython 3.11's AST constructor is not thread-safe (gh-106905); pipeline workers fingerprint concurrently.
+    with _AST_LOCK:
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return source
+        dump = ast.dump(tree)
+    return dump.encode("utf-8") + b"\0" + b"\n".join(_PRAGMA.findall(source))
@@ -0,0 +1,292 @@
+"""Warm in-process execution of ``python -m <tool>`` validation checks."""
+
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import queue
+import runpy
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Callable
+
+from .capture import OutputCapture
+from .limits import ResourceLimits, kill_group, wait_with_usage
+from .logging_config import get_logger
+from .models import CheckUsage
+
+logger = get_logger("warm_worker")
+
+PRELOAD_MODULES = (
+    "compileall",
+    "pytest",
+    "_pytest.config",
+    "pytest_cov.plugin",
+    "coverage",
+    "flake8.main.cli",
+    "mypy.main",
+)
+ISOLATED_PACKAGES = ("app", "tests", "conftest")
+PYTHON_NAMES = {"python", "python3"}
+
+
+@dataclass(slots=True)
+class WarmResult:
+    """Outcome of one check executed by a warm worker."""
+
+    returncode: int
+    stdout: str
+    stderr: str
+    usage: CheckUsage | None = None
+
+
+class WarmWorkerPool:
+    """Long-lived processes with the validation tools already imported.
+
+    Each server process imports flake8, pytest, coverage and friends once,
+    then forks a fresh child per check. The child drops any previously
+    imported project packages, switches to the project directory and runs the
+    tool through ``runpy`` exactly as ``python -m`` would, so module state never
+    leaks between projects while interpreter startup and tool imports are paid
+    once per server. ``run`` returns ``None`` whenever the pool cannot serve a
+    command (unsupported platform, non ``-m`` command, or a crashed worker) so
+    callers can fall back to a regular subprocess.
+    """
+
+    def __init__(self, size: int = 1, preload: tuple[str, ...] = PRELOAD_MODULES) -> None:
+        self.size = max(1, size)
+        self.preload = preload
+        self._idle: queue.Queue[_Server] = queue.Queue()
+        self._started = False
+        self._disabled = not hasattr(os, "fork")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supports(command: list[str]) -> bool:
+        """Whether ``command`` is a ``python -m module ...`` invocation."""
+        if len(command) < 3 or command[1] != "-m":
+            return False
+        return command[0] == sys.executable or Path(command[0]).name in PYTHON_NAMES
+
+    def run(
+        self,
+        command: list[str],
+        cwd: Path,
+        env: dict[str, str],
+        on_start: Callable[[int], None] | None = None,
+        stdout: OutputCapture | None = None,
+        stderr: OutputCapture | None = None,
+        limits: ResourceLimits | None = None,
+    ) -> WarmResult | None:
+        """Execute ``command`` in a forked warm child, or return ``None`` to request a fallback.
+
+        The child's output is streamed into ``stdout``/``stderr`` captures (bounded
+        by their limit) rather than read whole; the result carries their text.
+        The child runs under ``limits`` in its own process group, which is
+        killed once ``limits.wall_seconds`` elapses.
+        """
+        if self._disabled or not self.supports(command) or not self._ensure_started():
+            return None
+
+        server = self._idle.get()
+        try:
+            return server.execute(
+                command[2],
+                command[3:],
+                cwd,
+                env,
+                on_start,
+                stdout or OutputCapture(),
+                stderr or OutputCapture(),
+                limits or ResourceLimits(),
+            )
+        except (EOFError, OSError) as e:
+            logger.warning(f"Warm worker crashed ({type(e).__name__}: {e}); falling back to subprocess")
+            server.close()
+            server = _Server.start(self.preload)
+            return None
+        finally:
+            self._idle.put(server)
+
+    def close(self) -> None:
+        """Stop every server process."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._started = False
+
+    def _ensure_started(self) -> bool:
+        with self._lock:
+            if self._started or self._disabled:
+                return self._started
+            try:
+                for _ in range(self.size):
+                    self._idle.put(_Server.start(self.preload))
+            except (AssertionError, OSError) as e:
+                # Daemonic processes (e.g. process-pool workers) may not spawn children.
+                logger.warning(f"Warm worker pool unavailable ({e}); using subprocesses")
+                self._disabled = True
+                return False
+            self._started = True
+            return True
+
+
+class _Server:
+    """Parent-side handle for one warm server process."""
+
+    def __init__(self, process: multiprocessing.process.BaseProcess, conn: Connection) -> None:
+        self.process = process
+        self.conn = conn
+
+    @classmethod
+    def start(cls, preload: tuple[str, ...]) -> _Server:
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(target=_serve, args=(child_conn, preload), name="autodev-warm-worker", daemon=True)
+        process.start()
+        child_conn.close()
+        return cls(process, parent_conn)
+
+    def execute(
+        self,
+        module: str,
+        args: list[str],
+        cwd: Path,
+        env: dict[str, str],
+        on_start: Callable[[int], None] | None,
+        stdout: OutputCapture,
+        stderr: OutputCapture,
+        limits: ResourceLimits,
+    ) -> WarmResult | None:
+        fd_out, stdout_path = tempfile.mkstemp(prefix="autodev-warm-", suffix=".out")
+        fd_err, stderr_path = tempfile.mkstemp(prefix="autodev-warm-", suffix=".err")
+        os.close(fd_out)
+        os.close(fd_err)
+        try:
+            self.conn.send((module, args, str(cwd), env, stdout_path, stderr_path, limits))
+            _, pid = self.conn.recv()
+            if on_start is not None:
+                on_start(pid)
+            timed_out = not self.conn.poll(limits.wall_seconds)
+            if timed_out:
+                kill_group(pid)
+            _, returncode, usage = self.conn.recv()
+            if usage is not None:
+                usage.limit_hit = limits.limit_hit(returncode, usage, timed_out=timed_out)
+            limit_hit = usage.limit_hit if usage is not None else None
+            # A budget overrun is the check's own result; rerunning it as a subprocess would spend the budget twice.
+            if returncode < 0 and returncode != -signal.SIGKILL and limit_hit is None:
+                logger.warning(f"Warm child for {module} died with signal {-returncode}; falling back to subprocess")
+                return None
+            stdout.feed_file(Path(stdout_path))
+            stderr.feed_file(Path(stderr_path))
+        finally:
+            os.unlink(stdout_path)
+            os.unlink(stderr_path)
+        return WarmResult(returncode=returncode, stdout=stdout.result().text, stderr=stderr.result().text, usage=usage)
+
+    def close(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+def _serve(conn: Connection, preload: tuple[str, ...]) -> None:
+    """Server loop: import tools once, then fork one child per request."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                conn.close()
+                code = _run_child(*request)
+            finally:
+                os._exit(code)
+        # Also set in the child; doing it here too means the group exists before anyone is told the pid.
+        with suppress(OSError):
+            os.setpgid(pid, pid)
+        conn.send(("started", pid))
+        started = time.monotonic()
+        returncode, usage = wait_with_usage(pid)
+        if usage is not None:
+            usage.wall_seconds = round(time.monotonic() - started, 3)
+        conn.send(("finished", returncode, usage))
+
+
+def _run_child(
+    module: str,
+    args: list[str],
+    cwd: str,
+    env: dict[str, str],
+    stdout_path: str,
+    stderr_path: str,
+    limits: ResourceLimits,
+) -> int:
+    """Inside the forked child: isolate state and run ``python -m module args``."""
+    limits.enter()
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(os.open(stdout_path, os.O_WRONLY | os.O_TRUNC), 1)
+    os.dup2(os.open(stderr_path, os.O_WRONLY | os.O_TRUNC), 2)
+
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    # The server read these at startup; follow the check's values instead.
+    sys.pycache_prefix = env.get("PYTHONPYCACHEPREFIX") or None
+    sys.dont_write_bytecode = bool(env.get("PYTHONDONTWRITEBYTECODE"))
+    for name in list(sys.modules):
+        if name.split(".", 1)[0] in ISOLATED_PACKAGES:
+            del sys.modules[name]
+    extra = [entry for entry in env.get("PYTHONPATH", "").split(os.pathsep) if entry]
+    sys.path[:] = [cwd, *extra, *sys.path[1:]]
+    sys.argv = [module, *args]
+    importlib.invalidate_caches()
+
+    code = 0
+    try:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)
+    except SystemExit as exc:
+        if exc.code is None:
+            code = 0
+        elif isinstance(exc.code, int):
+            code = exc.code
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return code
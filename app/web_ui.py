@@ -4,28 +4,150 @@ from __future__ import annotations
 
 import asyncio
 import json
-import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any, Callable, TypeVar
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 from app.config import AgentConfig
-from app.health import HealthChecker
-from app.logging_config import configure_logging, get_logger
+from app.events import EventFanout, EventLogHandler, SharedEventBus
+from app.health import HealthChecker, HealthSampler
+from app.jobs import JobSupervisor
+from app.log_reader import SOURCES, LogIndex, tail_lines
+from app.logging_config import add_log_handler, configure_logging, get_logger
 from app.memory import MemoryStore
-from app.orchestrator import AutoDevOrchestrator
 
-configure_logging()
+configure_logging(json_format=AgentConfig.from_env().log_format == "json")
 logger = get_logger("web_ui")
 
+SSE_KEEPALIVE_SECONDS = 15.0
+# Events published by other server processes are only visible by polling the shared feed.
+SSE_POLL_SECONDS = 1.0
+# Log lines reach the shared feed in batches, one write per interval instead of one per line.
+LOG_EVENT_FLUSH_SECONDS = 0.5
+LOG_DIR = Path("logs")
+
+T = TypeVar("T")
+
 app = FastAPI(title="AutoDev Agent UI", version="1.0.0")
 
-# Global state
-current_run = {"running": False, "project": None, "logs": []}
+# Every handler's blocking work (SQLite, file reads, health probes) runs here, never on the event loop.
+_blocking_pool = ThreadPoolExecutor(max_workers=AgentConfig.from_env().web_threads, thread_name_prefix="autodev-web")
+
+# Run state is kept in the WAL-mode memory database rather than in this process,
+# so every server worker (e.g. under gunicorn) answers from the same view.
+_memory: MemoryStore | None = None
+_events: SharedEventBus | None = None
+_event_fanout: EventFanout | None = None
+_health_sampler: HealthSampler | None = None
+_job_supervisor: JobSupervisor | None = None
+_log_index: LogIndex | None = None
+
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run ``func`` on the bounded handler pool."""
+    return await asyncio.get_running_loop().run_in_executor(_blocking_pool, partial(func, *args))
+
+
+def get_memory() -> MemoryStore:
+    """Shared store for request handlers; its WAL readers never block the orchestrator."""
+    global _memory
+    if _memory is None:
+        config = AgentConfig()
+        config.ensure_dirs()
+        _memory = MemoryStore(config.memory_db_path)
+    return _memory
+
+
+def get_events() -> SharedEventBus:
+    """Live feed for /api/events: logs, stage transitions and job state of every server process."""
+    global _events
+    if _events is None:
+        _events = SharedEventBus(get_memory())
+        add_log_handler(EventLogHandler(_events, flush_seconds=LOG_EVENT_FLUSH_SECONDS))
+    return _events
+
+
+def get_event_fanout() -> EventFanout:
+    """Single reader of the shared feed for every /api/events client of this process."""
+    global _event_fanout
+    if _event_fanout is None:
+        _event_fanout = EventFanout(get_events(), poll_seconds=SSE_POLL_SECONDS, executor=_blocking_pool)
+    return _event_fanout
+
+
+def ui_log(line: str) -> None:
+    """Record a run log line for /api/status and push it to event subscribers."""
+    get_events().publish("run_log", message=line)
+
+
+def get_log_index() -> LogIndex:
+    """Byte-offset index over ``logs/``, persisted in ``state/log_index.db``."""
+    global _log_index
+    if _log_index is None:
+        _log_index = LogIndex(LOG_DIR, AgentConfig().memory_db_path.parent / "log_index.db")
+    return _log_index
+
+
+def get_health_sampler() -> HealthSampler:
+    """Shared background health sampler; polling clients read its cached result."""
+    global _health_sampler
+    if _health_sampler is None:
+        config = AgentConfig.from_env()
+        config.ensure_dirs()
+        _health_sampler = HealthSampler(
+            HealthChecker(config.memory_db_path, config.workspace_root),
+            interval_seconds=config.health_interval_seconds,
+            ttl_seconds=config.health_ttl_seconds,
+            history_size=config.health_history_size,
+        )
+        _health_sampler.start()
+    return _health_sampler
+
+
+def get_job_supervisor() -> JobSupervisor:
+    """Job supervisor of this process; one per database leads and runs jobs on ``AUTODEV_JOB_WORKERS`` processes."""
+    global _job_supervisor
+    if _job_supervisor is None:
+        config = AgentConfig.from_env()
+        config.ensure_dirs()
+        _job_supervisor = JobSupervisor(
+            get_memory(),
+            config,
+            workers=config.job_workers,
+            events=get_events(),
+            lock_file=config.memory_db_path.parent / "job_supervisor.lock",
+        )
+        _job_supervisor.start()
+    return _job_supervisor
+
+
+@app.on_event("startup")
+def start_job_supervisor() -> None:
+    """Resume jobs queued before the server (re)started."""
+    get_job_supervisor()
+
+
+@app.on_event("shutdown")
+def stop_health_sampler() -> None:
+    """Stop background health sampling."""
+    if _health_sampler is not None:
+        _health_sampler.stop()
+
+
+@app.on_event("shutdown")
+def stop_job_supervisor() -> None:
+    """Stop job workers; their jobs are requeued for the next start."""
+    if _job_supervisor is not None:
+        _job_supervisor.stop()
+    _blocking_pool.shutdown(wait=False)
 
 
 class TaskRequest(BaseModel):
@@ -39,6 +161,20 @@ class TaskRequest(BaseModel):
     run_typecheck: bool = False
     run_coverage: bool = True
     strict_validation: bool = True
+    priority: int = 0
+
+    def overrides(self) -> dict:
+        """``AgentConfig`` fields set by this request."""
+        return {
+            "min_complexity": self.min_complexity,
+            "max_complexity": self.max_complexity,
+            "max_retries": self.max_retries,
+            "min_test_coverage": self.min_coverage,
+            "run_lint": self.run_lint,
+            "run_type_check": self.run_typecheck,
+            "run_coverage": self.run_coverage,
+            "strict_validation": self.strict_validation,
+        }
 
 
 class StatusResponse(BaseModel):
@@ -49,6 +185,7 @@ class StatusResponse(BaseModel):
     current_project: str | None
     recent_logs: list[str]
     health: dict
+    jobs: dict[str, int]
 
 
 class ProjectInfo(BaseModel):
@@ -59,122 +196,112 @@ class ProjectInfo(BaseModel):
     complexity: int
 
 
-def run_orchestrator_task(config: AgentConfig) -> None:
-    """Run orchestrator in background."""
-    try:
-        current_run["running"] = True
-        logger.info("Starting orchestration from web UI")
-
-        orchestrator = AutoDevOrchestrator(config)
-        success = orchestrator.run_once()
-
-        current_run["running"] = False
-        if success:
-            current_run["logs"].append("[SUCCESS] Project generated and validated")
-        else:
-            current_run["logs"].append("[FAILED] Project validation failed")
-
-    except Exception as e:
-        current_run["running"] = False
-        current_run["logs"].append(f"[ERROR] {type(e).__name__}: {e}")
-        logger.error(f"Orchestrator error: {e}", exc_info=True)
-
-
 @app.get("/", response_class=HTMLResponse)
 async def get_ui() -> str:
     """Serve the web UI."""
     return HTML_CONTENT
 
 
+def _health() -> dict:
+    return get_health_sampler().latest().to_dict()
+
+
+def _health_history() -> list[dict]:
+    return [sample.to_dict() for sample in get_health_sampler().history()]
+
+
 @app.get("/api/health")
 async def get_health() -> dict:
-    """Get system health status."""
-    config = AgentConfig()
-    config.ensure_dirs()
-    checker = HealthChecker(config.memory_db_path, config.workspace_root)
-    health = checker.check()
+    """Get system health status from the sampler's cache."""
+    return await run_blocking(_health)
 
-    return {
-        "status": health.status,
-        "checks": health.checks,
-        "timestamp": health.timestamp,
-    }
 
+@app.get("/api/health/history")
+async def get_health_history() -> list[dict]:
+    """Recent health samples for trend charts: disk free, DB size and probe latency."""
+    return await run_blocking(_health_history)
 
-@app.get("/api/status")
-async def get_status() -> StatusResponse:
-    """Get current status."""
-    health = await get_health()
 
+def _status() -> StatusResponse:
+    memory = get_memory()
+    running = memory.list_jobs("running")
     return StatusResponse(
-        status="running" if current_run["running"] else "idle",
-        running=current_run["running"],
-        current_project=current_run["project"],
-        recent_logs=current_run["logs"][-50:],  # Last 50 logs
-        health=health,
+        status="running" if running else "idle",
+        running=bool(running),
+        current_project=running[0].project if running else None,
+        recent_logs=[event.data["message"] for event in get_events().recent("run_log", 50)],  # Last 50 logs
+        health=_health(),
+        jobs=memory.job_counts(),
     )
 
 
-@app.post("/api/run")
-async def run_task(request: TaskRequest, background_tasks: BackgroundTasks) -> dict:
-    """Start a new orchestration task."""
+@app.get("/api/status")
+async def get_status() -> StatusResponse:
+    """Get current status."""
+    return await run_blocking(_status)
 
-    if current_run["running"]:
-        raise HTTPException(status_code=409, detail="Already running a task")
 
-    # Create config from request
-    config = AgentConfig()
-    config.min_complexity = request.min_complexity
-    config.max_complexity = request.max_complexity
-    config.max_retries = request.max_retries
-    config.min_test_coverage = request.min_coverage
-    config.run_lint = request.run_lint
-    config.run_type_check = request.run_typecheck
-    config.run_coverage = request.run_coverage
-    config.strict_validation = request.strict_validation
+def _queue_job(request: TaskRequest) -> int:
+    job_id = get_job_supervisor().submit(request.overrides(), request.priority)
+    ui_log(f"[INFO] Job {job_id} queued at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    ui_log(f"[CONFIG] Complexity: {request.min_complexity}-{request.max_complexity}")
+    ui_log(f"[CONFIG] Retries: {request.max_retries}, Coverage: {request.min_coverage}%")
+    return job_id
 
-    # Reset logs
-    current_run["logs"] = []
-    current_run["logs"].append(f"[INFO] Task started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    current_run["logs"].append(f"[CONFIG] Complexity: {request.min_complexity}-{request.max_complexity}")
-    current_run["logs"].append(f"[CONFIG] Retries: {request.max_retries}, Coverage: {request.min_coverage}%")
-    current_run["logs"].append("[INFO] Initializing agent...")
 
-    # Run in background
-    background_tasks.add_task(run_orchestrator_task, config)
+@app.post("/api/run")
+async def run_task(request: TaskRequest) -> dict:
+    """Queue a new orchestration task; it starts as soon as a job worker is free."""
+    job_id = await run_blocking(_queue_job, request)
+    return {"success": True, "message": "Task queued", "job_id": job_id}
 
-    return {"success": True, "message": "Task started"}
 
+@app.get("/api/jobs")
+async def list_jobs(state: str | None = None, limit: int = 50) -> list[dict]:
+    """Most recent jobs first, optionally filtered by state."""
+    jobs = await run_blocking(get_memory().list_jobs, state, max(1, min(limit, 500)))
+    return [asdict(job) for job in jobs]
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: int) -> dict:
+    """Inspect one job."""
+    job = await run_blocking(get_memory().get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return asdict(job)
 
-@app.get("/api/projects")
-async def get_projects() -> list[ProjectInfo]:
-    """Get all generated projects."""
-    try:
-        config = AgentConfig()
-        memory = MemoryStore(config.memory_db_path)
-        projects = memory.list_project_names()
 
-        # Get project details from database
-        import sqlite3
+@app.post("/api/jobs/{job_id}/cancel")
+async def cancel_job(job_id: int) -> dict:
+    """Cancel a queued job or stop a running one."""
+    job = await run_blocking(get_job_supervisor().cancel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.state not in ("queued", "running", "cancelled"):
+        raise HTTPException(status_code=409, detail=f"Job already {job.state}")
+    await run_blocking(ui_log, f"[INFO] Cancel requested for job {job_id}")
+    return asdict(job)
 
-        conn = sqlite3.connect(config.memory_db_path)
-        cursor = conn.execute("SELECT name, category, complexity FROM projects")
-        rows = cursor.fetchall()
-        conn.close()
 
+def _projects() -> list[ProjectInfo]:
+    try:
+        rows = get_memory().list_projects()
         return [ProjectInfo(name=row[0], category=row[1], complexity=row[2]) for row in rows]
     except Exception as e:
         logger.error(f"Error fetching projects: {e}")
         return []
 
 
-@app.get("/api/project/{project_name}")
-async def get_project_details(project_name: str) -> dict:
-    """Get details of a specific project."""
-    project_dir = Path("generated_projects") / project_name
+@app.get("/api/projects")
+async def get_projects() -> list[ProjectInfo]:
+    """Get all generated projects."""
+    return await run_blocking(_projects)
+
 
+def _project_details(project_dir: Path) -> dict | None:
     if not project_dir.exists():
-        raise HTTPException(status_code=404, detail="Project not found")
+        return None
 
     # Read README
     readme_content = ""
@@ -186,39 +313,150 @@ async def get_project_details(project_name: str) -> dict:
     validation_log = []
     log_path = project_dir / "validation_log.jsonl"
     if log_path.exists():
-        for line in log_path.read_text().strip().split("\n"):
-            if line:
-                validation_log.append(json.loads(line))
+        with log_path.open(encoding="utf-8") as handle:
+            validation_log = [json.loads(line) for line in handle if line.strip()]
 
     return {
-        "name": project_name,
+        "name": project_dir.name,
         "readme": readme_content,
         "validation_history": validation_log,
         "path": str(project_dir),
     }
 
 
+@app.get("/api/project/{project_name}")
+async def get_project_details(project_name: str) -> dict:
+    """Get details of a specific project."""
+    details = await run_blocking(_project_details, Path("generated_projects") / project_name)
+    if details is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return details
+
+
 @app.get("/api/logs")
-async def get_logs() -> dict:
-    """Get application logs."""
-    logs_dir = Path("logs")
+async def get_logs(
+    since: str | None = None,
+    level: str | None = None,
+    logger_name: str | None = Query(None, alias="logger"),
+    limit: int = 100,
+    cursor: int | None = None,
+    source: str = "main",
+) -> dict:
+    """Query indexed log records; without ``cursor`` or ``since`` the newest ones are returned.
+
+    ``level`` is a minimum severity and ``logger`` also matches child loggers.
+    Pass ``next_cursor`` back as ``cursor`` for the next page or for records
+    written since.
+    """
+    try:
+        page = await run_blocking(
+            partial(
+                get_log_index().query,
+                source,
+                since=since,
+                level=level,
+                logger=logger_name,
+                limit=max(1, min(limit, 1000)),
+                cursor=cursor,
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {
+        "entries": [entry.to_dict() for entry in page.entries],
+        "next_cursor": page.next_cursor,
+        "has_more": page.has_more,
+    }
+
+
+def _tail(lines: int) -> dict:
     logs_content = {}
+    for key, name in SOURCES.items():
+        if (LOG_DIR / name).exists():
+            logs_content[key] = "\n".join(tail_lines(LOG_DIR / name, lines))
+    return logs_content
+
 
-    if (logs_dir / "autodev.log").exists():
-        logs_content["main"] = (logs_dir / "autodev.log").read_text()[-2000:]  # Last 2KB
+@app.get("/api/logs/tail")
+async def get_log_tail(lines: int = 50) -> dict:
+    """Last ``lines`` raw lines of the main and error logs."""
+    return await run_blocking(_tail, max(1, min(lines, 1000)))
+
+
+@app.get("/api/events")
+async def stream_events(request: Request, since: int | None = None) -> StreamingResponse:
+    """Stream logs, stage transitions and job state as Server-Sent Events.
+
+    Resumes after ``since`` or the ``Last-Event-ID`` header; when those events
+    have already left the shared feed a ``reset`` event is sent first so the
+    client re-fetches ``/api/status``.
+    """
+    events = get_events()
+    header = request.headers.get("last-event-id", "")
+    if since is not None:
+        last_id = since
+    elif header.isdigit():
+        last_id = int(header)
+    else:
+        last_id = await run_blocking(lambda: events.last_id)
+    queue = await get_event_fanout().subscribe()
+
+    async def catch_up():
+        """Events after ``last_id`` read straight from the feed, preceded by ``reset`` if some were evicted."""
+        nonlocal last_id
+        while True:
+            pending, missed = await run_blocking(events.since, last_id)
+            if missed:
+                yield f"event: reset\ndata: {json.dumps({'last_id': last_id})}\n\n"
+            if not pending:
+                return
+            for event in pending:
+                yield event.to_sse()
+                last_id = event.id
+
+    async def stream():
+        nonlocal last_id
+        try:
+            yield "retry: 3000\n\n"
+            async for frame in catch_up():
+                yield frame
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None or event.id > last_id + 1:
+                    # Dropped by a full queue or published before we subscribed: read the gap from the feed.
+                    async for frame in catch_up():
+                        yield frame
+                elif event.id == last_id + 1:
+                    yield event.to_sse()
+                    last_id = event.id
+        finally:
+            get_event_fanout().unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-    if (logs_dir / "errors.log").exists():
-        logs_content["errors"] = (logs_dir / "errors.log").read_text()[-2000:]
 
-    return logs_content
+def _stop_running() -> list[int]:
+    supervisor = get_job_supervisor()
+    running = [job.id for job in get_memory().list_jobs("running")]
+    for job_id in running:
+        supervisor.cancel(job_id)
+    if running:
+        ui_log(f"[INFO] Stop requested by user for job(s) {', '.join(map(str, running))}")
+    return running
 
 
 @app.post("/api/stop")
 async def stop_task() -> dict:
-    """Stop running task (graceful stop)."""
-    if current_run["running"]:
-        current_run["logs"].append("[INFO] Stop requested by user")
-        return {"success": True, "message": "Task will stop gracefully"}
+    """Cancel every running job; queued jobs stay queued."""
+    running = await run_blocking(_stop_running)
+    if running:
+        return {"success": True, "message": f"Cancelling {len(running)} running job(s)"}
     return {"success": False, "message": "No task running"}
 
 
@@ -674,49 +912,75 @@ HTML_CONTENT = """
     </div>
 
     <script>
-        // Auto-refresh status every 2 seconds
-        setInterval(updateStatus, 2000);
+        // Logs and run status are pushed over /api/events; health and projects change slowly.
+        setInterval(updateStatus, 30000);
+        updateStatus(true);
+
+        const stream = new EventSource('/api/events');
+        stream.addEventListener('run_log', e => appendLog(JSON.parse(e.data).message));
+        stream.addEventListener('log', e => {
+            const data = JSON.parse(e.data);
+            appendLog(`[${data.level}] ${data.message}`);
+        });
+        stream.addEventListener('stage', e => {
+            const data = JSON.parse(e.data);
+            appendLog(data.project ? `[STAGE] ${data.project}: ${data.stage}` : `[STAGE] ${data.stage}`);
+        });
+        stream.addEventListener('status', () => updateStatus());
+        stream.addEventListener('complete', () => updateStatus());
+        stream.addEventListener('job', e => {
+            const data = JSON.parse(e.data);
+            appendLog(`[JOB] #${data.id} ${data.state}${data.project ? ': ' + data.project : ''}`);
+            updateStatus();
+        });
+        stream.addEventListener('reset', () => updateStatus(true));
+
+        function logClass(log) {
+            if (log.includes('[SUCCESS]')) return 'log-success';
+            if (log.includes('[ERROR]')) return 'log-error';
+            if (log.includes('[WARNING]')) return 'log-warning';
+            if (log.includes('[CONFIG]')) return 'log-config';
+            return 'log-info';
+        }
 
-        // Update on page load
-        updateStatus();
+        function appendLog(log) {
+            const logsDiv = document.getElementById('logs');
+            logsDiv.insertAdjacentHTML('beforeend', `<div class="log-line ${logClass(log)}">${escapeHtml(log)}</div>`);
+            logsDiv.scrollTop = logsDiv.scrollHeight;
+        }
 
-        async function updateStatus() {
+        async function updateStatus(reloadLogs = false) {
             try {
                 const response = await fetch('/api/status');
                 const status = await response.json();
 
                 // Update execution status
                 const execStatus = document.getElementById('exec-status');
+                const queued = status.jobs.queued ? `, ${status.jobs.queued} queued` : '';
                 if (status.running) {
-                    execStatus.innerHTML = '<span class="spinner"></span>Task Running...';
+                    execStatus.innerHTML = `<span class="spinner"></span>${status.jobs.running} running${queued}`;
                 } else {
-                    execStatus.textContent = 'Ready';
+                    execStatus.textContent = status.jobs.queued ? `Waiting${queued}` : 'Ready';
                 }
 
-                // Update logs
-                const logsDiv = document.getElementById('logs');
-                logsDiv.innerHTML = status.recent_logs
-                    .map(log => {
-                        let className = 'log-info';
-                        if (log.includes('[SUCCESS]')) className = 'log-success';
-                        else if (log.includes('[ERROR]')) className = 'log-error';
-                        else if (log.includes('[WARNING]')) className = 'log-warning';
-                        else if (log.includes('[CONFIG]')) className = 'log-config';
-                        return `<div class="log-line ${className}">${escapeHtml(log)}</div>`;
-                    })
-                    .join('');
-                logsDiv.scrollTop = logsDiv.scrollHeight;
+                // Replace logs only on load or after missing events; otherwise they stream in
+                if (reloadLogs) {
+                    const logsDiv = document.getElementById('logs');
+                    logsDiv.innerHTML = status.recent_logs
+                        .map(log => `<div class="log-line ${logClass(log)}">${escapeHtml(log)}</div>`)
+                        .join('');
+                    logsDiv.scrollTop = logsDiv.scrollHeight;
+                }
 
-                // Update health
-                const healthResponse = await fetch('/api/health');
-                const health = await healthResponse.json();
+                // Update health (sampled server-side; /api/status already carries the cached result)
+                const health = status.health;
 
                 const healthDiv = document.getElementById('health-status');
                 healthDiv.innerHTML = Object.entries(health.checks)
                     .map(([key, value]) => `
                         <div class="health-item ${value !== 'ok' ? 'fail' : ''}">
                             <div class="health-item-label">${key}</div>
-                            <div class="health-item-value">${value}</div>
+                            <div class="health-item-value">${value} &middot; ${(health.probe_ms[key] || 0).toFixed(1)} ms</div>
                         </div>
                     `)
                     .join('');
@@ -725,9 +989,6 @@ HTML_CONTENT = """
                 badge.textContent = health.status.toUpperCase();
                 badge.className = `status-badge ${health.status}`;
 
-                // Toggle run button
-                document.getElementById('run-btn').disabled = status.running;
-
                 // Update projects
                 const projectsResponse = await fetch('/api/projects');
                 const projects = await projectsResponse.json();
@@ -776,7 +1037,7 @@ HTML_CONTENT = """
                 });
 
                 if (response.ok) {
-                    showAlert('Task started!', 'success');
+                    showAlert('Task queued!', 'success');
                     updateStatus();
                 } else {
                     const error = await response.json();
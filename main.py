@@ -4,18 +4,19 @@ import argparse
 import json
 import os
 import re
+import shutil
 import signal
-import subprocess
 import sys
+import tempfile
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Callable
 
+from app.capture import run_captured
 from app.config import AgentConfig
-from app.health import HealthChecker
-from app.logging_config import configure_logging, get_logger
-from app.orchestrator import AutoDevOrchestrator
+from app.logging_config import configure_logging, flush_logging, get_logger
 
 logger = get_logger("main")
 HISTORY_FILE = Path("state/cli_history.jsonl")
@@ -68,10 +69,21 @@ class CliSessionState:
     llm_model: str | None = None
 
 
-def setup_signal_handlers() -> None:
-    """Setup graceful shutdown handlers."""
+def setup_signal_handlers(drain: Callable[[], None] | None = None) -> None:
+    """Setup graceful shutdown handlers.
+
+    When ``drain`` is given the first signal asks the running loop to finish
+    its current cycle and stop; a second signal exits immediately.
+    """
+    draining = False
 
     def signal_handler(signum: int, frame: object) -> None:
+        nonlocal draining
+        if drain is not None and not draining:
+            draining = True
+            logger.info(f"Received signal {signum}, draining current cycle before shutdown...")
+            drain()
+            return
         logger.info(f"Received signal {signum}, initiating graceful shutdown...")
         sys.exit(0)
 
@@ -80,9 +92,18 @@ def setup_signal_handlers() -> None:
 
 
 def run_orchestrator_cycle(
-    config: AgentConfig, *, auto_git: bool | None = None, auto_pr: bool | None = None
+    config: AgentConfig,
+    *,
+    auto_git: bool | None = None,
+    auto_pr: bool | None = None,
+    batch: int = 1,
+    workers: int = 1,
+    pipeline: bool = False,
 ) -> int:
-    """Run one autonomous development cycle."""
+    """Run one autonomous development cycle, or a batch of them."""
+    from app.health import HealthChecker
+    from app.orchestrator import AutoDevOrchestrator
+
     if auto_git is not None:
         config.auto_git = auto_git
     if auto_pr is not None:
@@ -97,7 +118,17 @@ def run_orchestrator_cycle(
 
     try:
         orchestrator = AutoDevOrchestrator(config)
-        success = orchestrator.run_once()
+        try:
+            if pipeline:
+                records = orchestrator.run_pipeline(batch, validation_workers=workers)
+                success = bool(records) and all(record.success for record in records)
+            elif batch > 1:
+                records = orchestrator.run_batch(batch, workers=workers)
+                success = bool(records) and all(record.success for record in records)
+            else:
+                success = orchestrator.run_once()
+        finally:
+            orchestrator.close(drain_timeout=config.pr_drain_seconds)
         if success:
             logger.info("Orchestration cycle completed successfully")
             return 0
@@ -109,6 +140,219 @@ def run_orchestrator_cycle(
         return 1
 
 
+def run_daemon(
+    config: AgentConfig,
+    *,
+    interval_seconds: float,
+    jitter_seconds: float = 0.0,
+    max_cycles: int | None = None,
+    auto_git: bool | None = None,
+    auto_pr: bool | None = None,
+) -> int:
+    """Run orchestration cycles on an interval with one warm orchestrator."""
+    from app.daemon import OrchestratorDaemon
+    from app.health import HealthChecker
+    from app.orchestrator import AutoDevOrchestrator
+
+    if auto_git is not None:
+        config.auto_git = auto_git
+    if auto_pr is not None:
+        config.auto_pr = auto_pr
+
+    orchestrator = AutoDevOrchestrator(config)
+    daemon = OrchestratorDaemon(
+        orchestrator.run_once,
+        interval_seconds=interval_seconds,
+        jitter_seconds=jitter_seconds,
+        health_checker=HealthChecker(config.memory_db_path, config.workspace_root),
+    )
+    setup_signal_handlers(drain=daemon.request_stop)
+    try:
+        return daemon.run(max_cycles=max_cycles)
+    finally:
+        orchestrator.close(drain_timeout=config.pr_drain_seconds)
+
+
+def run_security_scan(path: Path, *, workers: int = 1, use_cache: bool = True) -> int:
+    """Scan a tree for forbidden patterns and report throughput."""
+    from app.security import SecurityScanner
+
+    cache_path = AgentConfig().memory_db_path.parent / "security_cache.db" if use_cache else None
+    scanner = SecurityScanner(cache_path, workers=workers)
+    violations = scanner.find_violations(path)
+    for violation in violations:
+        print_status(violation, level="err")
+    stats = scanner.last_stats
+    print_status(
+        f"Scanned {stats.files} file(s) in {stats.seconds:.3f}s ({stats.files_per_second:,.0f} files/sec; "
+        f"{stats.scanned} read, {stats.cached} from cache)",
+        level="warn" if violations else "ok",
+    )
+    return 1 if violations else 0
+
+
+def run_blob_gc(config: AgentConfig) -> int:
+    """Remove blobs no generated project links to any more."""
+    from app.blob_store import BlobStore
+    from app.scheduler import SchedulerLock
+
+    lock = SchedulerLock(config.schedule_lock_file, stale_after_seconds=config.lock_stale_seconds)
+    if not lock.acquire():
+        print_status("An orchestration run holds the scheduler lock; try again later", level="warn")
+        return 1
+    try:
+        store = BlobStore(config.blob_store_path)
+        reclaimed = store.gc()
+        remaining = store.stats()
+    finally:
+        lock.release()
+    print_status(f"Removed {reclaimed.blobs} unreferenced blob(s), {reclaimed.bytes:,} bytes", level="ok")
+    print_status(
+        f"Store holds {remaining.blobs} blob(s), {remaining.bytes:,} bytes, {remaining.links} project link(s)",
+        level="info",
+    )
+    return 0
+
+
+def run_web_benchmark(worker_counts: list[int], *, path: str, requests: int, concurrency: int) -> int:
+    """Load the web UI under each uvicorn worker count and report requests/sec scaling."""
+    from app.loadtest import benchmark_server
+
+    baseline: float | None = None
+    for workers in worker_counts:
+        try:
+            result = benchmark_server(workers, path=path, requests=requests, concurrency=concurrency)
+        except (RuntimeError, OSError) as e:
+            print_status(f"{workers} worker(s): {e}", level="err")
+            return 1
+        baseline = baseline or result.requests_per_second
+        scaling = result.requests_per_second / baseline if baseline else 0.0
+        print_status(
+            f"{workers} worker(s): {result.requests_per_second:,.0f} req/s ({scaling:.2f}x), "
+            f"p50 {result.p50_ms:.1f} ms, p95 {result.p95_ms:.1f} ms, {result.errors} error(s)",
+            level="warn" if result.errors else "ok",
+        )
+    return 0
+
+
+BENCH_COPY_IGNORE = shutil.ignore_patterns("__pycache__", ".pytest_cache", ".mypy_cache", ".coverage")
+
+
+def find_bench_project(config: AgentConfig, project: Path | None) -> Path | None:
+    """``project``, or the first generated project, if it looks like one."""
+    if project is None and config.workspace_root.is_dir():
+        project = next((path for path in sorted(config.workspace_root.iterdir()) if (path / "app").is_dir()), None)
+    if project is None or not (project / "app").is_dir():
+        print_status("No generated project to validate; pass --project.", level="err")
+        return None
+    return project
+
+
+def run_validation_benchmark(config: AgentConfig, project: Path | None, runs: int) -> int:
+    """Time validation of one project: in-tree caches vs. cold and warm shared tool caches."""
+    from app.tool_cache import ToolCache
+    from app.validator import Validator
+
+    project = find_bench_project(config, project)
+    if project is None:
+        return 1
+    options = {
+        "run_lint": config.run_lint,
+        "run_type_check": config.run_type_check,
+        "run_coverage": config.run_coverage,
+        "min_coverage": config.min_test_coverage,
+        "strict_validation": config.strict_validation,
+    }
+    print_status(f"Validating {project.name}, {runs} run(s) per mode", level="info")
+    with tempfile.TemporaryDirectory() as tmp:
+        warm_cache = ToolCache(Path(tmp) / "warm_cache")
+        modes = {
+            "in-tree": lambda index: Validator(max_concurrency=config.validation_concurrency),
+            "cold cache": lambda index: Validator(
+                max_concurrency=config.validation_concurrency,
+                tool_cache=ToolCache(Path(tmp) / f"cold_cache_{index}"),
+                syntax_in_memory=True,
+            ),
+            "warm cache": lambda index: Validator(
+                max_concurrency=config.validation_concurrency, tool_cache=warm_cache, syntax_in_memory=True
+            ),
+        }
+        for label, make_validator in modes.items():
+            timings: list[float] = []
+            checks: dict[str, float] = {}
+            for index in range(runs + (label == "warm cache")):
+                # Every run validates a fresh copy, so only the shared cache carries over between runs.
+                copy = Path(tmp) / f"{label.replace(' ', '_')}_{index}" / project.name
+                shutil.copytree(project, copy, ignore=BENCH_COPY_IGNORE)
+                started = time.perf_counter()
+                result = make_validator(index).run(copy, **options)
+                elapsed = time.perf_counter() - started
+                if label == "warm cache" and index == 0:
+                    continue  # Priming run.
+                timings.append(elapsed)
+                for name, usage in result.resources.items():
+                    checks[name] = checks.get(name, 0.0) + usage.wall_seconds / runs
+            per_check = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in checks.items())
+            print_status(f"{label}: mean {sum(timings) / len(timings):.2f}s per validation ({per_check})", level="ok")
+    return 0
+
+
+def run_startup_benchmark(config: AgentConfig, project: Path | None, runs: int, top: int) -> int:
+    """Startup cost of each check's tool with the default and the lean profile, plus an import-time breakdown."""
+    from app.startup import profile_startup, startup_command
+    from app.validator import LEAN_ENV, Validator
+
+    project = find_bench_project(config, project)
+    if project is None:
+        return 1
+    options = {"run_lint": True, "run_type_check": config.run_type_check, "run_coverage": config.run_coverage}
+    default_specs = Validator.plan_checks(**options)
+    lean_specs = Validator.plan_checks(**options, lean=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = Path(tmp) / project.name
+        shutil.copytree(project, copy, ignore=BENCH_COPY_IGNORE)
+        env = {**os.environ, "PYTHONPATH": str(copy)}
+        print_status(f"Startup of {project.name}'s checks, median of {runs} run(s)", level="info")
+        for default_spec, lean_spec in zip(default_specs[1:], lean_specs[1:]):
+            default = profile_startup(startup_command(default_spec.command), cwd=copy, env=env, runs=runs)
+            lean = profile_startup(startup_command(lean_spec.command), cwd=copy, env={**env, **LEAN_ENV}, runs=runs)
+            saved_ms = (default.seconds - lean.seconds) * 1000
+            print_status(
+                f"{default_spec.name}: default {default.seconds * 1000:.0f} ms, lean {lean.seconds * 1000:.0f} ms "
+                f"({saved_ms:+.0f} ms saved per check; imports {default.import_seconds * 1000:.0f} -> "
+                f"{lean.import_seconds * 1000:.0f} ms)",
+                level="ok" if lean.returncode == default.returncode else "warn",
+            )
+            if lean.returncode != default.returncode:
+                print_status(f"  exit code differs: default {default.returncode}, lean {lean.returncode}", level="warn")
+            skipped = {name: us for name, us in default.imports.items() if name not in lean.imports}
+            for name, us in sorted(skipped.items(), key=lambda item: item[1], reverse=True)[:top]:
+                print(f"  not imported when lean: {name:<28} {us / 1000:8.1f} ms")
+            for name, us in lean.top(top):
+                print(f"  lean import:            {name:<28} {us / 1000:8.1f} ms")
+    return 0
+
+
+def run_logging_benchmark(calls: int, *, json_format: bool = False) -> int:
+    """Compare per-call log latency of direct file/console handlers with the queued pipeline."""
+    bench_logger = get_logger("bench")
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        for label, queued in (("direct", False), ("queued", True)):
+            configure_logging(Path(tmp) / label, json_format=json_format, queued=queued, stream=devnull)
+            timings: list[float] = []
+            for index in range(calls):
+                started = time.perf_counter()
+                bench_logger.info("Cycle %d finished stage %s for %s", index, "validate", "bench-project")
+                timings.append(time.perf_counter() - started)
+            flush_logging()
+            timings.sort()
+            mean_us = sum(timings) / len(timings) * 1e6
+            p99_us = timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6
+            print_status(f"{label}: mean {mean_us:.1f} us, p99 {p99_us:.1f} us per call ({calls} calls)", level="ok")
+    configure_logging(log_dir=Path("logs"), json_format=json_format)
+    return 0
+
+
 def supports_color() -> bool:
     """Detect whether stdout supports ANSI colors."""
     return sys.stdout.isatty() and os.getenv("TERM") != "dumb"
@@ -356,15 +600,9 @@ def run_shell_command(
         )
         return 0
 
-    try:
-        completed = subprocess.run(
-            command,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-        )
-    except subprocess.TimeoutExpired:
+    # Output is streamed to the terminal as it arrives; only a bounded head/tail is held in memory.
+    completed = run_captured(command, shell=True, timeout=timeout_seconds, echo=True, start_new_session=True)
+    if completed.timed_out:
         print_status(f"Command timed out after {timeout_seconds} seconds.", level="err")
         append_history(
             task=task_label or command,
@@ -375,11 +613,6 @@ def run_shell_command(
         )
         return 124
 
-    if completed.stdout:
-        print(completed.stdout, end="")
-    if completed.stderr:
-        print(completed.stderr, end="", file=sys.stderr)
-
     append_history(
         task=task_label or command,
         command=command,
@@ -465,12 +698,55 @@ def print_cli_help() -> None:
 
 def print_health(config: AgentConfig) -> None:
     """Render health details in terminal."""
-    health = HealthChecker(config.memory_db_path, config.workspace_root).check()
+    from app.health import HealthChecker
+
+    sample = HealthChecker(config.memory_db_path, config.workspace_root).sample()
+    health = sample.health
     level = "ok" if health.status == "healthy" else "warn"
     print_status(f"Health: {health.status}", level=level)
     for name, status in health.checks.items():
         item_level = "ok" if status == "ok" else "warn"
-        print_status(f"{name}: {status}", level=item_level)
+        print_status(f"{name}: {status} ({sample.probe_ms[name]:.1f} ms)", level=item_level)
+    if sample.disk_free_bytes is not None:
+        print_status(f"disk free: {sample.disk_free_bytes / 1024**3:.1f} GiB", level="info")
+    if sample.db_size_bytes is not None:
+        print_status(f"memory db: {sample.db_size_bytes / 1024:.0f} KiB", level="info")
+
+
+def print_run_stats(config: AgentConfig, *, days: int = 7, top: int = 5, compact: bool = False) -> None:
+    """Render run-history analytics for the last ``days`` days."""
+    from app.memory import MemoryStore
+
+    memory = MemoryStore(config.memory_db_path)
+    try:
+        now = datetime.now(tz=timezone.utc)
+        if compact and config.history_retention_days > 0:
+            rolled_up = memory.compact_history(now - timedelta(days=config.history_retention_days))
+            print_status(f"Rolled {rolled_up} run(s) into daily aggregates", level="info")
+
+        stats = memory.run_stats(since=now - timedelta(days=days) if days > 0 else None)
+        window = f"last {days} day(s)" if days > 0 else "all time"
+        print_status(f"Runs ({window}): {stats.runs}, success rate {stats.success_rate:.0%}", level="info")
+        if stats.retry_histogram:
+            histogram = ", ".join(f"{retries}: {count}" for retries, count in stats.retry_histogram.items())
+            print_status(f"Retries histogram: {histogram}", level="info")
+        latencies = ", ".join(
+            f"{name}={value:.1f}s" for name, value in stats.percentiles.items() if value is not None
+        )
+        if latencies:
+            print_status(f"Cycle time: {latencies}", level="info")
+        for item in stats.check_failures[:top]:
+            print_status(
+                f"{item.template} fails {item.check}: {item.failures}/{item.attempts} ({item.rate:.0%})", level="warn"
+            )
+        depth = memory.outbox_depth()
+        if any(depth.values()):
+            print_status(
+                f"PR outbox: {depth['pending']} pending, {depth['done']} published, {depth['failed']} failed",
+                level="warn" if depth["failed"] else "info",
+            )
+    finally:
+        memory.close()
 
 
 def run_interactive_cli(config: AgentConfig, state: CliSessionState) -> int:
@@ -563,6 +839,13 @@ def build_parser() -> argparse.ArgumentParser:
     run_parser = subparsers.add_parser("run", help="Run one AutoDev orchestration cycle")
     run_parser.add_argument("--auto-git", action="store_true", help="Enable git commit/branch publishing")
     run_parser.add_argument("--auto-pr", action="store_true", help="Enable PR creation (requires token)")
+    run_parser.add_argument("--batch", type=int, default=1, help="Number of projects to generate (default: 1)")
+    run_parser.add_argument("--workers", type=int, default=1, help="Worker processes for --batch (default: 1)")
+    run_parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Stream --batch projects through overlapping stages; --workers sets validation concurrency",
+    )
 
     shell_parser = subparsers.add_parser("shell", help="Run one shell command on this PC")
     shell_parser.add_argument("task", help="Shell command to run")
@@ -591,16 +874,158 @@ def build_parser() -> argparse.ArgumentParser:
     cli_parser.add_argument("--no-llm", action="store_true", help="Disable LLM planning fallback")
     cli_parser.add_argument("--llm-model", type=str, help="Override LLM model name")
 
+    daemon_parser = subparsers.add_parser("daemon", help="Run orchestration cycles continuously")
+    daemon_parser.add_argument("--interval", type=float, default=3600, help="Seconds between cycle starts")
+    daemon_parser.add_argument("--jitter", type=float, default=0, help="Random +/- seconds added to each interval")
+    daemon_parser.add_argument("--max-cycles", type=int, help="Stop after this many cycles")
+    daemon_parser.add_argument("--auto-git", action="store_true", help="Enable git commit/branch publishing")
+    daemon_parser.add_argument("--auto-pr", action="store_true", help="Enable PR creation (requires token)")
+
+    scan_parser = subparsers.add_parser("scan", help="Run the security scanner over a directory")
+    scan_parser.add_argument("path", type=Path, help="Directory to scan")
+    scan_parser.add_argument("--workers", type=int, default=1, help="Worker processes for large trees")
+    scan_parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the scan cache")
+
+    subparsers.add_parser("gc", help="Delete deduplicated file blobs no project references")
+    stats_parser = subparsers.add_parser("stats", help="Show run success rates, retries and cycle times")
+    stats_parser.add_argument("--days", type=int, default=7, help="Window in days; 0 for all history (default: 7)")
+    stats_parser.add_argument("--top", type=int, default=5, help="Failing template/check pairs to show")
+    stats_parser.add_argument(
+        "--compact", action="store_true", help="Roll runs past the retention window into daily aggregates first"
+    )
+
+    bench_web_parser = subparsers.add_parser("bench-web", help="Load-test the web UI across server worker counts")
+    bench_web_parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4], help="Server worker counts to compare (default: 1 2 4)"
+    )
+    bench_web_parser.add_argument("--requests", type=int, default=2000, help="Requests per worker count")
+    bench_web_parser.add_argument("--concurrency", type=int, default=32, help="Concurrent keep-alive clients")
+    bench_web_parser.add_argument("--path", default="/api/status", help="Endpoint to load (default: /api/status)")
+
+    bench_validate_parser = subparsers.add_parser(
+        "bench-validate", help="Compare validation time with in-tree, cold and warm tool caches"
+    )
+    bench_validate_parser.add_argument("--project", type=Path, help="Project to validate (default: first generated one)")
+    bench_validate_parser.add_argument("--runs", type=int, default=3, help="Validations per mode")
+
+    bench_startup_parser = subparsers.add_parser(
+        "bench-startup", help="Compare check startup cost with the default and lean tool profiles"
+    )
+    bench_startup_parser.add_argument("--project", type=Path, help="Project to run checks in (default: first generated one)")
+    bench_startup_parser.add_argument("--runs", type=int, default=5, help="Timed runs per check and profile")
+    bench_startup_parser.add_argument("--top", type=int, default=5, help="Packages to list in the import-time breakdown")
+
+    bench_logging_parser = subparsers.add_parser("bench-logging", help="Measure per-call logging latency")
+    bench_logging_parser.add_argument("--calls", type=int, default=20000, help="Log calls per configuration")
+
     subparsers.add_parser("health", help="Print health status")
     history_parser = subparsers.add_parser("history", help="Show command history")
     history_parser.add_argument("--limit", type=int, default=20, help="Number of records to show")
     return parser
 
 
+def _cmd_run(args: argparse.Namespace, config: AgentConfig) -> int:
+    return run_orchestrator_cycle(
+        config,
+        auto_git=getattr(args, "auto_git", None),
+        auto_pr=getattr(args, "auto_pr", None),
+        batch=getattr(args, "batch", 1),
+        workers=getattr(args, "workers", 1),
+        pipeline=getattr(args, "pipeline", False),
+    )
+
+
+def _cmd_daemon(args: argparse.Namespace, config: AgentConfig) -> int:
+    return run_daemon(
+        config,
+        interval_seconds=args.interval,
+        jitter_seconds=args.jitter,
+        max_cycles=args.max_cycles,
+        auto_git=args.auto_git,
+        auto_pr=args.auto_pr,
+    )
+
+
+def _cmd_shell(args: argparse.Namespace, config: AgentConfig) -> int:
+    return run_shell_command(
+        args.task,
+        yes=args.yes,
+        timeout_seconds=args.timeout,
+        safe_mode=not args.unsafe,
+        dry_run=args.dry_run,
+        mode="shell",
+    )
+
+
+def _cmd_prompt(args: argparse.Namespace, config: AgentConfig) -> int:
+    return run_prompt_task(
+        args.task,
+        yes=args.yes,
+        timeout_seconds=args.timeout,
+        safe_mode=not args.unsafe,
+        dry_run=args.dry_run,
+        use_llm=not args.no_llm,
+        llm_model=args.llm_model,
+    )
+
+
+def _cmd_cli(args: argparse.Namespace, config: AgentConfig) -> int:
+    state = CliSessionState(
+        mode=args.mode,
+        auto_approve=args.yes,
+        dry_run=args.dry_run,
+        timeout_seconds=args.timeout,
+        safe_mode=not args.unsafe,
+        auto_git=getattr(args, "auto_git", None),
+        auto_pr=getattr(args, "auto_pr", None),
+        use_llm=not args.no_llm,
+        llm_model=args.llm_model,
+    )
+    return run_interactive_cli(config, state)
+
+
+def _cmd_stats(args: argparse.Namespace, config: AgentConfig) -> int:
+    print_run_stats(config, days=args.days, top=args.top, compact=args.compact)
+    return 0
+
+
+def _cmd_health(args: argparse.Namespace, config: AgentConfig) -> int:
+    print_health(config)
+    return 0
+
+
+def _cmd_history(args: argparse.Namespace, config: AgentConfig) -> int:
+    show_history(limit=args.limit)
+    return 0
+
+
+# Subcommand -> handler; each handler imports the modules only its command needs.
+COMMANDS: dict[str, Callable[[argparse.Namespace, AgentConfig], int]] = {
+    "run": _cmd_run,
+    "daemon": _cmd_daemon,
+    "shell": _cmd_shell,
+    "prompt": _cmd_prompt,
+    "cli": _cmd_cli,
+    "scan": lambda args, config: run_security_scan(args.path, workers=args.workers, use_cache=not args.no_cache),
+    "gc": lambda args, config: run_blob_gc(config),
+    "stats": _cmd_stats,
+    "bench-web": lambda args, config: run_web_benchmark(
+        args.workers, path=args.path, requests=args.requests, concurrency=args.concurrency
+    ),
+    "bench-validate": lambda args, config: run_validation_benchmark(config, args.project, max(1, args.runs)),
+    "bench-startup": lambda args, config: run_startup_benchmark(config, args.project, max(1, args.runs), max(0, args.top)),
+    "bench-logging": lambda args, config: run_logging_benchmark(
+        max(1, args.calls), json_format=config.log_format == "json"
+    ),
+    "health": _cmd_health,
+    "history": _cmd_history,
+}
+
+
 def main() -> int:
     """Run AutoDev in run/shell/interactive CLI modes."""
     config = AgentConfig.from_env()
-    configure_logging(log_dir=Path("logs"))
+    configure_logging(log_dir=Path("logs"), json_format=config.log_format == "json")
     setup_signal_handlers()
 
     logger.info("AutoDev Agent starting...")
@@ -610,59 +1035,11 @@ def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
 
-    if args.command in (None, "run"):
-        return run_orchestrator_cycle(
-            config,
-            auto_git=args.auto_git if hasattr(args, "auto_git") else None,
-            auto_pr=args.auto_pr if hasattr(args, "auto_pr") else None,
-        )
-
-    if args.command == "shell":
-        return run_shell_command(
-            args.task,
-            yes=args.yes,
-            timeout_seconds=args.timeout,
-            safe_mode=not args.unsafe,
-            dry_run=args.dry_run,
-            mode="shell",
-        )
-
-    if args.command == "prompt":
-        return run_prompt_task(
-            args.task,
-            yes=args.yes,
-            timeout_seconds=args.timeout,
-            safe_mode=not args.unsafe,
-            dry_run=args.dry_run,
-            use_llm=not args.no_llm,
-            llm_model=args.llm_model,
-        )
-
-    if args.command == "cli":
-        state = CliSessionState(
-            mode=args.mode,
-            auto_approve=args.yes,
-            dry_run=args.dry_run,
-            timeout_seconds=args.timeout,
-            safe_mode=not args.unsafe,
-            auto_git=args.auto_git if hasattr(args, "auto_git") else None,
-            auto_pr=args.auto_pr if hasattr(args, "auto_pr") else None,
-            use_llm=not args.no_llm,
-            llm_model=args.llm_model,
-        )
-        return run_interactive_cli(config, state)
-
-    if args.command == "health":
-        print_health(config)
-        return 0
-
-    if args.command == "history":
-        show_history(limit=args.limit)
-        return 0
-
-    parser.print_help()
-    return 2
-
+    handler = COMMANDS.get(args.command or "run")
+    if handler is None:
+        parser.print_help()
+        return 2
+    return handler(args, config)
 
 if __name__ == "__main__":
     sys.exit(main())
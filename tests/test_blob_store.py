@@ -0,0 +1,88 @@
+import os
+import threading
+
+import pytest
+
+from app.blob_store import BlobStore
+from app.codegen import ProjectScaffolder
+from app.config import AgentConfig
+from app.correction import CorrectionEngine, Diagnostic
+from app.models import PlanArtifact, ProjectCategory, ProjectIdea
+
+
+def _scaffold(scaffolder: ProjectScaffolder, workspace, name: str):
+    idea = ProjectIdea(name=name, category=ProjectCategory.CLI, complexity=1, summary="demo")
+    plan = PlanArtifact(structure=[], dependencies=[], interfaces=[], test_outline=[])
+    return scaffolder.generate(
+        workspace_root=workspace, idea=idea, plan=plan, readme_text="# Demo\n", config=AgentConfig()
+    ).root
+
+
+def _require_hardlinks(directory) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    source = directory / ".link-probe"
+    source.write_bytes(b"")
+    try:
+        os.link(source, directory / ".link-probe-2")
+    except OSError:
+        pytest.skip("filesystem does not support hardlinks")
+    finally:
+        (directory / ".link-probe-2").unlink(missing_ok=True)
+        source.unlink()
+
+
+def test_identical_files_share_one_blob_and_copy_on_write(tmp_path) -> None:
+    _require_hardlinks(tmp_path)
+    store = BlobStore(tmp_path / "blobs")
+    scaffolder = ProjectScaffolder(store)
+    first = _scaffold(scaffolder, tmp_path / "ws", "alpha")
+    second = _scaffold(scaffolder, tmp_path / "ws", "beta")
+
+    models_a, models_b = first / "app" / "models.py", second / "app" / "models.py"
+    assert models_a.stat().st_ino == models_b.stat().st_ino
+    assert store.stats().links >= 14
+    assert models_b.read_text() == models_a.read_text()
+
+    original = models_b.read_text()
+    CorrectionEngine.fix_diagnostics(first, [Diagnostic("app/models.py", 1, 80, "E501", "line too long")])
+    assert models_a.stat().st_ino != models_b.stat().st_ino
+    assert "# noqa: E501" in models_a.read_text()
+    assert models_b.read_text() == original
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path) -> None:
+    _require_hardlinks(tmp_path)
+    store = BlobStore(tmp_path / "blobs")
+    kept = tmp_path / "kept.txt"
+    store.write(kept, b"shared")
+    store.put(b"orphan")
+
+    reclaimed = store.gc()
+    assert kept.stat().st_nlink > 1
+    assert (reclaimed.blobs, store.stats().blobs) == (1, 1)
+    assert kept.read_bytes() == b"shared"
+
+
+def test_gc_waits_for_writers_and_writes_survive_a_collected_blob(tmp_path, monkeypatch) -> None:
+    store = BlobStore(tmp_path / "blobs")
+    store.put(b"orphan")
+    with store._locked(exclusive=False):
+        collector = threading.Thread(target=store.gc)
+        collector.start()
+        collector.join(0.2)
+        assert collector.is_alive()  # A writer is between put() and its link.
+    collector.join()
+    assert store.stats().blobs == 0
+
+    materialize = BlobStore.materialize
+    collected = []
+
+    def collect_first(self, blob, target):
+        if not collected:
+            collected.append(blob)
+            blob.unlink()  # What gc did here before the lock, and can still do without flock.
+        return materialize(self, blob, target)
+
+    monkeypatch.setattr(BlobStore, "materialize", collect_first)
+    store.write(tmp_path / "file.txt", b"shared")
+    assert collected and (tmp_path / "file.txt").read_bytes() == b"shared"
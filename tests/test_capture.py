@@ -0,0 +1,111 @@
+import os
+import signal
+import sys
+import time
+
+from app.capture import OutputCapture, prune_artifacts, run_captured
+from app.limits import ResourceLimits
+
+
+def test_small_output_is_kept_whole_without_spill(tmp_path) -> None:
+    capture = OutputCapture(limit=64, spill_path=tmp_path / "out.log")
+    capture.feed(b"hello ")
+    capture.feed(b"world")
+
+    result = capture.result()
+    assert (result.text, result.size, result.artifact) == ("hello world", 11, None)
+    assert not (tmp_path / "out.log").exists()
+
+
+def test_large_output_keeps_head_and_tail_and_spills_everything(tmp_path) -> None:
+    capture = OutputCapture(limit=20, spill_path=tmp_path / "out.log")
+    data = b"".join(f"{index:04d}\n".encode() for index in range(200))
+    for offset in range(0, len(data), 7):
+        capture.feed(data[offset:offset + 7])
+
+    result = capture.result()
+    assert result.truncated and result.size == len(data)
+    assert result.artifact.read_bytes() == data
+    assert result.text.startswith("0000\n0001")
+    assert f"{len(data) - 20} bytes omitted; full output: {result.artifact}" in result.text
+    assert result.text.endswith("0198\n0199\n")
+    assert capture.result() is result
+
+
+def test_run_captured_streams_both_pipes(tmp_path) -> None:
+    script = "import sys; sys.stdout.write('x' * 300000); sys.stderr.write('done')"
+    completed = run_captured(
+        [sys.executable, "-c", script],
+        stdout=OutputCapture(limit=1000, spill_path=tmp_path / "stdout.log"),
+        stderr=OutputCapture(limit=1000, spill_path=tmp_path / "stderr.log"),
+    )
+
+    assert completed.returncode == 0
+    assert completed.stdout.size == 300000
+    assert completed.stdout.text.count("x") == 1000
+    assert (tmp_path / "stdout.log").stat().st_size == 300000
+    assert (completed.stderr.text, completed.stderr.artifact) == ("done", None)
+
+
+def test_run_captured_kills_on_timeout() -> None:
+    completed = run_captured([sys.executable, "-c", "import time; time.sleep(30)"], timeout=0.2)
+
+    assert completed.timed_out and completed.returncode == -signal.SIGKILL
+    assert completed.usage is not None and completed.usage.wall_seconds < 10
+
+
+def test_wall_budget_kills_the_checks_whole_process_group() -> None:
+    # Own process group, but the caller's session: that is how a cancelled job finds its checks.
+    placement = run_captured(
+        [sys.executable, "-c", "import os; print(os.getpgrp() == os.getpid(), os.getsid(0))"],
+        limits=ResourceLimits(wall_seconds=5),
+    )
+    assert placement.stdout.text.split() == ["True", str(os.getsid(0))]
+
+    # The grandchild inherits the pipes; only a group kill lets the capture finish before the grace period.
+    script = (
+        "import subprocess, sys, time\n"
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "time.sleep(60)"
+    )
+    completed = run_captured([sys.executable, "-c", script], limits=ResourceLimits(wall_seconds=0.5))
+
+    assert completed.timed_out
+    assert completed.usage.limit_hit == "wall"
+    assert completed.usage.wall_seconds < 2
+
+
+def test_timeout_kills_shell_command_group_and_returns_promptly() -> None:
+    started = time.monotonic()
+    completed = run_captured("sleep 8; echo hi", shell=True, timeout=1, start_new_session=True)
+
+    assert completed.timed_out
+    assert "hi" not in completed.stdout.text
+    assert time.monotonic() - started < 4
+
+    # Without a session only the shell dies; the orphaned sleep holds the pipes, so the readers are abandoned.
+    started = time.monotonic()
+    assert run_captured("sleep 8; echo hi", shell=True, timeout=1).timed_out
+    assert time.monotonic() - started < 6
+
+
+def test_cpu_and_memory_budgets_are_enforced_in_the_child() -> None:
+    spin = run_captured([sys.executable, "-c", "while True: pass"], limits=ResourceLimits(cpu_seconds=1))
+    assert spin.returncode in (-signal.SIGXCPU, -signal.SIGKILL)
+    assert spin.usage.limit_hit == "cpu" and spin.usage.cpu_seconds >= 0.9
+
+    hog = run_captured(
+        [sys.executable, "-c", "data = bytearray(1024 ** 3)"], limits=ResourceLimits(memory_bytes=512 * 1024 * 1024)
+    )
+    assert hog.returncode == 1 and "MemoryError" in hog.stderr.text
+    assert hog.usage.max_rss_kb < 512 * 1024
+
+
+def test_prune_artifacts_removes_old_files(tmp_path) -> None:
+    old, new = tmp_path / "old.stdout.log", tmp_path / "new.stdout.log"
+    old.write_text("old")
+    new.write_text("new")
+    os.utime(old, (0, 0))
+
+    assert prune_artifacts(tmp_path, 3600) == 1
+    assert not old.exists() and new.exists()
@@ -1,4 +1,4 @@
-from app.correction import CorrectionEngine
+from app.correction import CorrectionEngine, Diagnostic
 from app.models import ValidationResult
 
 
@@ -13,3 +13,76 @@ def test_correction_engine_repairs_missing_test_signature(tmp_path) -> None:
     CorrectionEngine().apply(project, result)
 
     assert "test_run_returns_success_code" in test_file.read_text(encoding="utf-8")
+
+
+def test_correction_engine_fixes_only_reported_diagnostics(tmp_path) -> None:
+    project = tmp_path / "proj"
+    app_dir = project / "app"
+    app_dir.mkdir(parents=True)
+    dirty = app_dir / "main.py"
+    dirty.write_text("import os\nimport sys\ndef run() -> int:\n    return sys.maxsize   \n\n\n", encoding="utf-8")
+    clean = app_dir / "models.py"
+    clean.write_text("VALUE = 1\n\n\n", encoding="utf-8")
+    clean_mtime = clean.stat().st_mtime_ns
+
+    logs = [
+        "$ python -m flake8 app tests",
+        "app/main.py:1:1: F401 'os' imported but unused\n"
+        "app/main.py:3:1: E302 expected 2 blank lines, found 0\n"
+        "app/main.py:4:22: W291 trailing whitespace\n"
+        "app/main.py:6:1: W391 blank line at end of file",
+    ]
+    result = ValidationResult(success=False, checks={"lint": False}, logs=logs)
+    CorrectionEngine().apply(project, result)
+
+    assert dirty.read_text(encoding="utf-8") == "import sys\n\n\ndef run() -> int:\n    return sys.maxsize\n"
+    assert clean.stat().st_mtime_ns == clean_mtime
+
+
+def test_fixes_on_a_deleted_line_do_not_touch_its_neighbour(tmp_path) -> None:
+    source = tmp_path / "app" / "main.py"
+    source.parent.mkdir()
+    source.write_text("import os   \nVALUE = 1\n", encoding="utf-8")
+    diagnostics = [
+        Diagnostic(path="app/main.py", line=1, column=1, code="F401", message="'os' imported but unused"),
+        Diagnostic(path="app/main.py", line=1, column=10, code="W291", message="trailing whitespace"),
+        Diagnostic(path="app/main.py", line=1, column=1, code="E302", message="expected 2 blank lines, found 0"),
+    ]
+
+    CorrectionEngine.fix_diagnostics(tmp_path, diagnostics)
+
+    assert source.read_text(encoding="utf-8") == "VALUE = 1\n"
+
+
+def test_indented_imports_and_string_whitespace_are_left_alone(tmp_path) -> None:
+    source = tmp_path / "app" / "main.py"
+    source.parent.mkdir()
+    text = 'try:\n    import json\nexcept ImportError:\n    json = None\nDOC = """keep   \nthis  \n"""   \nimport os\n'
+    source.write_text(text, encoding="utf-8")
+    diagnostics = [
+        Diagnostic(path="app/main.py", line=2, column=5, code="F401", message="'json' imported but unused"),
+        Diagnostic(path="app/main.py", line=5, column=15, code="W291", message="trailing whitespace"),
+        Diagnostic(path="app/main.py", line=6, column=5, code="W291", message="trailing whitespace"),
+        Diagnostic(path="app/main.py", line=7, column=4, code="W291", message="trailing whitespace"),
+        Diagnostic(path="app/main.py", line=8, column=1, code="F401", message="'os' imported but unused"),
+    ]
+
+    CorrectionEngine.fix_diagnostics(tmp_path, diagnostics)
+
+    assert source.read_text(encoding="utf-8") == (
+        'try:\n    import json  # noqa: F401\nexcept ImportError:\n    json = None\nDOC = """keep   \nthis  \n"""\n'
+    )
+
+
+def test_fixes_that_would_break_syntax_are_not_written(tmp_path) -> None:
+    source = tmp_path / "app" / "main.py"
+    source.parent.mkdir()
+    text = "TOTAL = 1 + \\\n    2\n"
+    source.write_text(text, encoding="utf-8")
+
+    rewritten = CorrectionEngine.fix_diagnostics(
+        tmp_path, [Diagnostic(path="app/main.py", line=1, column=80, code="E501", message="line too long")]
+    )
+
+    assert rewritten == []
+    assert source.read_text(encoding="utf-8") == text
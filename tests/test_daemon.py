@@ -0,0 +1,36 @@
+from app.daemon import OrchestratorDaemon
+
+
+def test_daemon_runs_cycles_and_records_latency() -> None:
+    calls: list[int] = []
+
+    def cycle() -> bool:
+        calls.append(1)
+        return True
+
+    daemon = OrchestratorDaemon(cycle, interval_seconds=0)
+    assert daemon.run(max_cycles=3) == 0
+    assert len(calls) == 3
+    assert [timing.cycle for timing in daemon.timings] == [1, 2, 3]
+
+
+def test_daemon_drains_after_current_cycle() -> None:
+    daemon: OrchestratorDaemon
+
+    def cycle() -> bool:
+        daemon.request_stop()
+        return True
+
+    daemon = OrchestratorDaemon(cycle, interval_seconds=3600)
+    assert daemon.run() == 0
+    assert len(daemon.timings) == 1
+
+
+def test_daemon_keeps_recent_timings_and_running_totals() -> None:
+    results = iter([True, False, True, True])
+    daemon = OrchestratorDaemon(lambda: next(results), interval_seconds=0, timing_history=2)
+
+    assert daemon.run(max_cycles=4) == 0
+    assert [timing.cycle for timing in daemon.timings] == [3, 4]
+    assert (daemon.cycles_run, daemon.cycles_succeeded) == (4, 3)
+    assert daemon.max_latency_seconds >= max(timing.duration_seconds for timing in daemon.timings)
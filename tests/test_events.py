@@ -0,0 +1,139 @@
+import asyncio
+import json
+import logging
+
+from app.events import EventBus, EventFanout, EventLogHandler, SharedEventBus
+from app.memory import MemoryStore
+
+
+def test_since_returns_events_after_last_id() -> None:
+    bus = EventBus()
+    first = bus.publish("stage", stage="plan")
+    bus.publish("stage", stage="scaffold")
+
+    events, missed = bus.since(first.id)
+
+    assert [event.data["stage"] for event in events] == ["scaffold"]
+    assert missed is False
+    assert bus.since(bus.last_id) == ([], False)
+
+
+def test_since_reports_events_evicted_from_ring() -> None:
+    bus = EventBus(capacity=2)
+    for index in range(5):
+        bus.publish("log", message=str(index))
+
+    events, missed = bus.since(1)
+
+    assert [event.id for event in events] == [4, 5]
+    assert missed is True
+
+
+def test_subscribers_are_notified_until_unsubscribed() -> None:
+    bus = EventBus()
+    calls: list[int] = []
+    unsubscribe = bus.subscribe(lambda: calls.append(bus.last_id))
+
+    bus.publish("status", running=True)
+    unsubscribe()
+    bus.publish("status", running=False)
+
+    assert calls == [1]
+
+
+def test_event_serializes_to_sse_frame() -> None:
+    event = EventBus().publish("complete", project="demo", success=True)
+
+    lines = event.to_sse().splitlines()
+
+    assert lines[:2] == ["id: 1", "event: complete"]
+    assert json.loads(lines[2].removeprefix("data: "))["project"] == "demo"
+
+
+def test_log_handler_publishes_log_events() -> None:
+    bus = EventBus()
+    log = logging.getLogger("autodev.test_events")
+    log.setLevel(logging.DEBUG)
+    handler = EventLogHandler(bus)
+    log.addHandler(handler)
+    try:
+        log.info("validating %s", "demo")
+        log.debug("not forwarded")
+    finally:
+        log.removeHandler(handler)
+
+    events, _ = bus.since(0)
+    assert [(event.type, event.data["level"], event.data["message"]) for event in events] == [
+        ("log", "INFO", "validating demo")
+    ]
+
+
+def test_shared_bus_is_visible_across_stores(tmp_path) -> None:
+    writer = SharedEventBus(MemoryStore(tmp_path / "memory.db"), capacity=64)
+    reader = SharedEventBus(MemoryStore(tmp_path / "memory.db"), capacity=64)
+    first = writer.publish("run_log", message="queued")
+    writer.publish("job", id=1, state="running")
+
+    events, missed = reader.since(first.id - 1)
+
+    assert [(event.type, event.id) for event in events] == [("run_log", first.id), ("job", first.id + 1)]
+    assert missed is False
+    assert reader.last_id == first.id + 1
+    assert [event.data["message"] for event in reader.recent("run_log", 5)] == ["queued"]
+
+
+def test_shared_bus_trims_and_reports_missed_events(tmp_path) -> None:
+    bus = SharedEventBus(MemoryStore(tmp_path / "memory.db"), capacity=10)
+    for index in range(130):
+        bus.publish("log", message=str(index))
+
+    events, missed = bus.since(0)
+
+    assert missed is True
+    assert len(events) < 130
+    assert events[-1].data["message"] == "129"
+
+
+def test_log_handler_batches_records_into_one_write(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    bus = SharedEventBus(memory, capacity=64)
+    handler = EventLogHandler(bus, flush_seconds=60.0, capacity=3)
+    writes: list[int] = []
+    append_events = memory.append_events
+    memory.append_events = lambda events, keep: writes.append(len(events)) or append_events(events, keep)
+    record = logging.LogRecord("autodev.test_events", logging.INFO, __file__, 1, "line %d", (0,), None)
+
+    for _ in range(4):
+        handler.handle(record)
+    assert writes == [3]
+    handler.close()
+
+    events, _ = bus.since(0)
+    assert writes == [3, 1]
+    assert [(event.id, event.data["message"], event.data["time"]) for event in events] == [
+        (index, "line 0", record.created) for index in range(1, 5)
+    ]
+
+
+def test_fanout_delivers_local_and_other_process_events_to_every_subscriber(tmp_path) -> None:
+    bus = SharedEventBus(MemoryStore(tmp_path / "memory.db"), capacity=64)
+    other_process = SharedEventBus(MemoryStore(tmp_path / "memory.db"), capacity=64)
+    fanout = EventFanout(bus, poll_seconds=0.05, queue_size=2)
+
+    async def scenario():
+        fast, slow = await fanout.subscribe(), await fanout.subscribe()
+        bus.publish("job", id=1)
+        first = await asyncio.wait_for(fast.get(), 5)
+        other_process.publish("job", id=2)
+        other_process.publish("job", id=3)
+        rest = [await asyncio.wait_for(fast.get(), 5) for _ in range(2)]
+        backlog = [slow.get_nowait() for _ in range(slow.qsize())]
+        fanout.unsubscribe(fast)
+        fanout.unsubscribe(slow)
+        await asyncio.wait_for(fanout._task, 5)
+        return [event.data["id"] for event in (first, *rest)], backlog
+
+    delivered, backlog = asyncio.run(scenario())
+
+    assert delivered == [1, 2, 3]
+    assert backlog == [None]  # Overflowed its queue: told to catch up from the feed.
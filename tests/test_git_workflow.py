@@ -0,0 +1,69 @@
+import shutil
+import subprocess
+
+import pytest
+
+from app.git_workflow import GitWorkflow
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo, *args) -> str:
+    return subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True, check=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for key, value in {
+        "GIT_AUTHOR_NAME": "AutoDev",
+        "GIT_AUTHOR_EMAIL": "autodev@example.com",
+        "GIT_COMMITTER_NAME": "AutoDev",
+        "GIT_COMMITTER_EMAIL": "autodev@example.com",
+    }.items():
+        monkeypatch.setenv(key, value)
+    _git(tmp_path, "init", "-q", "-b", "main")
+    (tmp_path / ".gitignore").write_text("__pycache__/\n")
+    (tmp_path / "README.md").write_text("root\n")
+    _git(tmp_path, "add", "-A")
+    _git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def _project(repo, name: str, body: str):
+    project = repo / "generated_projects" / name
+    (project / "__pycache__").mkdir(parents=True, exist_ok=True)
+    (project / "main.py").write_text(body)
+    (project / "__pycache__" / "main.pyc").write_bytes(b"junk")
+    return project
+
+
+def test_publish_projects_commits_only_project_dirs_without_moving_head(repo) -> None:
+    alpha = _project(repo, "alpha", "print('a')\n")
+    beta = _project(repo, "beta", "print('b')\n")
+    (repo / "scratch.txt").write_text("unrelated\n")
+    head = _git(repo, "rev-parse", "HEAD")
+
+    results = GitWorkflow(repo).publish_projects([alpha, beta])
+
+    assert [result.branch for result in results] == ["feature/alpha", "feature/beta"]
+    assert _git(repo, "rev-parse", "HEAD") == head
+    assert _git(repo, "symbolic-ref", "--short", "HEAD") == "main"
+    assert _git(repo, "status", "--porcelain", "--untracked-files=no") == ""
+    files = _git(repo, "ls-tree", "-r", "--name-only", "feature/alpha").splitlines()
+    assert files == [".gitignore", "README.md", "generated_projects/alpha/main.py"]
+
+
+def test_publish_project_appends_to_branch_and_skips_unchanged(repo) -> None:
+    project = _project(repo, "alpha", "print('a')\n")
+    workflow = GitWorkflow(repo)
+    first = workflow.publish_project(project)
+
+    (project / "main.py").unlink()
+    (project / "cli.py").write_text("print('cli')\n")
+    second = workflow.publish_project(project)
+    assert _git(repo, "rev-parse", f"{second.commit}^") == first.commit
+    files = _git(repo, "ls-tree", "-r", "--name-only", "feature/alpha").splitlines()
+    assert "generated_projects/alpha/cli.py" in files
+    assert "generated_projects/alpha/main.py" not in files
+
+    assert not workflow.publish_project(project).committed
@@ -0,0 +1,27 @@
+from app.health import HealthChecker, HealthSampler
+
+
+def test_health_sample_records_metrics(tmp_path) -> None:
+    (tmp_path / "state").mkdir()
+    sample = HealthChecker(tmp_path / "state" / "memory.db", tmp_path / "ws").sample()
+
+    assert sample.health.status == "healthy"
+    assert set(sample.probe_ms) == {"memory_db", "workspace", "disk_space"}
+    assert sample.disk_free_bytes > 0
+    assert sample.db_size_bytes is not None
+
+
+def test_health_sampler_serves_cached_sample_within_ttl(tmp_path) -> None:
+    checker = HealthChecker(tmp_path / "memory.db", tmp_path / "ws")
+    calls = []
+    original = checker.sample
+    checker.sample = lambda: calls.append(1) or original()
+    sampler = HealthSampler(checker, interval_seconds=60, ttl_seconds=60, history_size=2)
+
+    first = sampler.latest()
+    assert all(sampler.latest() is first for _ in range(50))
+    assert len(calls) == 1
+
+    for _ in range(3):
+        sampler.refresh()
+    assert len(sampler.history()) == 2
@@ -1,4 +1,4 @@
-from app.idea_generator import IdeaGenerator
+from app.idea_generator import IdeaGenerator, TemplateUsage, usage_from_names
 
 
 def test_idea_generator_avoids_duplicates() -> None:
@@ -6,3 +6,13 @@ def test_idea_generator_avoids_duplicates() -> None:
     idea = generator.generate(existing_names={"task-status-api"}, min_complexity=1, max_complexity=3)
     assert idea.name != "task-status-api"
     assert 1 <= idea.complexity <= 3
+
+
+def test_idea_generator_recycles_least_used_template_from_usage_index() -> None:
+    templates = [name for names in IdeaGenerator._TEMPLATES.values() for name in names]
+    usage = {name: TemplateUsage(count=3, max_suffix=3) for name in templates}
+    usage["log-summarizer"] = TemplateUsage(count=2, max_suffix=18)
+
+    idea = IdeaGenerator(seed=1).generate(usage=usage)
+    assert idea.name == "log-summarizer-v19"
+    assert usage_from_names({"log-summarizer", "log-summarizer-v18"})["log-summarizer"] == TemplateUsage(2, 18)
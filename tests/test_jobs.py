@@ -0,0 +1,206 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.config import AgentConfig
+from app.events import EventBus
+from app.capture import run_captured
+from app.jobs import JobSupervisor, _process_identity
+from app.limits import ResourceLimits
+from app.memory import MemoryStore
+
+
+def _succeed(config, idea, events) -> bool:
+    events.publish("stage", stage="plan", project=idea.name)
+    return config.max_retries == 3
+
+
+def _hang(config, idea, events) -> bool:
+    time.sleep(60)
+    return True
+
+
+def _hang_in_check(config, idea, events) -> bool:
+    pid_file = config.workspace_root / "check.pid"
+    script = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(60)"
+    run_captured([sys.executable, "-c", script], limits=ResourceLimits(wall_seconds=120))
+    return True
+
+
+def _alive(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as handle:
+            return handle.read().rsplit(b")", 1)[1].split()[0] != b"Z"
+    except FileNotFoundError:
+        return False
+
+
+def _wait_for(memory: MemoryStore, job_id: int, states: set[str], timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = memory.get_job(job_id)
+        if job.state in states:
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} stuck in {memory.get_job(job_id).state}")
+
+
+def test_queue_claims_by_priority_and_cancels_queued_jobs(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    low = memory.submit_job({"max_retries": 1})
+    high = memory.submit_job({"max_retries": 2}, priority=5)
+    cancelled = memory.submit_job({})
+
+    assert memory.cancel_job(cancelled).state == "cancelled"
+    claimed = memory.claim_job()
+    assert (claimed.id, claimed.state, claimed.config) == (high, "running", {"max_retries": 2})
+    assert memory.claim_job().id == low
+    assert memory.claim_job() is None
+
+    memory.cancel_job(low)
+    assert memory.cancel_requested_jobs() == [low]
+    assert memory.requeue_running_jobs() == 2
+    assert memory.get_job(high).state == "queued"
+    assert memory.get_job(low).state == "cancelled"
+    assert memory.job_counts() == {"queued": 1, "running": 0, "succeeded": 0, "failed": 0, "cancelled": 2}
+
+
+def test_supervisor_runs_jobs_on_worker_processes(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    config = AgentConfig(memory_db_path=tmp_path / "memory.db", workspace_root=tmp_path / "ws")
+    supervisor = JobSupervisor(memory, config, workers=2, target=_succeed, poll_seconds=0.05)
+    supervisor.start()
+    try:
+        passed = supervisor.submit({})
+        failed = supervisor.submit({"max_retries": 1})
+        jobs = [_wait_for(memory, job_id, {"succeeded", "failed"}) for job_id in (passed, failed)]
+    finally:
+        supervisor.stop()
+
+    assert [(job.state, job.exit_code) for job in jobs] == [("succeeded", 0), ("failed", 1)]
+    assert jobs[0].project != jobs[1].project
+    assert all(job.pid for job in jobs)
+
+
+def test_supervisor_cancels_running_job(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    config = AgentConfig(memory_db_path=tmp_path / "memory.db", workspace_root=tmp_path / "ws")
+    supervisor = JobSupervisor(memory, config, workers=1, target=_hang, poll_seconds=0.05)
+    supervisor.start()
+    try:
+        running = supervisor.submit({})
+        queued = supervisor.submit({})
+        _wait_for(memory, running, {"running"})
+        while not supervisor.running():
+            time.sleep(0.05)
+
+        supervisor.cancel(running)
+        job = _wait_for(memory, running, {"cancelled"}, timeout=15)
+    finally:
+        supervisor.stop()
+
+    assert job.finished_at is not None
+    assert memory.get_job(queued).state == "queued"
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+def test_cancel_stops_checks_in_their_own_process_group(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    config = AgentConfig(memory_db_path=tmp_path / "memory.db", workspace_root=tmp_path / "ws")
+    config.workspace_root.mkdir()
+    pid_file = config.workspace_root / "check.pid"
+    supervisor = JobSupervisor(memory, config, workers=1, target=_hang_in_check, poll_seconds=0.05)
+    supervisor.start()
+    try:
+        job_id = supervisor.submit({})
+        deadline = time.monotonic() + 30
+        while not pid_file.exists() or not pid_file.read_text():
+            assert time.monotonic() < deadline, "check never started"
+            time.sleep(0.05)
+        check = int(pid_file.read_text())
+        assert os.getpgid(check) == check
+
+        supervisor.cancel(job_id)
+        _wait_for(memory, job_id, {"cancelled"}, timeout=15)
+        deadline = time.monotonic() + 5
+        while _alive(check) and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        supervisor.stop()
+
+    assert not _alive(check)
+
+
+def test_supervisor_relays_worker_events(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    config = AgentConfig(memory_db_path=tmp_path / "memory.db", workspace_root=tmp_path / "ws")
+    bus = EventBus()
+    supervisor = JobSupervisor(memory, config, target=_succeed, poll_seconds=0.05, events=bus)
+    supervisor.start()
+    try:
+        job = _wait_for(memory, supervisor.submit({}), {"succeeded"})
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and not any(event.type == "stage" for event in bus.since(0)[0]):
+            time.sleep(0.05)
+    finally:
+        supervisor.stop()
+
+    events, _ = bus.since(0)
+    assert ("stage", job.id, job.project) in [
+        (event.type, event.data["job"], event.data["project"]) for event in events if event.type == "stage"
+    ]
+    assert [event.data["state"] for event in events if event.type == "job"] == ["queued", "running", "succeeded"]
+
+
+def test_only_the_lock_holder_dispatches_jobs(tmp_path) -> None:
+    config = AgentConfig(memory_db_path=tmp_path / "memory.db", workspace_root=tmp_path / "ws")
+    lock_file = tmp_path / "jobs.lock"
+    leader = JobSupervisor(
+        MemoryStore(tmp_path / "memory.db"), config, target=_hang, poll_seconds=0.05, lock_file=lock_file
+    )
+    follower_memory = MemoryStore(tmp_path / "memory.db")
+    follower = JobSupervisor(follower_memory, config, target=_succeed, poll_seconds=0.05, lock_file=lock_file)
+    leader.start()
+    while not leader.leading:
+        time.sleep(0.01)
+    follower.start()
+    try:
+        job_id = follower.submit({})
+        _wait_for(follower_memory, job_id, {"running"})
+        assert not follower.leading
+
+        leader.stop()
+        job = _wait_for(follower_memory, job_id, {"succeeded"})
+    finally:
+        leader.stop()
+        follower.stop()
+
+    assert follower.leading is False
+    assert job.exit_code == 0
+
+
+def test_adoption_only_kills_workers_whose_pid_still_names_them(tmp_path) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    config = AgentConfig(memory_db_path=tmp_path / "memory.db", workspace_root=tmp_path / "ws")
+    orphan = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"], start_new_session=True)
+    reused = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"], start_new_session=True)
+    try:
+        orphan_job, reused_job = memory.submit_job({}), memory.submit_job({})
+        memory.claim_job(), memory.claim_job()
+        memory.set_job_worker(orphan_job, "orphan", orphan.pid, _process_identity(orphan.pid))
+        memory.set_job_worker(reused_job, "reused", reused.pid, "another-boot:1")
+        supervisor = JobSupervisor(memory, config, target=_succeed, poll_seconds=0.05)
+
+        supervisor._adopt_orphans()
+
+        assert orphan.wait(timeout=10) == -signal.SIGKILL
+        assert reused.poll() is None
+        assert {memory.get_job(job_id).state for job_id in (orphan_job, reused_job)} == {"queued"}
+    finally:
+        for process in (orphan, reused):
+            process.kill()
+            process.wait()
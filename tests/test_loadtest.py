@@ -0,0 +1,34 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.loadtest import hammer
+
+
+class _Ok(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        status = 200 if self.path == "/api/status" else 404
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def test_hammer_counts_requests_and_errors() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Ok)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        ok = hammer(f"{base}/api/status", requests=40, concurrency=4, workers=2)
+        missing = hammer(f"{base}/missing", requests=5, concurrency=2)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert (ok.workers, ok.requests, ok.errors) == (2, 40, 0)
+    assert ok.requests_per_second > 0 and ok.p95_ms >= ok.p50_ms
+    assert (missing.requests, missing.errors) == (5, 5)
@@ -0,0 +1,83 @@
+import os
+
+from app.log_reader import LogIndex, tail_lines
+
+
+def _line(second: int, logger: str, level: str, message: str) -> str:
+    return f"[2024-01-31 12:00:{second:02d}] autodev.{logger} - {level} - {message}\n"
+
+
+def test_tail_lines_reads_backwards_in_blocks(tmp_path) -> None:
+    path = tmp_path / "big.log"
+    path.write_text("".join(f"line {index}\n" for index in range(5000)))
+
+    assert tail_lines(path, 3, block_size=16) == ["line 4997", "line 4998", "line 4999"]
+    assert tail_lines(tmp_path / "big.log", 0) == []
+    (tmp_path / "short.log").write_text("only\n")
+    assert tail_lines(tmp_path / "short.log", 10) == ["only"]
+
+
+def test_query_filters_by_level_logger_and_time(tmp_path) -> None:
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    (logs / "autodev.log").write_text(
+        _line(1, "jobs", "INFO", "job 1 started")
+        + _line(2, "jobs.relay", "WARNING", "slow relay")
+        + _line(3, "web_ui", "ERROR", "boom")
+        + "Traceback (most recent call last):\n  ValueError\n"
+        + _line(4, "jobsx", "ERROR", "other logger")
+    )
+    index = LogIndex(logs, tmp_path / "index.db")
+
+    warnings = index.query(level="warning", logger="autodev.jobs")
+    assert [(entry.logger, entry.message) for entry in warnings.entries] == [("autodev.jobs.relay", "slow relay")]
+
+    errors = index.query(since="2024-01-31T12:00:03", level="ERROR")
+    assert [entry.message for entry in errors.entries] == [
+        "boom\nTraceback (most recent call last):\n  ValueError",
+        "other logger",
+    ]
+
+
+def test_cursor_pages_follow_appends_and_rotation(tmp_path) -> None:
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    current = logs / "autodev.log"
+    current.write_text("".join(_line(second, "orchestrator", "INFO", f"m{second}") for second in range(5)))
+    index = LogIndex(logs, tmp_path / "index.db")
+
+    newest = index.query(limit=2)
+    assert [entry.message for entry in newest.entries] == ["m3", "m4"]
+    first = index.query(since="2024-01-31 12:00:00", limit=3)
+    assert [entry.message for entry in first.entries] == ["m0", "m1", "m2"] and first.has_more
+
+    # Rotate like RotatingFileHandler, then keep writing.
+    with current.open("a") as handle:
+        handle.write(_line(5, "orchestrator", "INFO", "m5"))
+    os.rename(current, logs / "autodev.log.1")
+    current.write_text(_line(6, "orchestrator", "INFO", "m6"))
+
+    rest = index.query(cursor=first.next_cursor, limit=10)
+    assert [entry.message for entry in rest.entries] == ["m3", "m4", "m5", "m6"]
+    assert not rest.has_more
+    assert index.query(cursor=rest.next_cursor).entries == []
+
+    # Oldest backup deleted: its records drop out of the index.
+    (logs / "autodev.log.1").unlink()
+    assert [entry.message for entry in index.query(limit=10).entries] == ["m6"]
+
+
+def test_partial_lines_and_truncation(tmp_path) -> None:
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    current = logs / "errors.log"
+    current.write_text(_line(1, "validator", "ERROR", "first") + "[2024-01-31 12:00:02] autodev.val")
+    index = LogIndex(logs, tmp_path / "index.db")
+
+    assert [entry.message for entry in index.query("errors").entries] == ["first"]
+    with current.open("a") as handle:
+        handle.write("idator - ERROR - second\n  detail\n")
+    assert [entry.message for entry in index.query("errors").entries] == ["first", "second\n  detail"]
+
+    current.write_text(_line(9, "validator", "ERROR", "after truncate"))
+    assert [entry.message for entry in index.query("errors").entries] == ["after truncate"]
@@ -0,0 +1,107 @@
+import io
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+from app.log_reader import LogIndex
+from app.logging_config import add_log_handler, configure_logging, flush_logging, get_logger, log_context
+
+
+def teardown_function() -> None:
+    flush_logging()
+    for handler in logging.getLogger("autodev").handlers[:]:
+        logging.getLogger("autodev").removeHandler(handler)
+        handler.close()
+
+
+def test_queued_records_reach_files_after_flush(tmp_path) -> None:
+    console = io.StringIO()
+    configure_logging(tmp_path, stream=console)
+    log = get_logger("test")
+
+    log.info("cycle %d done", 7)
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        log.error("stage failed", exc_info=True)
+    flush_logging()
+
+    main = (tmp_path / "autodev.log").read_text()
+    assert "autodev.test - INFO - cycle 7 done" in main
+    assert "ValueError: bad input" in main
+    errors = (tmp_path / "errors.log").read_text()
+    assert "stage failed" in errors and "cycle 7 done" not in errors
+    assert "cycle 7 done" in console.getvalue()
+
+
+def test_json_lines_carry_context_and_are_indexed(tmp_path) -> None:
+    configure_logging(tmp_path, json_format=True, stream=io.StringIO())
+    log = get_logger("orchestrator")
+
+    with log_context(run_id="abc123", project="demo", stage="validate"):
+        log.warning("Validation failed: %s", ["lint"])
+    log.info("outside")
+    flush_logging()
+
+    first, second = [json.loads(line) for line in (tmp_path / "autodev.log").read_text().splitlines()]
+    assert first["logger"] == "autodev.orchestrator" and first["level"] == "WARNING"
+    assert first["message"] == "Validation failed: ['lint']"
+    assert (first["run_id"], first["project"], first["stage"]) == ("abc123", "demo", "validate")
+    assert second["run_id"] is None
+
+    page = LogIndex(tmp_path, tmp_path / "index.db").query(level="WARNING")
+    assert [(entry.logger, entry.message) for entry in page.entries] == [
+        ("autodev.orchestrator", "Validation failed: ['lint']")
+    ]
+
+
+def test_added_handlers_keep_the_callers_context(tmp_path) -> None:
+    configure_logging(tmp_path, stream=io.StringIO())
+    seen: list[tuple] = []
+
+    class Recorder(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            seen.append((record.run_id, record.project, record.stage))
+
+    add_log_handler(Recorder())
+    with log_context(run_id="abc123", project="demo", stage="plan"):
+        get_logger("test").info("planned")
+    flush_logging()
+
+    assert seen == [("abc123", "demo", "plan")]
+
+
+def test_direct_mode_writes_synchronously(tmp_path) -> None:
+    configure_logging(tmp_path, queued=False, stream=io.StringIO())
+
+    get_logger("test").error("immediate")
+
+    assert "immediate" in (tmp_path / "errors.log").read_text()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_starts_its_listener_on_first_log_call(tmp_path) -> None:
+    configure_logging(tmp_path, stream=io.StringIO())
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            threads_after_fork = threading.active_count()
+            get_logger("child").info("from the child")
+            flush_logging()
+            os.write(write_end, str(threads_after_fork).encode())
+            code = 0
+        finally:
+            os._exit(code)
+    os.close(write_end)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert os.read(read_end, 16) == b"1"  # No listener thread was started by the fork itself.
+    os.close(read_end)
+    flush_logging()
+    assert "from the child" in (tmp_path / "autodev.log").read_text()
@@ -1,7 +1,9 @@
-from datetime import datetime, timezone
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
 
-from app.memory import MemoryStore
-from app.models import ProjectCategory, RunRecord
+from app.memory import MIGRATIONS, MemoryStore
+from app.models import CheckRecord, CheckUsage, ProjectCategory, RunRecord
 
 
 def test_memory_store_round_trip(tmp_path) -> None:
@@ -14,3 +16,133 @@ def test_memory_store_round_trip(tmp_path) -> None:
     store.store_run(
         RunRecord(started_at=now, finished_at=now, project_name="demo", retries=0, success=True)
     )
+
+
+def test_memory_store_transaction_is_atomic_and_wal(tmp_path) -> None:
+    store = MemoryStore(tmp_path / "memory.db")
+    assert store._connect().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    try:
+        with store.transaction():
+            store.store_project("ghost", ProjectCategory.CLI, 1)
+            assert "ghost" in store.list_project_names()
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert "ghost" not in store.list_project_names()
+
+    seen: list[set[str]] = []
+    with store.transaction():
+        store.store_project("visible", ProjectCategory.CLI, 1)
+        reader = threading.Thread(target=lambda: seen.append(store.list_project_names()))
+        reader.start()
+        reader.join(timeout=5)
+    assert seen == [set()]
+    assert store.list_project_names() == {"visible"}
+    store.close()
+
+
+def _run(started: datetime, name: str, seconds: float, retries: int, success: bool, checks=()) -> RunRecord:
+    return RunRecord(
+        started_at=started,
+        finished_at=started + timedelta(seconds=seconds),
+        project_name=name,
+        retries=retries,
+        success=success,
+        checks=list(checks),
+    )
+
+
+def test_memory_store_migrates_legacy_schema(tmp_path) -> None:
+    db = tmp_path / "memory.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, started_at TEXT NOT NULL, finished_at TEXT NOT NULL,"
+            " project_name TEXT NOT NULL, retries INTEGER NOT NULL, success INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO runs(started_at, finished_at, project_name, retries, success) VALUES(?, ?, ?, ?, ?)",
+            ("2024-01-01T00:00:00+00:00", "2024-01-01T00:00:30+00:00", "inventory-api-v3", 1, 1),
+        )
+
+    store = MemoryStore(db)
+    conn = store._connect()
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    assert conn.execute("SELECT template, duration_seconds FROM runs").fetchone() == ("inventory-api", 30.0)
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(runs)")}
+    assert {"idx_runs_project_name", "idx_runs_started_at"} <= indexes
+
+
+def test_memory_store_stats_and_compaction(tmp_path) -> None:
+    store = MemoryStore(tmp_path / "memory.db")
+    now = datetime.now(tz=timezone.utc)
+    old = now - timedelta(days=60)
+    lint_failed = (CheckRecord(0, "lint", False), CheckRecord(1, "lint", True), CheckRecord(1, "tests", True))
+    store.store_run(_run(old, "csv-inspector", 100, 1, True, lint_failed))
+    store.store_run(_run(old, "csv-inspector-v2", 40, 0, False, [CheckRecord(0, "lint", False)]))
+    for index in range(10):
+        store.store_run(_run(now - timedelta(hours=index), "habit-api", index + 1, index % 2, True))
+
+    recent = store.run_stats(since=now - timedelta(days=7))
+    assert (recent.runs, recent.successes) == (10, 10)
+    assert recent.retry_histogram == {0: 5, 1: 5}
+    assert recent.percentiles == {"p50": 5.0, "p95": 10.0, "p99": 10.0}
+
+    assert store.compact_history(now - timedelta(days=30)) == 2
+    assert store.compact_history(now - timedelta(days=30)) == 0
+    overall = store.run_stats()
+    assert (overall.runs, overall.successes) == (12, 11)
+    assert overall.retry_histogram == {0: 6, 1: 6}
+    assert [(item.template, item.check, item.failures, item.attempts) for item in overall.check_failures] == [
+        ("csv-inspector", "lint", 2, 3)
+    ]
+
+
+def test_memory_store_maintains_template_usage(tmp_path) -> None:
+    db = tmp_path / "memory.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE projects (name TEXT PRIMARY KEY, category TEXT NOT NULL, complexity INTEGER NOT NULL)")
+        conn.execute("INSERT INTO projects(name, category, complexity) VALUES('csv-inspector-v4', 'cli_utilities', 1)")
+
+    store = MemoryStore(db)
+    store.store_project("csv-inspector", ProjectCategory.CLI, 2)
+    store.store_project("csv-inspector", ProjectCategory.CLI, 3)
+    store.store_project("habit-api", ProjectCategory.API, 1)
+
+    usage = store.template_usage()
+    assert (usage["csv-inspector"].count, usage["csv-inspector"].max_suffix) == (2, 4)
+    assert (usage["habit-api"].count, usage["habit-api"].max_suffix) == (1, 1)
+
+
+def test_concurrent_runs_reserve_distinct_project_names(tmp_path) -> None:
+    from app.idea_generator import IdeaGenerator
+
+    first, second = MemoryStore(tmp_path / "memory.db"), MemoryStore(tmp_path / "memory.db")
+    assert first.reserve_project("habit-api", ProjectCategory.API, 1)
+    assert not second.reserve_project("habit-api", ProjectCategory.API, 2)
+
+    # Both start from the same stale usage snapshot, as two processes reading it at once would.
+    snapshots = [(store, store.template_usage()) for store in (first, second)]
+    names = {
+        IdeaGenerator(seed=7).reserve(
+            lambda idea, store=store: store.reserve_project(idea.name, idea.category, idea.complexity), usage
+        ).name
+        for store, usage in snapshots
+    }
+    assert len(names) == 2 and "habit-api" not in names
+
+
+def test_memory_store_records_check_resource_usage(tmp_path) -> None:
+    store = MemoryStore(tmp_path / "memory.db")
+    now = datetime.now(tz=timezone.utc)
+    checks = [
+        CheckRecord(0, "tests", False, usage=CheckUsage(1.5, 40960, wall_seconds=600.0, limit_hit="wall")),
+        CheckRecord(0, "lint", True, status="reused"),
+    ]
+    store.store_run(RunRecord(started_at=now, finished_at=now, project_name="demo", retries=0, success=False, checks=checks))
+
+    conn = sqlite3.connect(tmp_path / "memory.db")
+    rows = conn.execute(
+        "SELECT name, cpu_seconds, max_rss_kb, wall_seconds, limit_hit FROM run_checks ORDER BY name"
+    ).fetchall()
+    assert rows == [("lint", None, None, None, None), ("tests", 1.5, 40960, 600.0, "wall")]
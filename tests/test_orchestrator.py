@@ -1,16 +1,70 @@
+import os
+
 from app.config import AgentConfig
-from app.orchestrator import AutoDevOrchestrator
+from app.orchestrator import AutoDevOrchestrator, _run_batch_cycle
+
+
+def _config(tmp_path, **overrides) -> AgentConfig:
+    """Config rooted in ``tmp_path`` with lint and coverage off and no retries."""
+    settings = {
+        "memory_db_path": tmp_path / "state" / "memory.db",
+        "workspace_root": tmp_path / "generated_projects",
+        "schedule_lock_file": tmp_path / "state" / "scheduler.lock",
+        "run_lint": False,
+        "run_coverage": False,
+        "max_retries": 0,
+        **overrides,
+    }
+    return AgentConfig(**settings)
 
 
 def test_orchestrator_run_once_success(tmp_path) -> None:
-    config = AgentConfig(
-        memory_db_path=tmp_path / "state" / "memory.db",
-        workspace_root=tmp_path / "generated_projects",
-        schedule_lock_file=tmp_path / "state" / "scheduler.lock",
-        run_lint=False,
-        run_coverage=False,
-        strict_validation=True,
-        max_retries=1,
-    )
+    config = _config(tmp_path, strict_validation=True, max_retries=1)
     orchestrator = AutoDevOrchestrator(config)
     assert orchestrator.run_once() is True
+
+
+def test_orchestrator_run_batch_isolates_projects(tmp_path) -> None:
+    config = _config(tmp_path)
+    records = AutoDevOrchestrator(config).run_batch(2, workers=2)
+
+    names = [record.project_name for record in records]
+    assert len(set(names)) == 2
+    assert all(record.success for record in records)
+    for name in names:
+        assert (config.workspace_root / name / "validation_log.jsonl").exists()
+
+
+def test_orchestrator_run_pipeline_records_every_project(tmp_path) -> None:
+    config = _config(tmp_path)
+    records = AutoDevOrchestrator(config).run_pipeline(3, validation_workers=2)
+
+    assert len({record.project_name for record in records}) == 3
+    assert all(record.success for record in records)
+
+
+def test_batch_cycle_closes_its_orchestrator(tmp_path, monkeypatch) -> None:
+    config = _config(tmp_path)
+    closed = []
+    monkeypatch.setattr(AutoDevOrchestrator, "run_idea", lambda self, idea: None)
+    monkeypatch.setattr(AutoDevOrchestrator, "close", lambda self, drain_timeout=0.0: closed.append(self))
+
+    _run_batch_cycle(config, None)
+
+    assert len(closed) == 1
+
+
+def test_memory_backups_are_throttled_by_interval(tmp_path) -> None:
+    backups = tmp_path / "state" / "backups"
+    orchestrator = AutoDevOrchestrator(_config(tmp_path))
+    orchestrator.memory.template_usage()  # Creates memory.db.
+
+    orchestrator._backup_memory()
+    orchestrator._backup_memory()
+    assert len(list(backups.glob("backup_*.db"))) == 1
+
+    (backup,) = backups.glob("backup_*.db")
+    os.utime(backup.rename(backups / "backup_20000101_000000.db"), (0, 0))
+    orchestrator._backup_memory()
+    orchestrator.close()
+    assert len(list(backups.glob("backup_*.db"))) == 2
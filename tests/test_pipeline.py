@@ -0,0 +1,46 @@
+import threading
+import time
+
+from app.pipeline import Stage, StagePipeline
+
+
+def test_pipeline_applies_backpressure_and_reports_stats() -> None:
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def produce(item: int) -> int:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        return item
+
+    def consume(item: int) -> int:
+        nonlocal in_flight
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return item * 2
+
+    pipeline = StagePipeline([Stage("fast", produce), Stage("slow", consume, workers=2)], queue_size=1)
+    results = pipeline.run(range(10))
+
+    assert sorted(results) == [value * 2 for value in range(10)]
+    assert peak <= 4  # one queued, two being consumed, one blocked on put
+    assert [stats.processed for stats in pipeline.stats] == [10, 10]
+    assert pipeline.stats[1].utilisation > 0
+
+
+def test_pipeline_drops_failed_items_and_keeps_flowing() -> None:
+    def check(item: int) -> int:
+        if item == 3:
+            raise RuntimeError("database is locked")
+        return item
+
+    pipeline = StagePipeline([Stage("record", check), Stage("report", lambda item: item * 10)])
+    results = pipeline.run(range(5))
+
+    assert sorted(results) == [0, 10, 20, 40]
+    assert pipeline.stats[0].failed == 1
+    assert pipeline.stats[1].processed == 4
@@ -0,0 +1,98 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.github_manager import GitHubManager
+from app.memory import MemoryStore
+from app.pr_outbox import OutboxPublisher
+
+
+class _StubGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.ports.add(self.client_address[1])
+        head = self.path.split("head=octo%3A", 1)[1].split("&", 1)[0].replace("%2F", "/")
+        self._reply(200, [pull for pull in self.server.pulls if pull["head"] == head])
+
+    def do_POST(self) -> None:
+        self.server.ports.add(self.client_address[1])
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.script:
+            status, headers = self.server.script.pop(0)
+            self._reply(status, {"message": "slow down"}, headers)
+            return
+        pull = {"head": payload["head"], "html_url": f"https://example.test/pull/{len(self.server.pulls) + 1}"}
+        self.server.pulls.append(pull)
+        self._reply(201, pull, {"X-RateLimit-Remaining": "4999"})
+
+    def _reply(self, status: int, body, headers: dict | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubGitHub)
+    server.pulls, server.script, server.ports = [], [], set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server) -> GitHubManager:
+    return GitHubManager("octo/demo", token="t", base_url=f"http://127.0.0.1:{server.server_address[1]}")
+
+
+def test_client_reuses_connection_and_is_idempotent(stub) -> None:
+    client = _client(stub)
+    first = client.create_pull_request(title="a", body="", head="feature/a")
+    again = client.create_pull_request(title="a", body="", head="feature/a")
+    client.create_pull_request(title="b", body="", head="feature/b")
+
+    assert first == again
+    assert len(stub.pulls) == 2
+    assert len(stub.ports) == 1
+    assert client.rate_limit_remaining == 4999
+
+
+def test_publisher_retries_after_rate_limit_and_reports_depth(tmp_path, stub) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    pushed: list[str] = []
+    publisher = OutboxPublisher(memory, _client(stub), push=pushed.append, seed=1)
+    stub.script.append((429, {"Retry-After": "0"}))
+    memory.enqueue_pull_request(head="feature/a", base="main", title="a", body="")
+    memory.enqueue_pull_request(head="feature/b", base="main", title="b", body="")
+
+    assert publisher.drain_once() == 2
+    assert publisher.depth() == {"pending": 1, "done": 1, "failed": 0}
+    assert publisher.drain_once() == 1
+    assert publisher.depth() == {"pending": 0, "done": 2, "failed": 0}
+    assert sorted(pull["head"] for pull in stub.pulls) == ["feature/a", "feature/b"]
+    assert pushed.count("feature/a") == 2
+
+
+def test_rate_limit_pause_does_not_use_up_attempts_of_untried_items(tmp_path, stub) -> None:
+    memory = MemoryStore(tmp_path / "memory.db")
+    publisher = OutboxPublisher(memory, _client(stub), max_attempts=2)
+    stub.script.append((429, {"Retry-After": "60"}))
+    for head in ("feature/a", "feature/b", "feature/c"):
+        memory.enqueue_pull_request(head=head, base="main", title=head, body="")
+
+    assert publisher.drain_once() == 1
+    attempts = dict(memory._connect().execute("SELECT head, attempts FROM pr_outbox").fetchall())
+    assert attempts == {"feature/a": 1, "feature/b": 0, "feature/c": 0}
+    assert publisher.depth() == {"pending": 3, "done": 0, "failed": 0}
@@ -1,6 +1,6 @@
 import pytest
 
-from app.security import SecurityPolicyError, SecurityScanner
+from app.security import SecurityPolicyError, SecurityScanner, _scan_file
 
 
 def test_security_scanner_detects_forbidden_patterns(tmp_path) -> None:
@@ -11,3 +11,32 @@ def test_security_scanner_detects_forbidden_patterns(tmp_path) -> None:
 
     with pytest.raises(SecurityPolicyError):
         SecurityScanner().scan(project)
+
+
+def test_security_scanner_reuses_cached_results(tmp_path) -> None:
+    project = tmp_path / "proj"
+    (project / "app").mkdir(parents=True)
+    (project / "app" / "safe.py").write_text("VALUE = 1\n", encoding="utf-8")
+    risky = project / "app" / "risky.py"
+    risky.write_text("result = eval('1')\n", encoding="utf-8")
+    scanner = SecurityScanner(tmp_path / "scan.db")
+
+    first = scanner.find_violations(project)
+    assert first == [f"{risky}: eval("]
+    assert scanner.last_stats.scanned == 2
+
+    assert scanner.find_violations(project) == first
+    assert scanner.last_stats.cached == 2
+
+    risky.write_text("result = 1\n", encoding="utf-8")
+    assert scanner.find_violations(project) == []
+    assert scanner.last_stats.scanned == 1
+
+
+def test_scan_reports_patterns_that_start_at_the_same_position(tmp_path) -> None:
+    source = tmp_path / "main.py"
+    source.write_text("value = eval(input())\n", encoding="utf-8")
+
+    _, found = _scan_file(str(source), ("eval(", "eval(input", "val(in", "exec("))
+
+    assert found == ["eval(", "eval(input", "val(in"]
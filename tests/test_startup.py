@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+from app.startup import parse_importtime, profile_startup, startup_command
+from app.validator import LEAN_ENV, Validator
+
+
+def test_parse_importtime_sums_top_level_imports_per_package() -> None:
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   _pytest._io",
+            "import time:       300 |       1500 | pytest",
+            "import time:        40 |         40 | pytest_cov.plugin",
+            "import time:        10 |         60 | pytest_cov",
+            "some unrelated warning",
+        ]
+    )
+
+    assert parse_importtime(stderr) == {"pytest": 1500, "pytest_cov": 100}
+
+
+def test_lean_plan_disables_autoload_and_loads_only_pytest_cov() -> None:
+    default = {spec.name: spec.command for spec in Validator.plan_checks(run_lint=True, run_coverage=True)}
+    lean = {spec.name: spec.command for spec in Validator.plan_checks(run_lint=True, run_coverage=True, lean=True)}
+
+    assert "no:cacheprovider" not in default["coverage"]
+    assert lean["coverage"][:3] == default["coverage"][:3]
+    assert {"no:cacheprovider", "pytest_cov"} <= set(lean["coverage"])
+    assert lean["lint"] == default["lint"]
+    assert LEAN_ENV == {"PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"}
+    assert startup_command(lean["coverage"])[-1] == "--collect-only"
+    assert startup_command(lean["lint"]) == [sys.executable, "-m", "flake8", "--version"]
+
+
+def test_profile_startup_times_command_and_reports_imports(tmp_path: Path) -> None:
+    profile = profile_startup([sys.executable, "-c", "import json"], cwd=tmp_path, env={}, runs=2)
+
+    assert profile.returncode == 0
+    assert profile.seconds > 0
+    assert "json" in profile.imports
+    assert profile.top(1)[0][1] == max(profile.imports.values())
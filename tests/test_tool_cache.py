@@ -0,0 +1,61 @@
+import os
+import sys
+from pathlib import Path
+
+from app.tool_cache import ToolCache
+from app.validator import Validator
+
+
+def _project(root: Path, source: str) -> Path:
+    (root / "app").mkdir(parents=True)
+    (root / "tests").mkdir()
+    (root / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (root / "app" / "main.py").write_text(source, encoding="utf-8")
+    (root / "tests" / "test_core.py").write_text(
+        "from app.main import run\n\n\ndef test_run() -> None:\n    assert run() == 0\n", encoding="utf-8"
+    )
+    return root
+
+
+def test_tool_cache_points_tools_outside_the_project(tmp_path) -> None:
+    cache = ToolCache(tmp_path / "cache")
+    project = _project(tmp_path / "proj", "def run() -> int:\n    return 0\n")
+
+    pytest_command = cache.command((sys.executable, "-m", "pytest", "-q"), project)
+    assert pytest_command[3] == "-o" and pytest_command[4].startswith(f"cache_dir={tmp_path / 'cache' / 'pytest'}")
+    mypy_command = cache.command((sys.executable, "-m", "mypy", "app"), project)
+    assert mypy_command[3] == "--cache-dir" and mypy_command[-1] == "app"
+    assert cache.command(("python", "-m", "flake8", "app"), project) == ["python", "-m", "flake8", "app"]
+
+    result = Validator(tool_cache=cache, syntax_in_memory=True).run(project, run_lint=False, run_coverage=False)
+
+    assert result.success
+    assert not any(path.name in {"__pycache__", ".pytest_cache"} for path in project.rglob("*"))
+    assert cache.size() > 0
+
+
+def test_in_memory_syntax_check_reports_errors(tmp_path) -> None:
+    project = _project(tmp_path / "proj", "def run(:\n")
+
+    result = Validator(syntax_in_memory=True).run(project, run_lint=False, run_coverage=False)
+
+    assert result.checks["syntax"] is False
+    assert "*** Error compiling 'app/main.py'" in "\n".join(result.logs)
+    assert not (project / "app" / "__pycache__").exists()
+
+
+def test_trim_evicts_least_recently_used_files(tmp_path) -> None:
+    cache = ToolCache(tmp_path / "cache", max_bytes=250)
+    for index, name in enumerate(("old", "middle", "new")):
+        path = tmp_path / "cache" / "pycache" / f"{name}.pyc"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + index, 1000 + index))
+
+    assert cache.trim() == 100
+    assert sorted(path.name for path in (tmp_path / "cache" / "pycache").iterdir()) == ["middle.pyc", "new.pyc"]
+    assert cache.trim(force=True) == 0
+
+    (tmp_path / "cache" / "pycache" / "newer.pyc").write_bytes(b"x" * 100)
+    assert cache.trim() == 0  # Throttled: the last trim was just now.
+    assert ToolCache(tmp_path / "cache", max_bytes=250, trim_interval_seconds=0).trim() == 100
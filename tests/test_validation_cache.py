@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from app.validation_cache import ValidationCache
+from app.validator import Validator
+
+
+def _make_project(root: Path) -> Path:
+    (root / "app").mkdir(parents=True)
+    (root / "tests").mkdir(parents=True)
+    (root / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (root / "app" / "main.py").write_text("def run() -> int:\n    return 0\n", encoding="utf-8")
+    (root / "tests" / "test_core.py").write_text(
+        "from app.main import run\n\n\ndef test_run() -> None:\n    assert run() == 0\n", encoding="utf-8"
+    )
+    return root
+
+
+def test_identical_trees_share_cached_result(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path / "cache.db")
+    validator = Validator(cache=cache)
+    options = {"run_lint": False, "run_coverage": False}
+
+    first = validator.run(_make_project(tmp_path / "one"), **options)
+    second = validator.run(_make_project(tmp_path / "two"), **options)
+
+    assert first.executed == ["syntax", "tests"]
+    assert second.success is True
+    assert second.executed == []
+    assert second.reused == ["syntax", "tests"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ValidationCache(tmp_path / "cache.db", max_entries=2)
+    validator = Validator(cache=cache)
+    for name in ("a", "b", "c"):
+        project = _make_project(tmp_path / name)
+        (project / "app" / "main.py").write_text(f"def run() -> int:\n    return 0  # {name}\n", encoding="utf-8")
+        validator.run(project, run_lint=False, run_coverage=False)
+
+    assert len(cache._connect().execute("SELECT key FROM validation_results").fetchall()) == 2
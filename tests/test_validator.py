@@ -1,5 +1,6 @@
 from pathlib import Path
 
+from app.limits import ResourceLimits
 from app.validator import Validator
 
 
@@ -23,3 +24,86 @@ def test_validator_reports_missing_commands(tmp_path: Path) -> None:
     assert result.checks["syntax"] is True
     assert result.checks["tests"] is True
     assert result.success is True
+
+
+def test_validator_reuses_tests_after_whitespace_only_edit(tmp_path: Path) -> None:
+    project = tmp_path / "proj"
+    (project / "app").mkdir(parents=True)
+    (project / "tests").mkdir(parents=True)
+    (project / "app" / "__init__.py").write_text("", encoding="utf-8")
+    main = project / "app" / "main.py"
+    main.write_text("def run() -> int:\n    return 0\n\n\n", encoding="utf-8")
+    (project / "tests" / "test_core.py").write_text(
+        "from app.main import run\n\n\ndef test_run() -> None:\n    assert run() == 0\n", encoding="utf-8"
+    )
+    validator = Validator()
+    options = {"run_lint": False, "run_coverage": False}
+
+    first = validator.run(project, **options)
+    assert first.executed == ["syntax", "tests"]
+
+    main.write_text("def run() -> int:\n    return 0  # noqa: E501\n", encoding="utf-8")
+    second = validator.run(project, **options)
+    assert second.reused == ["tests"]
+    assert second.executed == ["syntax"]
+    assert second.success is True
+
+    main.write_text("def run() -> int:\n    return 1\n", encoding="utf-8")
+    third = validator.run(project, **options)
+    assert third.executed == ["syntax", "tests"]
+    assert third.success is False
+
+
+def test_validator_fail_fast_cancels_remaining_checks(tmp_path: Path) -> None:
+    project = tmp_path / "proj"
+    (project / "app").mkdir(parents=True)
+    (project / "tests").mkdir(parents=True)
+    (project / "app" / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+    (project / "tests" / "test_slow.py").write_text(
+        "import time\n\n\ndef test_slow() -> None:\n    time.sleep(30)\n", encoding="utf-8"
+    )
+
+    result = Validator(max_concurrency=2, fail_fast=True).run(project, run_lint=False, run_coverage=False)
+
+    assert list(result.checks) == ["syntax", "tests"]
+    assert result.checks == {"syntax": False, "tests": False}
+    assert result.cancelled == ["tests"]
+    assert result.success is False
+
+
+def test_validator_spills_long_check_output_to_artifact(tmp_path: Path) -> None:
+    project = tmp_path / "proj"
+    (project / "app").mkdir(parents=True)
+    (project / "tests").mkdir(parents=True)
+    (project / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (project / "tests" / "test_core.py").write_text(
+        "def test_noisy() -> None:\n    print('x' * 200000)\n    assert False\n", encoding="utf-8"
+    )
+
+    result = Validator(artifacts_dir=tmp_path / "artifacts", capture_limit=4096).run(
+        project, run_lint=False, run_coverage=False
+    )
+
+    assert result.checks["tests"] is False
+    artifact = Path(result.artifacts["tests.stdout"])
+    assert artifact.stat().st_size > 200000
+    assert sum(len(entry) for entry in result.logs) < 8192
+    assert f"full output: {artifact}" in "\n".join(result.logs)
+
+
+def test_validator_stops_checks_over_budget_and_reports_usage(tmp_path: Path) -> None:
+    project = tmp_path / "proj"
+    (project / "app").mkdir(parents=True)
+    (project / "tests").mkdir(parents=True)
+    (project / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (project / "tests" / "test_core.py").write_text(
+        "def test_hangs() -> None:\n    while True:\n        pass\n", encoding="utf-8"
+    )
+
+    result = Validator(limits=ResourceLimits(wall_seconds=3)).run(project, run_lint=False, run_coverage=False)
+
+    assert result.checks == {"syntax": True, "tests": False}
+    assert result.resources["tests"].limit_hit == "wall"
+    assert result.resources["tests"].wall_seconds < 10
+    assert result.resources["syntax"].limit_hit is None and result.resources["syntax"].max_rss_kb > 0
+    assert "(killed: exceeded 3s wall-clock budget)" in result.logs
@@ -0,0 +1,69 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.limits import ResourceLimits
+from app.warm_worker import WarmWorkerPool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="warm workers need fork()")
+
+
+def _make_project(root: Path, value: int) -> Path:
+    (root / "app").mkdir(parents=True)
+    (root / "tests").mkdir(parents=True)
+    (root / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (root / "app" / "main.py").write_text(f"def run() -> int:\n    return {value}\n", encoding="utf-8")
+    (root / "tests" / "test_core.py").write_text(
+        f"from app.main import run\n\n\ndef test_run() -> None:\n    assert run() == {value}\n", encoding="utf-8"
+    )
+    return root
+
+
+def test_warm_pool_isolates_project_modules(tmp_path: Path) -> None:
+    pool = WarmWorkerPool(size=1)
+    try:
+        for value in (1, 2):
+            project = _make_project(tmp_path / f"proj{value}", value)
+            env = {**os.environ, "PYTHONPATH": str(project)}
+            result = pool.run([sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider"], project, env)
+            assert result is not None
+            assert result.returncode == 0, result.stdout + result.stderr
+            assert "1 passed" in result.stdout
+    finally:
+        pool.close()
+
+
+def test_cpu_limited_check_runs_once_without_subprocess_fallback(tmp_path: Path) -> None:
+    (tmp_path / "spin.py").write_text(
+        "with open('runs.log', 'a') as log:\n    log.write('run\\n')\nwhile True:\n    pass\n", encoding="utf-8"
+    )
+    pool = WarmWorkerPool(size=1, preload=())
+    try:
+        result = pool.run(
+            [sys.executable, "-m", "spin"], tmp_path, dict(os.environ), limits=ResourceLimits(cpu_seconds=1)
+        )
+    finally:
+        pool.close()
+
+    assert result is not None  # None would make the validator run the check again as a subprocess.
+    assert result.usage.limit_hit == "cpu"
+    assert (tmp_path / "runs.log").read_text(encoding="utf-8") == "run\n"
+
+
+def test_warm_pool_declines_non_module_commands(tmp_path: Path) -> None:
+    pool = WarmWorkerPool(size=1)
+    assert pool.run(["flake8", "app"], tmp_path, dict(os.environ)) is None
+
+
+def test_validator_uses_warm_pool(tmp_path: Path) -> None:
+    from app.validator import Validator
+
+    pool = WarmWorkerPool(size=1)
+    try:
+        project = _make_project(tmp_path / "proj", 0)
+        result = Validator(warm_pool=pool).run(project, run_lint=False, run_coverage=False)
+        assert result.checks == {"syntax": True, "tests": True}
+    finally:
+        pool.close()